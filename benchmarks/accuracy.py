@@ -0,0 +1,188 @@
+"""检测速度与准确率对比测试
+
+在一组带真实动作时间段的视频上运行多种检测配置，逐项报告：
+    precision     与任一真实动作重叠的检测片段比例
+    recall        被任一检测片段覆盖到的真实动作比例
+    iou           时间IoU(检测片段与真实动作的交集时长/并集时长)
+    boundary      真实动作起止时间与重叠检测片段起止时间的平均误差(秒)
+    fps           检测速度(帧/秒)
+没有可计算的值时(如一个片段都没检测到时的 boundary)记为 null，不计入平均值；
+有真实动作但一个片段都没检测到时 precision 为0。
+在速度、时间IoU和召回率三项上不被其他配置同时超过的配置标记为 Pareto 前沿(*)，
+速度相差5%以内视为相同，一个动作都没检测到的配置不进入前沿。
+
+用法:
+    python benchmarks/accuracy.py [--corpus 目录] [--configs 配置.json] [--min-recall 0.9] [--out 结果文件]
+
+--corpus 目录中每个视频旁放同名JSON文件: {"events": [{"start": 秒, "end": 秒}], "regions": [...]}，
+未指定时使用 benchmarks/synthetic.py 生成的视频。--configs 为 {配置名: 检测参数} 的JSON文件。
+任一配置低于 --min-precision/--min-recall/--min-iou 时以退出码1结束，便于在CI中使用。
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.motion_events import iter_motion_events, EVENT_SEGMENT_CLOSE, EVENT_STATS
+
+DEFAULT_CONFIGS = {
+    'baseline': {},
+    'threshold_35': {'threshold': 35},
+    'min_area_3000': {'min_area': 3000},
+    'static_2s': {'static_time_threshold': 2.0},
+}
+
+def load_corpus(directory):
+    """读取目录中带同名JSON标注的视频，返回标注字典列表(含 'path')"""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        meta_path = os.path.join(directory, stem + '.json')
+        if ext.lower() in ('.mp4', '.avi', '.mkv', '.mov') and os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            meta['path'] = os.path.join(directory, name)
+            corpus.append(meta)
+    return corpus
+
+def synthetic_corpus(directory):
+    """生成默认的合成视频集"""
+    from benchmarks.synthetic import ensure_clip
+    return [ensure_clip(directory, 640, 360, 20, seed=seed) for seed in range(3)]
+
+def _overlap(a, b):
+    return max(0.0, min(a['end'], b['end']) - max(a['start'], b['start']))
+
+def _total(intervals):
+    """区间并集总时长"""
+    total, current = 0.0, None
+    for interval in sorted(intervals, key=lambda item: item['start']):
+        if current is None or interval['start'] > current[1]:
+            if current:
+                total += current[1] - current[0]
+            current = [interval['start'], interval['end']]
+        else:
+            current[1] = max(current[1], interval['end'])
+    return total + (current[1] - current[0] if current else 0.0)
+
+def score(detected, truth):
+    """计算单个视频的准确率指标"""
+    hits = [seg for seg in detected if any(_overlap(seg, event) > 0 for event in truth)]
+    found = [event for event in truth if any(_overlap(seg, event) > 0 for seg in detected)]
+    intersection = sum(_overlap(seg, event) for seg in detected for event in truth)
+    union = _total(detected) + _total(truth) - intersection
+    errors = []
+    for event in found:
+        matched = [seg for seg in detected if _overlap(seg, event) > 0]
+        errors.append(abs(min(seg['start'] for seg in matched) - event['start']))
+        errors.append(abs(max(seg['end'] for seg in matched) - event['end']))
+    if detected:
+        precision = len(hits) / len(detected)
+    else:
+        precision = 0.0 if truth else None  # 漏检全部动作不能算作精确
+    return {
+        'precision': precision,
+        'recall': len(found) / len(truth) if truth else None,
+        'iou': intersection / union if union > 0 else 1.0,
+        'boundary': sum(errors) / len(errors) if errors else None,
+    }
+
+def _mean(values):
+    values = [value for value in values if value is not None]
+    return round(sum(values) / len(values), 3) if values else None
+
+def evaluate(corpus, params):
+    """在全部视频上运行一种配置，返回平均指标和总体检测速度"""
+    scores = []
+    frames, elapsed = 0, 0.0
+    for meta in corpus:
+        regions = meta.get('regions') or ([meta['osd_region']] if meta.get('osd_region') else None)
+        clip_params = dict({'regions': regions}, **params)
+        detected = []
+        start = time.perf_counter()
+        for event in iter_motion_events(meta['path'], clip_params):
+            if event['type'] == EVENT_SEGMENT_CLOSE:
+                detected.append({'start': event['start'], 'end': event['end']})
+            elif event['type'] == EVENT_STATS and event.get('done'):
+                frames += event['frames']
+        elapsed += time.perf_counter() - start
+        scores.append(score(detected, meta['events']))
+    result = {key: _mean([item[key] for item in scores]) for key in ('precision', 'recall', 'iou', 'boundary')}
+    result['fps'] = round(frames / elapsed, 1) if elapsed > 0 else 0.0
+    return result
+
+FPS_TOLERANCE = 0.05  # 检测速度相差不超过5%视为相同(测量误差)
+
+def pareto_front(results):
+    """速度、时间IoU和召回率上不被其他配置同时超过(且至少一项明显超过)的配置名，召回率为0的配置不计入"""
+    def dominates(other, result):
+        if other['fps'] < result['fps'] * (1 - FPS_TOLERANCE):
+            return False
+        if other['iou'] < result['iou'] or (other['recall'] or 0.0) < (result['recall'] or 0.0):
+            return False
+        return (other['fps'] > result['fps'] * (1 + FPS_TOLERANCE) or other['iou'] > result['iou']
+                or (other['recall'] or 0.0) > (result['recall'] or 0.0))
+
+    front = set()
+    for name, result in results.items():
+        if result['recall'] == 0:
+            continue
+        if not any(dominates(other, result) for other_name, other in results.items() if other_name != name):
+            front.add(name)
+    return front
+
+def _format(value, width, digits):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.{digits}f}"
+
+def main():
+    parser = argparse.ArgumentParser(description='检测速度与准确率对比测试')
+    parser.add_argument('--corpus', help='带同名JSON标注的视频目录，默认使用合成视频')
+    parser.add_argument('--configs', help='检测配置JSON文件 {配置名: 检测参数}')
+    parser.add_argument('--min-precision', type=float, default=0.0, help='精确率下限')
+    parser.add_argument('--min-recall', type=float, default=0.0, help='召回率下限')
+    parser.add_argument('--min-iou', type=float, default=0.0, help='时间IoU下限')
+    parser.add_argument('--out', help='将结果以JSON行追加到该文件')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        corpus = synthetic_corpus(os.path.join(tempfile.gettempdir(), 'videoscan_bench'))
+    if not corpus:
+        parser.error('没有找到带标注的视频')
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+
+    results = {name: evaluate(corpus, params) for name, params in configs.items()}
+    front = pareto_front(results)
+    print(f"{len(corpus)} 个视频，{len(configs)} 种配置(* 为Pareto前沿)")
+    print(f"  {'配置':<20}{'precision':>10}{'recall':>8}{'iou':>8}{'boundary':>10}{'fps':>9}")
+    failed = []
+    for name, result in results.items():
+        mark = '*' if name in front else ' '
+        print(f"{mark} {name:<20}{_format(result['precision'], 10, 3)}{_format(result['recall'], 8, 3)}"
+              f"{_format(result['iou'], 8, 3)}{_format(result['boundary'], 10, 2)}{result['fps']:>9.1f}")
+        if any(result[key] is not None and result[key] < minimum for key, minimum in
+               (('precision', args.min_precision), ('recall', args.min_recall), ('iou', args.min_iou))):
+            failed.append(name)
+    if args.out:
+        record = {'benchmark': 'accuracy', 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  'clips': len(corpus), 'results': results, 'pareto': sorted(front)}
+        with open(args.out, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    if failed:
+        print(f"低于准确率下限的配置: {', '.join(failed)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""比较两次基准测试结果
+
+    python benchmarks/compare.py 结果文件              比较文件中最后两次结果
+    python benchmarks/compare.py 基准文件 新结果文件     比较两个文件中各自最后一次结果
+
+按视频逐项比较 benchmarks/suite.py 的指标，变差超过阈值(默认10%)时以退出码1结束，便于在CI中使用。
+"""
+import argparse
+import json
+import sys
+
+HIGHER_IS_BETTER = ('decode_fps', 'detect_fps', 'end_to_end_fps', 'realtime_factor')
+LOWER_IS_BETTER = ('peak_rss_mb', 'cut_seconds')
+
+def load_results(path):
+    """读取JSON行结果文件，返回结果列表"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(base, current, threshold=0.10):
+    """逐项比较，返回 (行列表, 是否有性能下降)
+
+    每行为 (视频, 指标, 基准值, 当前值, 变化比例, 是否下降)，变化比例为正表示变好。
+    """
+    rows = []
+    regressed = False
+    for name, metrics in current['clips'].items():
+        base_metrics = base['clips'].get(name)
+        if base_metrics is None:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            old, new = base_metrics.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in LOWER_IS_BETTER:
+                change = -change
+            worse = change < -threshold
+            regressed = regressed or worse
+            rows.append((name, metric, old, new, round(change, 3), worse))
+    return rows, regressed
+
+def main():
+    parser = argparse.ArgumentParser(description='比较两次基准测试结果')
+    parser.add_argument('files', nargs='+', help='结果文件(一个或两个)')
+    parser.add_argument('--threshold', type=float, default=0.10, help='判定为性能下降的变化比例')
+    args = parser.parse_args()
+    if len(args.files) == 1:
+        results = load_results(args.files[0])
+        if len(results) < 2:
+            parser.error('结果文件中少于两次结果')
+        base, current = results[-2], results[-1]
+    else:
+        base, current = load_results(args.files[0])[-1], load_results(args.files[1])[-1]
+
+    rows, regressed = compare(base, current, args.threshold)
+    if not rows:
+        print('没有可比较的视频(两次测试的视频列表不同)')
+        return 0
+    print(f"基准: {base['timestamp']}  当前: {current['timestamp']}")
+    for name, metric, old, new, change, worse in rows:
+        flag = '  <-- 下降' if worse else ''
+        print(f"{name:<40} {metric:<16} {old:>10} -> {new:<10} {change:+.1%}{flag}")
+    if regressed:
+        print(f"性能下降超过 {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
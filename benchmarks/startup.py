@@ -0,0 +1,115 @@
+"""启动时间基准测试
+
+测量两项冷启动指标(均从启动新的Python进程开始计时)：
+    time_to_window       界面程序显示主窗口所需时间，分别测量无硬件信息缓存和有缓存两种情况
+    time_to_first_frame  命令行检测完成第一帧所需时间
+
+用法:
+    python benchmarks/startup.py [--video 视频文件] [--runs 5] [--offscreen] [--out 结果文件]
+
+每个子进程都在临时目录中运行，不会读写项目的 config 目录。指定 --out 时结果以JSON行追加到文件，便于跟踪变化。
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_WINDOW_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from gui.main_window import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+def shown():
+    import time
+    print(time.time(), flush=True)
+    window.close()
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec_()
+"""
+
+_FIRST_FRAME_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+from core.motion_events import iter_motion_events, EVENT_STATS
+for event in iter_motion_events({video!r}):
+    if event['type'] == EVENT_STATS:
+        break
+print(time.time(), flush=True)
+"""
+
+def make_video(path, seconds=5, width=640, height=360, fps=10):
+    """生成用于测试的合成视频"""
+    import cv2
+    import numpy as np
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(seconds * fps):
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        x = (i * 7) % (width - 60)
+        cv2.rectangle(frame, (x, height // 3), (x + 60, height // 3 + 60), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+def _time_child(script, cwd, env):
+    """运行子进程，返回从启动到子进程打印时间戳的秒数"""
+    start = time.time()
+    result = subprocess.run([sys.executable, '-c', script], cwd=cwd, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"子进程运行失败，返回码 {result.returncode}")
+    return float(lines[-1]) - start
+
+def _summary(samples):
+    return {'median': round(statistics.median(samples), 3), 'min': round(min(samples), 3),
+            'max': round(max(samples), 3), 'runs': len(samples)}
+
+def run(video=None, runs=5, offscreen=False):
+    """执行基准测试，返回结果字典"""
+    env = dict(os.environ)
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    with tempfile.TemporaryDirectory() as work_dir:
+        video = video or make_video(Path(work_dir) / 'synthetic.mp4')
+        window_script = _WINDOW_SCRIPT.format(root=str(ROOT))
+        # 第一次在空目录中启动，没有硬件信息缓存
+        cold = _time_child(window_script, work_dir, env)
+        warm = [_time_child(window_script, work_dir, env) for _ in range(runs)]
+        first_frame_script = _FIRST_FRAME_SCRIPT.format(root=str(ROOT), video=os.path.abspath(video))
+        first_frame = [_time_child(first_frame_script, work_dir, env) for _ in range(runs)]
+    return {
+        'benchmark': 'startup',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'time_to_window': {'no_cache': round(cold, 3), 'cached': _summary(warm)},
+        'time_to_first_frame': _summary(first_frame),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='启动时间基准测试')
+    parser.add_argument('--video', help='测量首帧时间使用的视频，默认生成合成视频')
+    parser.add_argument('--runs', type=int, default=5, help='每项指标的测量次数')
+    parser.add_argument('--offscreen', action='store_true', help='使用离屏渲染(无显示器的环境)')
+    parser.add_argument('--out', help='将结果以JSON行追加到该文件')
+    args = parser.parse_args()
+    result = run(args.video, args.runs, args.offscreen)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+if __name__ == '__main__':
+    main()
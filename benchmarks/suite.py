@@ -0,0 +1,163 @@
+"""合成视频基准测试
+
+用 benchmarks/synthetic.py 生成不同分辨率和时长的测试视频，每个视频在新的子进程中测量：
+    decode_fps        解码速度(帧/秒)
+    detect_fps        检测速度(帧/秒，不含解码)
+    end_to_end_fps    事件流完整检测速度(帧/秒)，realtime_factor 为视频时长/检测耗时
+    peak_rss_mb       检测子进程的峰值内存
+    cut_seconds       切割并合并检测到的片段的耗时(需要FFmpeg，找不到时为null)
+    segments/events   检测到的片段数和视频中的真实动作数
+
+用法:
+    python benchmarks/suite.py [--quick] [--clips 目录] [--out 结果文件]
+
+测试视频缓存在 --clips 目录中(默认系统临时目录)，参数不变时重复使用。
+指定 --out 时结果以JSON行追加到文件，用 benchmarks/compare.py 比较两次结果。
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+RESOLUTIONS = [(640, 360), (1280, 720), (1920, 1080)]
+LENGTHS = [10, 60]  # 秒
+QUICK_MATRIX = [(640, 360, 10), (1280, 720, 10)]
+RSS_INTERVAL = 0.05  # 内存采样间隔(秒)
+
+class _PeakRss:
+    """后台线程采样当前进程的常驻内存峰值"""
+    def __init__(self):
+        import psutil
+        self.process = psutil.Process()
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_INTERVAL):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return round(self.peak / 1024 / 1024, 1)
+
+def _measure_stages(meta, params):
+    """单次解码+检测，分别累计两个阶段的耗时"""
+    import cv2
+    from core.detector import MotionDetector
+    detector = MotionDetector(params['threshold'], params['min_area'], params['static_time_threshold'])
+    detector.region_manager.default_exclude_regions = params['regions']
+    detector.adjust_exclude_regions(meta['width'], meta['height'])
+    detector.set_fps(meta['fps'])
+    cap = cv2.VideoCapture(meta['path'])
+    decode_seconds = detect_seconds = 0.0
+    frames = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            ret, frame = cap.read()
+            decode_seconds += time.perf_counter() - start
+            if not ret:
+                break
+            start = time.perf_counter()
+            detector.process_frame(frame, frames, draw_overlay=False)
+            detect_seconds += time.perf_counter() - start
+            frames += 1
+    finally:
+        cap.release()
+    return frames, decode_seconds, detect_seconds
+
+def _measure_cut(meta, segments, ffmpeg_path):
+    """切割并合并片段，返回耗时"""
+    from core.splitter import VideoSplitter
+    splitter = VideoSplitter()
+    splitter.set_log_callback(lambda message: None)
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        splitter.split_video(meta['path'], segments, output_dir, ffmpeg_path)
+        return round(time.perf_counter() - start, 3)
+
+def measure_clip(meta):
+    """在子进程中测量单个视频，返回指标字典"""
+    from core.motion_events import iter_motion_events, DEFAULT_PARAMS, EVENT_SEGMENT_CLOSE
+    from core.hardware import find_ffmpeg
+    params = dict(DEFAULT_PARAMS, regions=[meta['osd_region']])
+    rss = _PeakRss()
+    frames, decode_seconds, detect_seconds = _measure_stages(meta, params)
+    start = time.perf_counter()
+    segments = [{'start': event['start'], 'end': event['end']}
+                for event in iter_motion_events(meta['path'], params) if event['type'] == EVENT_SEGMENT_CLOSE]
+    elapsed = time.perf_counter() - start
+    peak_rss = rss.stop()
+    ffmpeg_path = find_ffmpeg()
+    return {
+        'resolution': f"{meta['width']}x{meta['height']}",
+        'seconds': meta['seconds'],
+        'frames': frames,
+        'decode_fps': round(frames / decode_seconds, 1) if decode_seconds else None,
+        'detect_fps': round(frames / detect_seconds, 1) if detect_seconds else None,
+        'end_to_end_fps': round(frames / elapsed, 1),
+        'realtime_factor': round(meta['seconds'] / elapsed, 2),
+        'peak_rss_mb': peak_rss,
+        'cut_seconds': _measure_cut(meta, segments, ffmpeg_path) if ffmpeg_path and segments else None,
+        'segments': len(segments),
+        'events': len(meta['events']),
+    }
+
+def clip_matrix(quick=False):
+    """测试视频列表 [(宽, 高, 秒)]"""
+    if quick:
+        return list(QUICK_MATRIX)
+    return [(width, height, seconds) for width, height in RESOLUTIONS for seconds in LENGTHS]
+
+def run(clips_dir, quick=False, log=print):
+    """生成测试视频并逐个测量，返回结果字典"""
+    import cv2
+    import psutil
+    from benchmarks.synthetic import ensure_clip
+    results = {}
+    for width, height, seconds in clip_matrix(quick):
+        meta = ensure_clip(clips_dir, width, height, seconds)
+        log(f"测量 {meta['name']} ...")
+        # 每个视频使用新进程，避免前一个视频的内存和缓存影响结果
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            results[meta['name']] = executor.submit(measure_clip, meta).result()
+        log(json.dumps(results[meta['name']], ensure_ascii=False))
+    return {
+        'benchmark': 'synthetic',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'opencv': cv2.__version__,
+        'cpu_count': psutil.cpu_count(logical=True),
+        'quick': quick,
+        'clips': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='合成视频基准测试')
+    parser.add_argument('--quick', action='store_true', help='只测量两个10秒的小视频')
+    parser.add_argument('--clips', default=os.path.join(tempfile.gettempdir(), 'videoscan_bench'),
+                        help='测试视频缓存目录')
+    parser.add_argument('--out', help='将结果以JSON行追加到该文件')
+    args = parser.parse_args()
+    result = run(args.clips, args.quick)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""合成监控视频生成模块
+
+生成可重复(相同参数和随机种子得到相同内容)的测试视频：静态背景、传感器噪声、
+叠加的OSD时钟、在已知时间段内移动的物体，以及缓慢的光照变化。
+返回视频中动作的真实时间段和OSD所在区域，供基准测试和准确率评估使用。
+"""
+import json
+import os
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+
+GENERATOR_VERSION = 1  # 生成方式变化时递增，避免复用旧的缓存视频
+NOISE_BANK_SIZE = 8  # 预先生成的噪声帧数量，循环使用以加快生成速度
+CROSSING_SECONDS = 1.5  # 物体横穿画面一次的时间
+OSD_START = datetime(2025, 3, 5, 2, 18, 13)  # OSD时钟的起始时间
+
+def default_events(seconds):
+    """默认的动作时间段：视频15%-30%和55%-70%处各一段，每段至少2秒"""
+    events = []
+    for start_ratio, end_ratio in ((0.15, 0.30), (0.55, 0.70)):
+        start = round(seconds * start_ratio, 1)
+        end = round(max(seconds * end_ratio, start + 2.0), 1)
+        if end <= seconds:
+            events.append({'start': start, 'end': end})
+    return events
+
+def osd_region(width, height):
+    """OSD时钟所在区域，与检测时的排除区域格式一致"""
+    scale = width / 1920
+    return {'x': int(40 * scale), 'y': int(30 * scale), 'w': int(560 * scale), 'h': int(60 * scale)}
+
+def _background(rng, width, height):
+    """带纹理的静态背景(模拟路面、墙面)"""
+    small = rng.integers(30, 200, size=(max(height // 16, 2), max(width // 16, 2), 3), dtype=np.uint8)
+    background = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    return cv2.GaussianBlur(background, (0, 0), 3).astype(np.float32)
+
+def _object_position(event, t, width, height, size):
+    """物体在事件时间段内左右往返匀速移动"""
+    progress = ((t - event['start']) / CROSSING_SECONDS) % 2.0
+    progress = progress if progress <= 1.0 else 2.0 - progress
+    x = int(progress * (width - size))
+    y = int(height * 0.55)
+    return x, y
+
+def generate_clip(path, width=640, height=360, seconds=10, fps=25, seed=0, events=None,
+                  noise_sigma=3.0, drift=12.0):
+    """生成合成监控视频
+
+    Args:
+        path: 输出文件路径(.mp4)
+        width, height: 分辨率
+        seconds: 时长(秒)
+        fps: 帧率
+        seed: 随机种子
+        events: 动作时间段列表 [{'start', 'end'}](秒)，None表示使用 default_events
+        noise_sigma: 传感器噪声标准差
+        drift: 光照变化幅度(灰度级)
+    Returns:
+        dict: {'path', 'width', 'height', 'seconds', 'fps', 'frames', 'events', 'osd_region'}
+    """
+    rng = np.random.default_rng(seed)
+    events = default_events(seconds) if events is None else events
+    background = _background(rng, width, height)
+    noise_bank = [rng.normal(0, noise_sigma, size=(height, width, 1)).astype(np.float32)
+                  for _ in range(NOISE_BANK_SIZE)]
+    size = max(width // 10, 40)
+    # 带纹理的物体(类似行人、车辆)，移动时整个物体区域都有像素变化
+    texture = cv2.resize(rng.integers(0, 255, size=(4, 8, 3), dtype=np.uint8), (size, size // 2),
+                         interpolation=cv2.INTER_NEAREST)
+    region = osd_region(width, height)
+    font_scale = width / 1920 * 1.6
+    total_frames = int(seconds * fps)
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"无法创建视频文件: {path}")
+    try:
+        for index in range(total_frames):
+            t = index / fps
+            gain = drift * np.sin(2 * np.pi * t / max(seconds, 1))  # 整段视频一个周期的光照变化
+            frame = background + gain + noise_bank[rng.integers(NOISE_BANK_SIZE)]
+            frame = np.clip(frame, 0, 255).astype(np.uint8)
+            for event in events:
+                if event['start'] <= t < event['end']:
+                    x, y = _object_position(event, t, width, height, size)
+                    frame[y:y + size // 2, x:x + size] = texture
+            clock = (OSD_START + timedelta(seconds=int(t))).strftime('%Y-%m-%d %H:%M:%S')
+            cv2.putText(frame, clock, (region['x'], region['y'] + region['h'] - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), 2)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return {'path': str(path), 'width': width, 'height': height, 'seconds': seconds, 'fps': fps,
+            'frames': total_frames, 'events': events, 'osd_region': region}
+
+def ensure_clip(directory, width, height, seconds, fps=25, seed=0):
+    """在目录中生成(或复用已生成的)测试视频，真实动作信息保存在同名JSON文件中"""
+    os.makedirs(directory, exist_ok=True)
+    name = f"synthetic_v{GENERATOR_VERSION}_{width}x{height}_{seconds}s_{fps}fps_seed{seed}"
+    video_path = os.path.join(directory, name + '.mp4')
+    meta_path = os.path.join(directory, name + '.json')
+    if os.path.exists(video_path) and os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    meta = generate_clip(video_path, width, height, seconds, fps, seed)
+    meta['name'] = name
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta
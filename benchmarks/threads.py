@@ -0,0 +1,122 @@
+"""并发检测线程分配基准测试
+
+同时检测 N 个合成 720p 视频，比较不同线程分配下的总耗时和上下文切换次数：
+    default           每个工作进程都按逻辑CPU数开OpenCV线程，解码线程由解码器决定(以前的做法)
+    planned           按物理核心数在任务之间分配解码和OpenCV线程(thread_plan.plan_threads)
+    planned+affinity  在 planned 的基础上为每个工作进程绑定一组物理核心(不支持绑定CPU的平台跳过)
+
+每种分配记录 wall_seconds(总耗时)、aggregate_fps(所有任务的总帧数/总耗时)、
+ctx_switches(工作进程的自愿/非自愿上下文切换次数)。
+
+用法:
+    python benchmarks/threads.py [--jobs N] [--quick] [--clips 目录] [--out 结果文件]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+CLIP_SIZE = (1280, 720)
+CLIP_SECONDS = 30
+QUICK_SECONDS = 10
+
+def layouts(jobs):
+    """待比较的线程分配 [(名称, 分配)]"""
+    import psutil
+    from core.thread_plan import plan_threads
+    planned = plan_threads(jobs)
+    result = [
+        ('default', dict(planned, cv_threads=psutil.cpu_count() or 1, decode_threads=0)),
+        ('planned', planned),
+    ]
+    if hasattr(psutil.Process(), 'cpu_affinity'):
+        result.append(('planned+affinity', plan_threads(jobs, pin=True)))
+    return result
+
+def _ctx_switches(processes):
+    voluntary = involuntary = 0
+    for process in processes:
+        try:
+            switches = process.num_ctx_switches()
+        except Exception:
+            continue
+        voluntary += switches.voluntary
+        involuntary += switches.involuntary
+    return voluntary, involuntary
+
+def measure(clips, plan):
+    """用一个新的检测引擎同时检测所有视频，返回指标字典"""
+    import psutil
+    from core.detection_engine import DetectionEngine
+    from core.detection_job import build_job_spec
+    engine = DetectionEngine(len(clips), plan)
+    try:
+        start = time.perf_counter()
+        futures = [engine.submit(build_job_spec(meta['path'], regions=[meta['osd_region']])) for meta in clips]
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - start
+        # 工作进程在关闭引擎前仍存活，此时统计其上下文切换次数
+        voluntary, involuntary = _ctx_switches(psutil.Process().children(recursive=True))
+    finally:
+        engine.shutdown()
+    frames = sum(result['stats']['frames'] for result in results)
+    return {
+        'wall_seconds': round(elapsed, 3),
+        'frames': frames,
+        'aggregate_fps': round(frames / elapsed, 1),
+        'ctx_switches': {'voluntary': voluntary, 'involuntary': involuntary},
+        'segments': sum(len(result['segments']) for result in results),
+    }
+
+def run(clips_dir, jobs, quick=False, log=print):
+    """生成测试视频并逐个线程分配测量，返回结果字典"""
+    import cv2
+    import psutil
+    from benchmarks.synthetic import ensure_clip
+    from core.thread_plan import format_plan
+    seconds = QUICK_SECONDS if quick else CLIP_SECONDS
+    # 每个任务一个不同的视频，避免同时读取同一文件
+    clips = [ensure_clip(clips_dir, CLIP_SIZE[0], CLIP_SIZE[1], seconds, seed=i) for i in range(jobs)]
+    results = {}
+    for name, plan in layouts(jobs):
+        log(f"测量 {name}: {format_plan(plan)}")
+        results[name] = dict(measure(clips, plan), cv_threads=plan['cv_threads'],
+                             decode_threads=plan['decode_threads'], affinity=plan['affinity'])
+        log(json.dumps(results[name], ensure_ascii=False))
+    return {
+        'benchmark': 'threads',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'opencv': cv2.__version__,
+        'cpu_count': psutil.cpu_count(logical=True),
+        'physical_cores': psutil.cpu_count(logical=False),
+        'jobs': jobs,
+        'clip': f"{CLIP_SIZE[0]}x{CLIP_SIZE[1]} {seconds}s",
+        'quick': quick,
+        'layouts': results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='并发检测线程分配基准测试')
+    parser.add_argument('--jobs', type=int, default=4, help='同时检测的视频数')
+    parser.add_argument('--quick', action='store_true', help='使用10秒的测试视频')
+    parser.add_argument('--clips', default=os.path.join(tempfile.gettempdir(), 'videoscan_bench'),
+                        help='测试视频缓存目录')
+    parser.add_argument('--out', help='将结果以JSON行追加到该文件')
+    args = parser.parse_args()
+    result = run(args.clips, max(1, args.jobs), args.quick)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.out:
+        with open(args.out, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+if __name__ == '__main__':
+    main()
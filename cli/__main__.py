@@ -0,0 +1,6 @@
+"""支持 python -m cli 方式运行命令行模式"""
+import sys
+from cli.main import run
+
+if __name__ == '__main__':
+    sys.exit(run())
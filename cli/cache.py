@@ -0,0 +1,34 @@
+"""检测结果缓存命令模块
+
+    cache stats             显示缓存条目数
+    cache clear [paths]     删除指定视频的缓存结果，不指定视频时清空缓存
+"""
+import os
+from core.result_cache import ResultCache, DEFAULT_CACHE_PATH
+from cli.scan import collect_videos, EXIT_OK
+
+def add_arguments(parser):
+    """注册 cache 子命令参数"""
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='缓存数据库文件')
+    actions = parser.add_subparsers(dest='action', required=True)
+    actions.add_parser('stats', help='显示缓存条目数')
+    clear_parser = actions.add_parser('clear', help='删除缓存的检测结果')
+    clear_parser.add_argument('paths', nargs='*', help='视频文件或目录，不指定时清空缓存')
+
+def run(args):
+    """执行 cache 子命令，返回退出码"""
+    if not os.path.exists(args.cache):
+        print(f"缓存不存在: {args.cache}")
+        return EXIT_OK
+    cache = ResultCache(args.cache)
+    if args.action == 'stats':
+        print(f"{cache.count()} 条缓存结果: {os.path.abspath(args.cache)}")
+    else:
+        paths = None
+        if args.paths:
+            # 已删除的文件也可以按路径删除缓存
+            paths = [path for path in args.paths if not os.path.isdir(path)]
+            paths += collect_videos([path for path in args.paths if os.path.isdir(path)])
+        removed = cache.invalidate(paths)
+        print(f"已删除 {removed} 条缓存结果")
+    return EXIT_OK
@@ -0,0 +1,82 @@
+"""片段时间索引命令模块
+
+    index stats                          显示索引中的片段数、视频数和摄像头
+    index query START [END] [--camera] [--min-score]
+                                         查询时间点或时间范围内的动作片段
+    index import                         从检测结果缓存导入已检测视频的片段
+    index clear [paths]                  删除指定视频的片段，不指定视频时清空索引
+
+时间格式: 20250305010000、"2025-03-05 01:00" 或时间戳。
+"""
+import os
+from datetime import datetime
+from core.segment_index import SegmentIndex, DEFAULT_INDEX_PATH, parse_time
+from core.result_cache import ResultCache, DEFAULT_CACHE_PATH
+from cli.scan import collect_videos, EXIT_OK, EXIT_NO_INPUT
+
+def add_arguments(parser):
+    """注册 index 子命令参数"""
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='片段索引数据库文件')
+    actions = parser.add_subparsers(dest='action', required=True)
+    actions.add_parser('stats', help='显示索引中的片段数、视频数和摄像头')
+    query_parser = actions.add_parser('query', help='查询时间点或时间范围内的动作片段')
+    query_parser.add_argument('start', help='开始时间(只指定开始时间时查询该时间点)')
+    query_parser.add_argument('end', nargs='?', help='结束时间')
+    query_parser.add_argument('--camera', action='append', help='只查询指定摄像头(可重复)')
+    query_parser.add_argument('--min-score', type=float, help='只查询动作分数不低于此值的片段')
+    query_parser.add_argument('--min-cameras', type=int, default=1,
+                              help='汇总至少这么多个摄像头同时有动作的时间段(默认1，即并集)')
+    import_parser = actions.add_parser('import', help='从检测结果缓存导入片段')
+    import_parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='缓存数据库文件')
+    clear_parser = actions.add_parser('clear', help='删除索引中的片段')
+    clear_parser.add_argument('paths', nargs='*', help='视频文件或目录，不指定时清空索引')
+
+def _format(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+def _query(index, args):
+    try:
+        start = parse_time(args.start)
+        end = parse_time(args.end) if args.end else None
+    except ValueError as e:
+        print(f"无法解析时间: {str(e)}")
+        return EXIT_NO_INPUT
+    segments = index.query(start, end, args.camera, args.min_score)
+    if not segments:
+        print("没有动作片段")
+        return EXIT_OK
+    for seg in segments:
+        score = f"  分数 {seg['score']:.3g}" if seg['score'] is not None else ""
+        print(f"[{seg['camera']}] {_format(seg['start'])} - {_format(seg['end'])}{score}  {seg['video_path']}")
+    if end is not None:
+        spans = index.coverage(start, end, args.camera, args.min_cameras, args.min_score)
+        print(f"\n{len(spans)} 个时间段至少 {args.min_cameras} 个摄像头有动作:")
+        for span in spans:
+            print(f"  {_format(span['start'])} - {_format(span['end'])}  摄像头 {', '.join(span['cameras'])}")
+    return EXIT_OK
+
+def run(args):
+    """执行 index 子命令，返回退出码"""
+    if args.action != 'import' and not os.path.exists(args.index):
+        print(f"索引不存在: {args.index}")
+        return EXIT_OK
+    index = SegmentIndex(args.index)
+    if args.action == 'stats':
+        segments, videos, cameras = index.stats()
+        print(f"{segments} 个片段，{videos} 个视频，摄像头: {', '.join(cameras) or '无'}")
+    elif args.action == 'query':
+        return _query(index, args)
+    elif args.action == 'import':
+        if not os.path.exists(args.cache):
+            print(f"缓存不存在: {args.cache}")
+            return EXIT_OK
+        results = ResultCache(args.cache).latest_results()
+        added = sum(index.add_video(path, segments) for path, segments in results)
+        print(f"已从 {len(results)} 个视频导入 {added} 个片段")
+    else:
+        paths = None
+        if args.paths:
+            paths = [path for path in args.paths if not os.path.isdir(path)]
+            paths += collect_videos([path for path in args.paths if os.path.isdir(path)])
+        print(f"已删除 {index.remove(paths)} 个片段")
+    return EXIT_OK
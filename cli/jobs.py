@@ -0,0 +1,85 @@
+"""持久化任务队列命令模块
+
+    queue add <paths>    将视频加入队列
+    queue work           领取并执行队列中的任务，可在多台共享文件系统的机器上同时运行
+    queue status         显示各状态的任务数
+    queue retry          将失败的任务重新排队
+"""
+import os
+import sys
+from core.detection_job import build_job_spec
+from core.job_queue import JobQueue
+from core.job_scheduler import estimate_cost
+from cli.scan import collect_videos, EXIT_OK, EXIT_FAILED, EXIT_NO_INPUT, EXIT_INTERRUPTED
+
+DEFAULT_DB = os.path.join('config', 'jobs.db')
+
+def add_arguments(parser):
+    """注册 queue 子命令参数"""
+    parser.add_argument('--db', default=DEFAULT_DB, help='队列数据库文件(多台机器共享时放在共享目录)')
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add_parser = actions.add_parser('add', help='将视频加入队列')
+    add_parser.add_argument('paths', nargs='+', help='视频文件或目录(递归查找视频文件)')
+    add_parser.add_argument('--threshold', type=int, default=25, help='像素差异阈值')
+    add_parser.add_argument('--min-area', type=int, default=1000, help='最小检测区域面积')
+    add_parser.add_argument('--static-time', type=float, default=1.0, help='静止时间阈值(秒)')
+    add_parser.add_argument('--priority', type=int, default=1, help='优先级，数值越小越先处理')
+    add_parser.add_argument('--checkpoint-dir', help='检测断点目录，任务被重新领取时从断点继续')
+    add_parser.set_defaults(action_handler=run_add)
+
+    work_parser = actions.add_parser('work', help='领取并执行队列中的任务')
+    work_parser.add_argument('--workers', type=int, default=2, help='同时检测的视频数量')
+    work_parser.add_argument('--exit-when-idle', action='store_true', help='队列为空时退出')
+    work_parser.add_argument('--metrics-file', help='定期将运行指标(Prometheus文本格式)写入该文件')
+    work_parser.add_argument('--metrics-port', type=int, default=0,
+                             help='在 http://127.0.0.1:端口/metrics 提供运行指标，0表示不启用')
+    work_parser.set_defaults(action_handler=run_work)
+
+    actions.add_parser('status', help='显示各状态的任务数').set_defaults(action_handler=run_status)
+    actions.add_parser('retry', help='将失败的任务重新排队').set_defaults(action_handler=run_retry)
+
+def run(args):
+    """执行 queue 子命令，返回退出码"""
+    return args.action_handler(args, JobQueue(args.db))
+
+def run_add(args, queue):
+    videos = collect_videos(args.paths)
+    if not videos:
+        print("没有找到需要检测的视频文件", file=sys.stderr)
+        return EXIT_NO_INPUT
+    checkpoint_dir = os.path.abspath(args.checkpoint_dir) if args.checkpoint_dir else None
+    for path in videos:
+        spec = build_job_spec(os.path.abspath(path), args.threshold, args.min_area, args.static_time,
+                              checkpoint_dir=checkpoint_dir)
+        job = queue.enqueue(spec, args.priority, estimate_cost(path))
+        print(f"{job['id']}\t{job['state']}\t{path}")
+    return EXIT_OK
+
+def run_work(args, queue):
+    from core.queue_worker import QueueWorker
+    from core.metrics import get_metrics, MetricsExporter
+    worker = QueueWorker(queue.db_path, args.workers,
+                         logger=lambda message: print(message, file=sys.stderr))
+    exporter = None
+    if args.metrics_file or args.metrics_port:
+        get_metrics().add_collector(worker.collect_metrics)
+        exporter = MetricsExporter(args.metrics_file, args.metrics_port)
+        exporter.start()
+    try:
+        ok = worker.run(exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    finally:
+        if exporter is not None:
+            exporter.stop()
+    return EXIT_OK if ok else EXIT_FAILED
+
+def run_status(args, queue):
+    for state, count in queue.counts().items():
+        print(f"{state}\t{count}")
+    return EXIT_OK
+
+def run_retry(args, queue):
+    print(f"已重新排队 {queue.retry_failed()} 个任务")
+    return EXIT_OK
@@ -0,0 +1,34 @@
+"""命令行入口模块"""
+import argparse
+from cli import scan, jobs, serve, cache, index
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog='videoscan', description='监控视频动作检测与切割工具(命令行模式)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    scan_parser = subparsers.add_parser('scan', help='批量检测视频中的动作片段')
+    scan.add_arguments(scan_parser)
+    scan_parser.set_defaults(handler=scan.run)
+    
+    queue_parser = subparsers.add_parser('queue', help='持久化任务队列(多进程、多机器批量检测)')
+    jobs.add_arguments(queue_parser)
+    queue_parser.set_defaults(handler=jobs.run)
+    
+    serve_parser = subparsers.add_parser('serve', help='启动本地HTTP检测服务')
+    serve.add_arguments(serve_parser)
+    serve_parser.set_defaults(handler=serve.run)
+    
+    cache_parser = subparsers.add_parser('cache', help='管理检测结果缓存')
+    cache.add_arguments(cache_parser)
+    cache_parser.set_defaults(handler=cache.run)
+    
+    index_parser = subparsers.add_parser('index', help='查询所有已检测视频的动作片段时间索引')
+    index.add_arguments(index_parser)
+    index_parser.set_defaults(handler=index.run)
+    return parser
+
+def run(argv=None):
+    """解析参数并执行子命令，返回退出码"""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
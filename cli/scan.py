@@ -0,0 +1,160 @@
+"""命令行批量检测模块
+
+不导入Qt和显示模块，直接使用core中的多进程检测引擎和视频切割器，
+每个文件处理完成后输出一行结果(可选JSON格式)。
+"""
+import copy
+import json
+import os
+import sys
+from concurrent.futures import as_completed
+from core.detection_engine import DetectionEngine
+from core.thread_plan import plan_threads, format_plan
+from core.detection_job import build_job_spec
+from core.job_scheduler import estimate_cost
+from core.result_cache import ResultCache, DEFAULT_CACHE_PATH
+from core.segment_index import SegmentIndex, DEFAULT_INDEX_PATH
+from core.profiler import format_summary
+from core.frame_cache import DEFAULT_FRAME_CACHE_DIR, DEFAULT_MAX_MB
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+
+EXIT_OK = 0           # 全部成功
+EXIT_FAILED = 1       # 部分文件处理失败
+EXIT_NO_INPUT = 2     # 参数错误或没有找到视频文件
+EXIT_INTERRUPTED = 130
+
+def add_arguments(parser):
+    """注册 scan 子命令参数"""
+    parser.add_argument('paths', nargs='+', help='视频文件或目录(递归查找视频文件)')
+    parser.add_argument('--workers', type=int, default=2, help='同时检测的视频数量')
+    parser.add_argument('--threshold', type=int, default=25, help='像素差异阈值')
+    parser.add_argument('--min-area', type=int, default=1000, help='最小检测区域面积')
+    parser.add_argument('--static-time', type=float, default=1.0, help='静止时间阈值(秒)')
+    parser.add_argument('--gpu', action='store_true', help='使用OpenCL加速')
+    parser.add_argument('--out', help='输出目录，指定后检测完成立即切割并合并片段')
+    parser.add_argument('--min-peak-area', type=int, default=0, help='切割时跳过峰值运动面积低于此值的片段')
+    parser.add_argument('--min-score', type=float, default=0.0, help='切割时跳过动作分数低于此值的片段')
+    parser.add_argument('--min-active-fraction', type=float, default=0.0,
+                        help='切割时跳过有动作帧比例低于此值的片段')
+    parser.add_argument('--json', action='store_true', help='以JSON行格式输出每个文件的结果')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='检测结果缓存数据库文件')
+    parser.add_argument('--no-cache', action='store_true', help='不使用检测结果缓存')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='片段时间索引数据库文件')
+    parser.add_argument('--no-index', action='store_true', help='不把检测到的片段写入时间索引')
+    parser.add_argument('--frame-cache', nargs='?', const=DEFAULT_FRAME_CACHE_DIR, metavar='DIR',
+                        help='在缩小的灰度帧上检测并缓存这些帧，之后调整参数再次检测时直接回放缓存帧(默认目录 %(const)s)')
+    parser.add_argument('--frame-cache-mb', type=int, default=DEFAULT_MAX_MB, help='帧缓存总大小上限(MB)')
+    parser.add_argument('--pin-cpus', action='store_true', help='为每个工作进程绑定一组物理核心')
+    parser.add_argument('--profile', metavar='DIR',
+                        help='记录检测各阶段耗时，汇总输出到stderr，JSON报告保存到该目录(不使用缓存结果)')
+
+def collect_videos(paths):
+    """展开文件和目录参数，返回视频文件列表"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                videos.extend(os.path.join(root, name) for name in sorted(files)
+                              if name.lower().endswith(VIDEO_EXTENSIONS))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"找不到文件: {path}", file=sys.stderr)
+    return videos
+
+def _log(message):
+    print(message, file=sys.stderr)
+
+def _split(result, args):
+    """切割并合并检测到的片段，返回输出文件列表"""
+    from core.hardware import find_ffmpeg
+    from core.splitter import VideoSplitter
+    splitter = VideoSplitter()
+    splitter.set_log_callback(_log)
+    splitter.set_segment_filter({'min_peak_area': args.min_peak_area, 'min_score': args.min_score,
+                                 'min_active_fraction': args.min_active_fraction})
+    # 合并片段时会原地修改片段列表，传入副本，保证输出的检测结果不变
+    return splitter.split_video(result['video_path'], copy.deepcopy(result['segments']), args.out, find_ffmpeg())
+
+def _emit(out, record, as_json):
+    if as_json:
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    elif record['status'] == 'ok':
+        stats = record['stats']
+        speed = "缓存结果" if record.get('cached') else f"{stats['fps']} 帧/秒 ({stats['realtime_factor']}倍实时)"
+        if stats and stats.get('replayed'):
+            speed += "，回放缓存帧"
+        out.write(f"{record['video_path']}: {len(record['segments'])} 个片段，{speed}\n")
+        for seg in record['segments']:
+            score = f"  分数 {seg['score']}" if 'score' in seg else ""
+            out.write(f"  {seg['start']} - {seg['end']}{score}\n")
+    else:
+        out.write(f"{record['video_path']}: 失败 - {record['error']}\n")
+    out.flush()
+
+def run(args):
+    """执行 scan 子命令，返回退出码"""
+    videos = collect_videos(args.paths)
+    if not videos:
+        _log("没有找到需要检测的视频文件")
+        return EXIT_NO_INPUT
+    videos.sort(key=estimate_cost, reverse=True)  # 最长的视频最先开始，缩短总耗时
+
+    # 结果写到原始stdout，其余输出(包括工作进程的输出)都重定向到stderr，保证JSON行不被污染
+    out = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    cache = None if args.no_cache or args.profile else ResultCache(args.cache)
+    index = None if args.no_index else SegmentIndex(args.index)
+    profile_dir = os.path.abspath(args.profile) if args.profile else None
+    frame_cache_dir = os.path.abspath(args.frame_cache) if args.frame_cache else None
+    plan = plan_threads(args.workers, pin=args.pin_cpus)
+    _log(format_plan(plan))
+    engine = DetectionEngine(args.workers, plan)
+    failures = 0
+    try:
+        futures = {}
+        for path in videos:
+            spec = build_job_spec(path, args.threshold, args.min_area, args.static_time, use_gpu=args.gpu,
+                                  profile_dir=profile_dir, frame_cache_dir=frame_cache_dir,
+                                  frame_cache_mb=args.frame_cache_mb)
+            cached = cache.get(path, spec) if cache else None
+            if cached is None:
+                futures[engine.submit(spec)] = spec
+                continue
+            # 文件和检测参数都未变化，直接使用缓存的结果
+            record = {'video_path': path, 'status': 'ok', 'cached': True,
+                      'segments': cached['segments'], 'stats': cached['stats']}
+            if index:
+                index.add_video(path, cached['segments'])
+            if args.out and cached['segments']:
+                record['outputs'] = _split(dict(record), args)
+            _emit(out, record, args.json)
+        for future in as_completed(futures):
+            spec = futures[future]
+            record = {'video_path': spec['video_path']}
+            try:
+                result = future.result()
+                record.update(status='ok', segments=result['segments'], stats=result['stats'])
+                if result['profile']:
+                    record['profile'] = result['profile']
+                    _log(format_summary(spec['video_path'], result['profile']))
+                if cache:
+                    cache.put(spec['video_path'], spec, result['segments'], result['stats'])
+                if index:
+                    index.add_video(spec['video_path'], result['segments'])
+                if args.out and result['segments']:
+                    record['outputs'] = _split(result, args)
+            except Exception as e:
+                failures += 1
+                record.update(status='error', error=str(e))
+            _emit(out, record, args.json)
+    except KeyboardInterrupt:
+        engine.shutdown(cancel=True)
+        return EXIT_INTERRUPTED
+    finally:
+        out.close()
+    engine.shutdown(cancel=False)
+    return EXIT_FAILED if failures else EXIT_OK
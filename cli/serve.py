@@ -0,0 +1,173 @@
+"""本地HTTP服务模块
+
+    POST /jobs                     提交检测任务 {"paths": [...], "params": {...}, "output_dir": "..."}
+    GET  /jobs                     所有任务
+    GET  /jobs/<id>                任务状态
+    GET  /jobs/<id>/events         任务进度(Server-Sent Events)，任务结束后关闭
+    GET  /jobs/<id>/segments       片段列表和输出文件列表
+    GET  /jobs/<id>/outputs/<n>    下载第n个输出文件
+    GET  /status                   服务状态和吞吐量
+    GET  /metrics                  运行指标(Prometheus文本格式)
+
+只使用标准库，默认只监听127.0.0.1。等待中的任务已满时返回429。
+"""
+import json
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.job_service import JobService, ServiceBusy
+from core.metrics import get_metrics
+from cli.scan import EXIT_OK
+
+FINISHED_STATES = ('done', 'failed')
+RETRY_AFTER = 5  # 队列已满时建议的重试间隔(秒)
+
+def add_arguments(parser):
+    """注册 serve 子命令参数"""
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--workers', type=int, default=2, help='同时检测的视频数量')
+    parser.add_argument('--max-pending', type=int, default=32, help='最多等待中的任务数，超过时拒绝新任务')
+
+def _public(job):
+    """任务记录中对外公开的字段"""
+    return {key: value for key, value in job.items() if key != 'version'}
+
+class RequestHandler(BaseHTTPRequestHandler):
+    service = None  # 由 make_server 设置
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} {format % args}", file=sys.stderr)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send_json(404, {'error': '接口不存在'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            paths = body['paths']
+            if isinstance(paths, str):
+                paths = [paths]
+        except (ValueError, KeyError, TypeError):
+            return self._send_json(400, {'error': '请求体必须是包含 paths 的JSON对象'})
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            return self._send_json(400, {'error': 'paths 必须是文件路径字符串或字符串列表'})
+        if not isinstance(body.get('params') or {}, dict):
+            return self._send_json(400, {'error': 'params 必须是JSON对象'})
+        if not isinstance(body.get('output_dir') or '', str):
+            return self._send_json(400, {'error': 'output_dir 必须是字符串'})
+        jobs, errors = [], []
+        for path in paths:
+            try:
+                jobs.append(_public(self.service.submit(path, body.get('params'), body.get('output_dir'))))
+            except FileNotFoundError as e:
+                errors.append({'path': path, 'error': str(e)})
+            except ServiceBusy as e:
+                if not jobs:
+                    return self._send_json(429, {'error': str(e)}, {'Retry-After': str(RETRY_AFTER)})
+                errors.append({'path': path, 'error': str(e)})  # 部分接收
+        status = 202 if jobs else 400
+        self._send_json(status, {'jobs': jobs, 'errors': errors})
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        if parts == ['status']:
+            return self._send_json(200, self.service.stats())
+        if parts == ['metrics']:
+            return self._send_metrics()
+        if parts == ['jobs']:
+            return self._send_json(200, {'jobs': [_public(self.service.snapshot(job_id))
+                                                  for job_id in list(self.service.jobs)]})
+        if len(parts) < 2 or parts[0] != 'jobs':
+            return self._send_json(404, {'error': '接口不存在'})
+        job = self.service.snapshot(parts[1])
+        if job is None:
+            return self._send_json(404, {'error': '任务不存在'})
+        if len(parts) == 2:
+            return self._send_json(200, _public(job))
+        if parts[2:] == ['segments']:
+            return self._send_json(200, {'id': job['id'], 'state': job['state'],
+                                         'segments': job['segments'], 'outputs': job['outputs']})
+        if parts[2:] == ['events']:
+            return self._stream_events(job)
+        if len(parts) == 4 and parts[2] == 'outputs' and parts[3].isdigit():
+            return self._send_file(job, int(parts[3]))
+        self._send_json(404, {'error': '接口不存在'})
+
+    def _send_metrics(self):
+        data = get_metrics().render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self, job):
+        """以SSE推送任务状态变化，任务结束后发送 done 事件并关闭连接"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        try:
+            while True:
+                event = 'done' if job['state'] in FINISHED_STATES else 'progress'
+                data = json.dumps(_public(job), ensure_ascii=False)
+                self.wfile.write(f"event: {event}\ndata: {data}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if event == 'done':
+                    return
+                version = job['version']
+                job = self.service.wait_for_change(job['id'], version)
+                if job['version'] == version:
+                    self.wfile.write(b": keep-alive\n\n")  # 超时无变化时保持连接
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def _send_file(self, job, index):
+        if index >= len(job['outputs']) or not os.path.isfile(job['outputs'][index]):
+            return self._send_json(404, {'error': '输出文件不存在'})
+        path = job['outputs'][index]
+        self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f'attachment; filename="{os.path.basename(path)}"')
+        self.end_headers()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+def make_server(service, host='127.0.0.1', port=8765):
+    """创建HTTP服务器，port为0时使用系统分配的端口"""
+    handler = type('BoundRequestHandler', (RequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def run(args):
+    """执行 serve 子命令，返回退出码"""
+    service = JobService(args.workers, args.max_pending,
+                         logger=lambda message: print(message, file=sys.stderr))
+    get_metrics().add_collector(service.collect_metrics)
+    server = make_server(service, args.host, args.port)
+    print(f"检测服务已启动: http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return EXIT_OK
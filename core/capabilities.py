@@ -0,0 +1,106 @@
+"""硬件和工具能力缓存模块
+
+GPU/OpenCL/CUDA探测(Windows下还需要WMI查询)和FFmpeg查找的结果缓存在磁盘上，
+启动时只比较指纹(系统、Python、OpenCV模块文件、FFmpeg文件的修改时间)，不再重新探测；
+命中缓存后在后台线程重新探测一次，发现变化(如显卡驱动更新)时更新缓存并通知调用方。
+"""
+import importlib.util
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path('.') / 'config' / 'capabilities.json'
+CACHE_VERSION = 1
+
+def _file_stamp(path):
+    """文件路径和修改时间，文件不存在时返回None"""
+    if not path or not os.path.exists(path):
+        return None
+    return [os.path.abspath(path), int(os.path.getmtime(path))]
+
+class CapabilityCache:
+    """硬件和工具能力缓存"""
+    def __init__(self, probe, path=DEFAULT_CACHE_PATH):
+        """
+        Args:
+            probe: 探测函数，返回可JSON序列化的能力字典，其中 'ffmpeg_path' 为FFmpeg路径
+            path: 缓存文件路径
+        """
+        self.probe = probe
+        self.path = Path(path)
+        self.probe_seconds = None  # 最近一次探测耗时
+
+    def fingerprint(self, capabilities):
+        """环境指纹，不导入OpenCV，只检查模块文件"""
+        spec = importlib.util.find_spec('cv2')
+        return {
+            'version': CACHE_VERSION,
+            'system': [platform.system(), platform.release(), platform.machine()],
+            'python': platform.python_version(),
+            'opencv': _file_stamp(spec.origin if spec else None),
+            'ffmpeg': _file_stamp(capabilities.get('ffmpeg_path')),
+        }
+
+    def load(self):
+        """读取缓存，指纹不一致或缓存损坏时返回None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            capabilities = data['capabilities']
+            if data['fingerprint'] != self.fingerprint(capabilities):
+                return None
+            return capabilities
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, capabilities):
+        """写入缓存(临时文件+重命名)"""
+        data = {'fingerprint': self.fingerprint(capabilities), 'capabilities': capabilities,
+                'probe_seconds': self.probe_seconds, 'probed_at': time.time()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"保存硬件信息缓存失败: {str(e)}")
+
+    def _probe(self):
+        start = time.perf_counter()
+        capabilities = self.probe()
+        self.probe_seconds = round(time.perf_counter() - start, 3)
+        return capabilities
+
+    def get(self, refresh=True, on_change=None):
+        """获取能力字典，优先使用缓存
+
+        Args:
+            refresh: 命中缓存时是否在后台重新探测
+            on_change: 后台探测结果与缓存不同时的回调，参数为新的能力字典(在后台线程中调用)
+        Returns:
+            tuple: (能力字典, 是否来自缓存)
+        """
+        capabilities = self.load()
+        if capabilities is None:
+            capabilities = self._probe()
+            self.save(capabilities)
+            return capabilities, False
+        if refresh:
+            threading.Thread(target=self._refresh, args=(capabilities, on_change), daemon=True).start()
+        return capabilities, True
+
+    def _refresh(self, cached, on_change):
+        """后台重新探测，结果变化时更新缓存"""
+        try:
+            capabilities = self._probe()
+        except Exception as e:
+            print(f"后台硬件检测失败: {str(e)}")
+            return
+        self.save(capabilities)
+        if capabilities != cached and on_change is not None:
+            on_change(capabilities)
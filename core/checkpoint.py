@@ -0,0 +1,120 @@
+"""检测断点模块
+
+定期保存每个视频的检测器状态(帧号、未完成片段、静止计数、已完成片段、上一帧和片段缩略图)，
+程序关闭、崩溃或停止检测后，再次检测时从断点继续，结果与一次性检测完全一致。
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+
+CHECKPOINT_INTERVAL = 30  # 保存断点的最小间隔(秒)
+
+def _pack_thumbnails(state, arrays):
+    """缩略图收集器状态中的图像数据存为数组，其余部分留在JSON中"""
+    for i, thumb in enumerate(state['thumbnails']):
+        arrays[f'thumb_{i}'] = np.frombuffer(thumb['data'], dtype=np.uint8)
+    for i, tile in enumerate(state['sheet_tiles']):
+        arrays[f'tile_{i}'] = tile
+    if state['buffer'] is not None:
+        arrays['thumb_buffer'] = state['buffer']
+    return {
+        'thumbnails': [dict(thumb, data=None, motion_area=float(thumb['motion_area']))
+                       for thumb in state['thumbnails']],
+        'sheet_tiles': len(state['sheet_tiles']),
+        'peak_area': state['peak_area'],
+        'peak_frame': state['peak_frame'],
+    }
+
+def _unpack_thumbnails(state, data):
+    return dict(
+        state,
+        thumbnails=[dict(thumb, data=data[f'thumb_{i}'].tobytes()) for i, thumb in enumerate(state['thumbnails'])],
+        sheet_tiles=[data[f'tile_{i}'] for i in range(state['sheet_tiles'])],
+        buffer=data['thumb_buffer'] if 'thumb_buffer' in data else None)
+
+class CheckpointStore:
+    """检测断点存储，每个视频一个文件，写入采用临时文件+重命名保证原子性"""
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else Path('.') / 'config' / 'checkpoints'
+
+    def _path(self, video_path):
+        key = hashlib.sha1(os.path.abspath(video_path).encode('utf-8')).hexdigest()
+        return self.directory / f"{key}.npz"
+
+    def _fingerprint(self, video_path):
+        """视频文件指纹，文件被修改后断点失效"""
+        stat = os.stat(video_path)
+        return [stat.st_size, int(stat.st_mtime)]
+
+    def save(self, video_path, frame_index, segments, detector_state, params):
+        """保存断点
+
+        Args:
+            video_path: 视频文件路径
+            frame_index: 下一个待处理的帧号
+            segments: 已完成的片段列表
+            detector_state: MotionDetector.get_state() 的返回值
+            params: 检测参数，参数变化后断点失效
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        state = dict(detector_state)
+        prev_frame = state.pop('prev_frame')
+        arrays = {}
+        if state.get('thumbnails'):
+            state['thumbnails'] = _pack_thumbnails(state['thumbnails'], arrays)
+        meta = {
+            'video_path': os.path.abspath(video_path),
+            'fingerprint': self._fingerprint(video_path),
+            'params': params,
+            'frame_index': frame_index,
+            'segments': segments,
+            'detector': state,
+        }
+        arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+        if prev_frame is not None:
+            arrays['prev_frame'] = prev_frame
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(temp_path, self._path(video_path))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, video_path, params):
+        """读取断点，视频或检测参数变化时返回None
+
+        Returns:
+            dict: {'frame_index', 'segments', 'detector_state'} 或 None
+        """
+        path = self._path(video_path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                prev_frame = data['prev_frame'] if 'prev_frame' in data else None
+                if meta['detector'].get('thumbnails'):
+                    meta['detector']['thumbnails'] = _unpack_thumbnails(meta['detector']['thumbnails'], data)
+        except Exception as e:
+            print(f"读取检测断点失败: {str(e)}")
+            return None
+        if meta['fingerprint'] != self._fingerprint(video_path) or meta['params'] != params:
+            return None
+        detector_state = dict(meta['detector'], prev_frame=prev_frame)
+        return {
+            'frame_index': meta['frame_index'],
+            'segments': meta['segments'],
+            'detector_state': detector_state,
+        }
+
+    def remove(self, video_path):
+        """删除断点"""
+        path = self._path(video_path)
+        if path.exists():
+            path.unlink()
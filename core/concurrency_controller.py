@@ -0,0 +1,85 @@
+"""自适应并行度控制模块
+
+根据实时CPU占用、可用内存、磁盘读取速度和总检测帧率，动态增减同时检测的视频数量。
+采用爬山法：资源有余量时尝试增加一个任务，如果总帧率没有明显提升则回退并保持一段时间。
+"""
+import time
+import psutil
+
+class ConcurrencyController:
+    """并行检测任务数控制器"""
+    def __init__(self, floor=1, ceiling=None, initial=None, memory_headroom_mb=1024,
+                 cpu_high=90.0, min_gain=0.05, cooldown_samples=3, logger=print):
+        """
+        Args:
+            floor: 最少并行任务数
+            ceiling: 最多并行任务数，默认为物理核心数
+            initial: 初始并行任务数
+            memory_headroom_mb: 需要保留的可用内存(MB)，低于该值时减少任务
+            cpu_high: CPU占用率上限(%)，超过时不再增加任务
+            min_gain: 增加任务后总帧率至少提升的比例，否则回退
+            cooldown_samples: 回退后保持不变的采样次数
+            logger: 日志函数，记录每次调整的原因
+        """
+        self.floor = max(1, int(floor))
+        self.ceiling = max(self.floor, int(ceiling or psutil.cpu_count(logical=False) or 1))
+        self.target = min(max(int(initial or self.floor), self.floor), self.ceiling)
+        self.memory_headroom = memory_headroom_mb * 1024 * 1024
+        self.cpu_high = cpu_high
+        self.min_gain = min_gain
+        self.cooldown_samples = cooldown_samples
+        self.logger = logger
+        self._cooldown = 0
+        self._last_time = None
+        self._last_frames = 0
+        self._last_read_bytes = self._disk_read_bytes()
+        self._last_fps = None
+        self._probing = False  # 上一次调整是否为试探性增加
+        psutil.cpu_percent(None)  # 初始化CPU采样基准
+
+    def _disk_read_bytes(self):
+        counters = psutil.disk_io_counters()
+        return counters.read_bytes if counters else 0
+
+    def update(self, total_frames):
+        """采样一次系统负载并返回新的并行任务数
+
+        Args:
+            total_frames: 本批次所有任务累计已检测的帧数
+        """
+        now = time.monotonic()
+        if self._last_time is None:
+            self._last_time, self._last_frames = now, total_frames
+            return self.target
+        elapsed = max(now - self._last_time, 1e-6)
+        fps = (total_frames - self._last_frames) / elapsed
+        read_bytes = self._disk_read_bytes()
+        read_mb_s = (read_bytes - self._last_read_bytes) / elapsed / (1024 * 1024)
+        cpu = psutil.cpu_percent(None)
+        available = psutil.virtual_memory().available
+        self._last_time, self._last_frames, self._last_read_bytes = now, total_frames, read_bytes
+
+        load = f"CPU {cpu:.0f}%, 可用内存 {available // (1024 * 1024)}MB, 磁盘读取 {read_mb_s:.1f}MB/s, 总帧率 {fps:.0f}帧/秒"
+        previous_fps, self._last_fps = self._last_fps, fps
+        probing, self._probing = self._probing, False
+
+        if available < self.memory_headroom and self.target > self.floor:
+            return self._set_target(self.target - 1, f"可用内存不足 ({load})")
+        if probing and previous_fps is not None and fps < previous_fps * (1 + self.min_gain):
+            self._cooldown = self.cooldown_samples
+            return self._set_target(self.target - 1, f"增加任务后帧率未提升 ({load})")
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return self.target
+        if cpu < self.cpu_high and self.target < self.ceiling \
+                and available >= self.memory_headroom * 2:
+            self._probing = True
+            return self._set_target(self.target + 1, f"资源有余量 ({load})")
+        return self.target
+
+    def _set_target(self, target, reason):
+        target = min(max(target, self.floor), self.ceiling)
+        if target != self.target:
+            self.logger(f"并行任务数调整: {self.target} -> {target}，原因: {reason}")
+            self.target = target
+        return self.target
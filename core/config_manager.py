@@ -1,13 +1,68 @@
-"""配置管理模块"""
+"""配置管理模块
+
+整个程序共享一个配置实例(get_config)，配置只在启动时读取一次，之后所有线程都从内存读取。
+修改配置会通知监听者，写入磁盘有防抖(连续修改只写一次)，并通过临时文件+重命名保证原子性。
+"""
+import atexit
 import json
 import os
+import tempfile
+import threading
+import weakref
 from pathlib import Path
 
+SAVE_DELAY = 0.5  # 配置修改后延迟写入磁盘的时间(秒)
+
+DEFAULT_CONFIG = {
+    'last_video_path': '',
+    'recent_video_list': [],  # 添加最近使用的视频列表
+    'window_scale': 0.4,  # 调整默认缩放比例为 0.4
+    'playback_speed': 1.0,
+    'output_directory': '',  # 添加输出目录配置项
+    'auto_split': False,  # 添加自动切割配置项
+    'max_concurrent_videos': 2,  # 默认同时处理2个视频
+    'show_preview': True,  # 添加是否显示预览的配置项
+    'preview_fps': 10,  # 每个任务预览的最高刷新帧率
+    'save_thumbnails': False,  # 是否导出片段缩略图
+    'use_process_pool': False,  # 是否使用多进程检测引擎
+    'adaptive_concurrency': False,  # 是否根据系统负载自动调整并行数
+    'concurrency_floor': 1,  # 自动调整时的最少并行数
+    'concurrency_ceiling': 0,  # 自动调整时的最多并行数，0表示物理核心数
+    'memory_headroom_mb': 1024,  # 自动调整时需保留的可用内存(MB)
+    'enable_checkpoints': True,  # 是否保存检测断点，停止后可从断点继续
+    'job_queue_path': '',  # 共享任务队列数据库路径，为空表示不使用
+    'use_result_cache': True,  # 文件和检测设置未变化时直接使用缓存的检测结果
+    'min_segment_peak_area': 0,  # 切割时跳过峰值运动面积(像素)低于此值的片段
+    'min_segment_score': 0.0,  # 切割时跳过动作分数低于此值的片段
+    'min_segment_active_fraction': 0.0,  # 切割时跳过有动作帧比例低于此值的片段
+    'frame_cache_mb': 0,  # 低分辨率帧缓存上限(MB)，大于0时在缩小的帧上检测并缓存，重复检测时回放(仅多进程引擎)
+    'use_segment_index': True,  # 是否把检测到的片段写入时间索引(config/segments.db)
+    'pin_cpu_affinity': False,  # 多进程检测时是否为每个工作进程绑定一组物理核心
+    'enable_profiling': False,  # 是否记录检测各阶段耗时(日志汇总和JSON报告)
+    'metrics_file': '',  # 运行指标文件路径(Prometheus文本格式)，为空表示不写入
+    'metrics_port': 0,  # 运行指标HTTP端口(只监听127.0.0.1)，0表示不启用
+}
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_config():
+    """获取共享的配置实例"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ConfigManager()
+            atexit.register(_shared.flush)
+        return _shared
+
 class ConfigManager:
-    """配置管理类"""
+    """配置管理类，线程安全"""
     def __init__(self):
         self.config_dir = Path('.') / 'config'  # 改为当前目录下的 config 文件夹
         self.config_file = self.config_dir / 'config.json'
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._save_timer = None
         self.config = self._load_config()
 
     def _load_config(self):
@@ -27,39 +82,89 @@ class ConfigManager:
 
     def _get_default_config(self):
         """获取默认配置"""
-        return {
-            'last_video_path': '',
-            'recent_video_list': [],  # 添加最近使用的视频列表
-            'window_scale': 0.4,  # 调整默认缩放比例为 0.4
-            'playback_speed': 1.0,
-            'output_directory': '',  # 添加输出目录配置项
-            'auto_split': False,  # 添加自动切割配置项
-            'max_concurrent_videos': 2,  # 默认同时处理2个视频
-            'show_preview': True,  # 添加是否显示预览的配置项
-        }
+        return json.loads(json.dumps(DEFAULT_CONFIG))
+
+    def get(self, key):
+        """读取配置项，按默认值的类型转换，无法转换时返回默认值"""
+        default = DEFAULT_CONFIG[key]
+        with self._lock:
+            value = self.config.get(key, default)
+        try:
+            if isinstance(default, bool):
+                return bool(value)
+            if isinstance(default, (int, float, str)):
+                return type(default)(value)
+            if isinstance(default, list):
+                return list(value)
+        except (TypeError, ValueError):
+            return default
+        return value
+
+    def set(self, key, value):
+        """修改配置项，值有变化时通知监听者并延迟写入磁盘"""
+        with self._lock:
+            if self.config.get(key) == value:
+                return
+            self.config[key] = value
+        self._notify(key, value)
+        self.save_config()
+
+    def add_listener(self, callback):
+        """添加配置变化监听者，callback(key, value)；绑定方法以弱引用保存，对象销毁后自动移除"""
+        ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else (lambda: callback)
+        with self._lock:
+            self._listeners.append(ref)
+
+    def _notify(self, key, value):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            listeners = [ref() for ref in self._listeners]
+        for callback in listeners:
+            if callback is not None:
+                callback(key, value)
 
     def save_config(self):
-        """保存配置到文件"""
+        """延迟保存配置，SAVE_DELAY内的多次修改只写一次磁盘"""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """立即将配置写入磁盘(临时文件+重命名)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            data = json.dumps(self.config, ensure_ascii=False, indent=4)
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=4)
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.config_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.config_file)
         except Exception as e:
             print(f"保存配置文件失败: {str(e)}")
 
     def get_last_video_path(self):
         """获取上次打开的视频路径"""
-        return self.config.get('last_video_path', '')
+        return self.get('last_video_path')
 
     def set_last_video_path(self, path):
         """设置上次打开的视频路径"""
-        self.config['last_video_path'] = path
+        self.set('last_video_path', path)
         # 同时更新最近视频列表
         self.add_to_recent_videos(path)
-        self.save_config()
 
     def get_recent_videos(self):
         """获取最近使用的视频列表"""
-        return self.config.get('recent_video_list', [])
+        return self.get('recent_video_list')
+
+    def set_recent_videos(self, paths):
+        """设置最近使用的视频列表"""
+        self.set('recent_video_list', list(paths)[:10])
 
     def add_to_recent_videos(self, path):
         """添加视频到最近使用列表
@@ -77,8 +182,7 @@ class ConfigManager:
         recent_list.insert(0, path)
         
         # 保持列表长度不超过10个
-        self.config['recent_video_list'] = recent_list[:10]
-        self.save_config()
+        self.set('recent_video_list', recent_list[:10])
 
     def remove_from_recent_videos(self, path):
         """从最近使用列表中移除视频
@@ -89,43 +193,47 @@ class ConfigManager:
         recent_list = self.get_recent_videos()
         if path in recent_list:
             recent_list.remove(path)
-            self.config['recent_video_list'] = recent_list
-            self.save_config()
+            self.set('recent_video_list', recent_list)
 
     def clear_recent_videos(self):
         """清空最近使用的视频列表"""
-        self.config['recent_video_list'] = []
-        self.save_config()
+        self.set('recent_video_list', [])
 
     def get_window_scale(self):
         """获取窗口缩放比例"""
-        return self.config.get('window_scale', 0.4)
+        return self.get('window_scale')
+
+    def set_window_scale(self, scale):
+        """设置窗口缩放比例"""
+        self.set('window_scale', scale)
 
     def get_playback_speed(self):
         """获取播放速度"""
-        return self.config.get('playback_speed', 1.0)
+        return self.get('playback_speed')
+
+    def set_playback_speed(self, speed):
+        """设置播放速度"""
+        self.set('playback_speed', speed)
 
     def get_output_directory(self):
         """获取输出目录"""
-        return self.config.get('output_directory', '')
+        return self.get('output_directory')
 
     def set_output_directory(self, path):
         """设置输出目录"""
-        self.config['output_directory'] = path
-        self.save_config()
+        self.set('output_directory', path)
 
     def get_auto_split(self):
         """获取是否自动切割视频"""
-        return self.config.get('auto_split', False)
+        return self.get('auto_split')
 
     def set_auto_split(self, auto_split):
         """设置是否自动切割视频"""
-        self.config['auto_split'] = auto_split
-        self.save_config()
+        self.set('auto_split', auto_split)
         
     def get_max_concurrent_videos(self):
         """获取同时处理的最大视频数量"""
-        return self.config.get('max_concurrent_videos', 2)
+        return self.get('max_concurrent_videos')
         
     def set_max_concurrent_videos(self, count):
         """设置同时处理的最大视频数量
@@ -134,14 +242,94 @@ class ConfigManager:
             count: 同时处理的视频数量，必须大于0
         """
         count = max(1, int(count))  # 确保至少为1
-        self.config['max_concurrent_videos'] = count
-        self.save_config()
+        self.set('max_concurrent_videos', count)
 
     def get_show_preview(self):
         """获取是否显示预览界面"""
-        return self.config.get('show_preview', True)
+        return self.get('show_preview')
 
     def set_show_preview(self, show_preview):
         """设置是否显示预览界面"""
-        self.config['show_preview'] = show_preview
-        self.save_config()
\ No newline at end of file
+        self.set('show_preview', show_preview)
+
+    def get_preview_fps(self):
+        """获取预览最高刷新帧率"""
+        return max(self.get('preview_fps'), 1)
+
+    def get_save_thumbnails(self):
+        """获取是否导出片段缩略图"""
+        return self.get('save_thumbnails')
+
+    def set_save_thumbnails(self, save_thumbnails):
+        """设置是否导出片段缩略图"""
+        self.set('save_thumbnails', save_thumbnails)
+
+    def get_use_process_pool(self):
+        """获取是否使用多进程检测引擎"""
+        return self.get('use_process_pool')
+
+    def set_use_process_pool(self, use_process_pool):
+        """设置是否使用多进程检测引擎"""
+        self.set('use_process_pool', use_process_pool)
+
+    def get_adaptive_concurrency(self):
+        """获取是否根据系统负载自动调整并行数"""
+        return self.get('adaptive_concurrency')
+
+    def set_adaptive_concurrency(self, adaptive):
+        """设置是否根据系统负载自动调整并行数"""
+        self.set('adaptive_concurrency', adaptive)
+
+    def get_concurrency_limits(self):
+        """获取自动调整并行数的限制
+
+        Returns:
+            tuple: (最少并行数, 最多并行数(0表示物理核心数), 需保留的可用内存MB)
+        """
+        return (self.get('concurrency_floor'),
+                self.get('concurrency_ceiling'),
+                self.get('memory_headroom_mb'))
+
+    def get_enable_checkpoints(self):
+        """获取是否保存检测断点"""
+        return self.get('enable_checkpoints')
+
+    def get_job_queue_path(self):
+        """获取共享任务队列数据库路径，为空表示不使用"""
+        return self.get('job_queue_path')
+
+    def get_use_result_cache(self):
+        """获取是否使用检测结果缓存"""
+        return self.get('use_result_cache')
+
+    def get_segment_filter(self):
+        """获取切割前的片段过滤条件，参数见 core.segment_stats.filter_segments"""
+        return {
+            'min_peak_area': self.get('min_segment_peak_area'),
+            'min_score': self.get('min_segment_score'),
+            'min_active_fraction': self.get('min_segment_active_fraction'),
+        }
+
+    def get_frame_cache_mb(self):
+        """获取低分辨率帧缓存上限(MB)，0表示不使用帧缓存"""
+        return self.get('frame_cache_mb')
+
+    def get_use_segment_index(self):
+        """获取是否把检测到的片段写入时间索引"""
+        return self.get('use_segment_index')
+
+    def get_pin_cpu_affinity(self):
+        """获取多进程检测时是否为工作进程绑定CPU"""
+        return self.get('pin_cpu_affinity')
+
+    def get_enable_profiling(self):
+        """获取是否记录检测各阶段耗时"""
+        return self.get('enable_profiling')
+
+    def get_metrics_export(self):
+        """获取运行指标导出设置
+
+        Returns:
+            tuple: (指标文件路径(为空表示不写入), HTTP端口(0表示不启用))
+        """
+        return self.get('metrics_file'), self.get('metrics_port')
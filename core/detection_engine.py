@@ -0,0 +1,95 @@
+"""多进程检测引擎模块
+
+每个视频在独立的工作进程中检测，避免解码循环、片段统计和进度信号争用同一个GIL。
+工作进程只导入core模块，进度通过轻量的 multiprocessing.Queue 回传。
+"""
+import itertools
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from .metrics import get_metrics
+from .thread_plan import plan_threads, apply_worker_plan
+
+_progress_queue = None  # 工作进程内的进度队列
+_stop_event = None  # 工作进程内的停止事件
+
+def _init_worker(progress_queue, stop_event, plan, slots):
+    """工作进程初始化：按线程分配设置OpenCV和解码线程数，可选绑定CPU"""
+    global _progress_queue, _stop_event
+    _progress_queue = progress_queue
+    _stop_event = stop_event
+    with slots.get_lock():
+        slot = slots.value
+        slots.value += 1
+    apply_worker_plan(plan, slot)
+
+def _run_job(spec, job_id):
+    """在工作进程中执行检测任务，上报的遥测数据带任务ID"""
+    from .detection_job import run_detection_job
+    return run_detection_job(spec, lambda telemetry: _progress_queue.put(dict(telemetry, job_id=job_id)),
+                             _stop_event.is_set)
+
+class DetectionEngine:
+    """基于进程池的检测引擎"""
+    def __init__(self, max_workers=2, plan=None):
+        """
+        Args:
+            max_workers: 工作进程数
+            plan: 线程分配(见 thread_plan.plan_threads)，默认按物理核心数在工作进程之间平均分配
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.plan = plan or plan_threads(self.max_workers)
+        self._active = set()  # 正在检测的任务ID，任务结束后迟到的进度数据不再计入运行指标
+        self._ids = itertools.count(1)
+        context = multiprocessing.get_context('spawn')  # 不继承父进程的Qt状态
+        self._progress_queue = context.Queue()
+        self._stop_event = context.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._progress_queue, self._stop_event, self.plan, context.Value('i', 0)))
+
+    def submit(self, spec, job_id=None):
+        """提交检测任务，返回结果为 run_detection_job 返回值的 Future
+
+        Args:
+            spec: build_job_spec 生成的任务描述
+            job_id: 任务ID，随遥测数据一起上报(同一视频可能同时有多个任务)，默认自动编号
+        """
+        if job_id is None:
+            job_id = f"engine-{next(self._ids)}"
+        future = self._executor.submit(_run_job, spec, job_id)
+        self._active.add(job_id)
+        future.add_done_callback(lambda f, path=spec['video_path']: self._job_done(job_id, path, f))
+        return future
+
+    def _job_done(self, job_id, video_path, future):
+        """任务结束时更新运行指标"""
+        self._active.discard(job_id)
+        frames = None
+        if not future.cancelled() and future.exception() is None:
+            frames = future.result()['stats']['frames']
+        get_metrics().finish_job(job_id, video_path, frames)
+
+    def poll_progress(self):
+        """非阻塞地取出所有已上报的遥测数据字典(含 job_id)"""
+        updates = []
+        while True:
+            try:
+                telemetry = self._progress_queue.get_nowait()
+            except queue.Empty:
+                return updates
+            if telemetry['job_id'] in self._active:
+                get_metrics().update_job(telemetry['job_id'], telemetry['video_path'], telemetry)
+            updates.append(telemetry)
+
+    def stop(self):
+        """通知所有工作进程停止正在进行的检测"""
+        self._stop_event.set()
+
+    def shutdown(self, cancel=True):
+        """关闭引擎，cancel为True时先停止正在进行的检测"""
+        if cancel:
+            self.stop()
+        self._executor.shutdown(wait=False, cancel_futures=cancel)
@@ -0,0 +1,119 @@
+"""检测任务模块
+
+定义可序列化(可pickle)的检测任务描述，以及在工作进程中执行检测的函数。
+本模块只依赖core，不导入Qt和显示相关模块，可在子进程或无界面环境中运行。
+"""
+import os
+import time
+from .thumbnails import ThumbnailCollector
+from .checkpoint import CheckpointStore, CHECKPOINT_INTERVAL
+from .telemetry import TELEMETRY_HZ
+from .profiler import StageProfiler
+from .frame_cache import FrameCache, FRAME_CACHE_WIDTH, DEFAULT_MAX_MB
+from .motion_events import (MotionEventStream, DEFAULT_PARAMS, EVENT_RESUMED,
+                            EVENT_SEGMENT_CLOSE, EVENT_STATS)
+
+class DetectionCancelled(Exception):
+    """检测任务被取消"""
+
+def build_job_spec(video_path, threshold=25, min_area=1000, static_time_threshold=1.0,
+                   regions=None, use_gpu=False, thumbnail_dir=None, checkpoint_dir=None, profile_dir=None,
+                   frame_cache_dir=None, frame_cache_mb=DEFAULT_MAX_MB):
+    """构建检测任务描述
+
+    Args:
+        video_path: 视频文件路径
+        threshold: 像素差异阈值
+        min_area: 最小检测区域面积
+        static_time_threshold: 静止时间阈值(秒)
+        regions: 排除区域列表 [{'x', 'y', 'w', 'h'}]，None表示使用默认排除区域
+        use_gpu: 是否使用OpenCL加速
+        thumbnail_dir: 缩略图导出目录，None表示不导出
+        checkpoint_dir: 检测断点目录，None表示不保存断点
+        profile_dir: 分阶段耗时报告目录，None表示不计时
+        frame_cache_dir: 低分辨率帧缓存目录，None表示不使用帧缓存；使用时在缓存宽度上检测
+        frame_cache_mb: 帧缓存总大小上限(MB)
+    Returns:
+        dict: 只包含基本类型，可跨进程传递
+    """
+    spec = {
+        'video_path': video_path,
+        'threshold': threshold,
+        'min_area': min_area,
+        'static_time_threshold': static_time_threshold,
+        'regions': regions,
+        'use_gpu': use_gpu,
+        'thumbnail_dir': thumbnail_dir,
+        'checkpoint_dir': checkpoint_dir,
+        'profile_dir': profile_dir,
+        'frame_cache_dir': frame_cache_dir,
+        'frame_cache_mb': frame_cache_mb,
+    }
+    if frame_cache_dir:
+        spec['analysis_width'] = FRAME_CACHE_WIDTH  # 帧缓存中的帧已缩小，检测也在该宽度上进行
+    return spec
+
+def run_detection_job(spec, progress_callback=None, should_stop=None):
+    """执行单个视频的动作检测
+
+    Args:
+        spec: build_job_spec 生成的任务描述
+        progress_callback: 遥测回调，参数为 JobTelemetry 生成的数据字典，按固定频率合并上报
+        should_stop: 返回True时中止检测的函数
+    Returns:
+        dict: {'video_path', 'segments', 'thumbnails', 'stats', 'profile'}，未开启计时时 profile 为None
+    """
+    video_path = spec['video_path']
+    thumbnails = ThumbnailCollector() if spec.get('thumbnail_dir') else None  # 不导出时不复制峰值帧
+    checkpoints = CheckpointStore(spec['checkpoint_dir']) if spec.get('checkpoint_dir') else None
+    params = {key: spec[key] for key in DEFAULT_PARAMS if key in spec}
+    profiler = StageProfiler(video_path) if spec.get('profile_dir') else None
+    frame_cache = None
+    if spec.get('frame_cache_dir'):
+        frame_cache = FrameCache(spec['frame_cache_dir'], spec['frame_cache_mb'])
+    stream = MotionEventStream(video_path, params, 1.0 / TELEMETRY_HZ, thumbnails, checkpoints, profiler,
+                               frame_cache)
+    start_time = time.monotonic()
+    last_checkpoint = start_time
+    segments = []
+    for event in stream:
+        if event['type'] == EVENT_SEGMENT_CLOSE:
+            segments.append({key: value for key, value in event.items() if key != 'type'})
+        elif event['type'] == EVENT_RESUMED:
+            segments = event['segments']
+        elif event['type'] == EVENT_STATS and not event.get('done'):
+            if progress_callback is not None:
+                progress_callback({key: value for key, value in event.items() if key != 'type'})
+            if should_stop is not None and should_stop():
+                if checkpoints:
+                    stream.save_checkpoint(segments)
+                raise DetectionCancelled(f"检测已取消: {os.path.basename(video_path)}")
+            if checkpoints and time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                stream.save_checkpoint(segments)
+                last_checkpoint = time.monotonic()
+
+    if checkpoints:
+        checkpoints.remove(video_path)
+    if thumbnails is not None:
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        thumbnails.export(spec['thumbnail_dir'], base_name)
+    if profiler is not None:
+        profiler.save(spec['profile_dir'])
+
+    elapsed = time.monotonic() - start_time
+    processed = stream.frame_index - stream.start_frame  # 本次实际检测的帧数
+    fps = stream.fps
+    return {
+        'video_path': video_path,
+        'segments': segments,
+        'thumbnails': thumbnails.thumbnails if thumbnails is not None else [],
+        'profile': profiler.summary() if profiler is not None else None,
+        'stats': {
+            'frames': processed,
+            'resumed_from': stream.start_frame,
+            'elapsed': round(elapsed, 3),
+            'fps': round(processed / elapsed, 2) if elapsed > 0 else 0,
+            'realtime_factor': round(processed / fps / elapsed, 2) if elapsed > 0 and fps else 0,
+            'replayed': stream.replayed,
+        }
+    }
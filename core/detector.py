@@ -3,6 +3,7 @@ import cv2
 import numpy as np
 import math
 from .region_manager import RegionManager
+from .segment_stats import SegmentStatsCollector
 
 class MotionDetector:
     def __init__(self, threshold=25, min_area=1000, static_time_threshold=1.0):
@@ -27,6 +28,22 @@ class MotionDetector:
         self.segment_start = None
         self.current_time = 0
         self.last_segment_end = 0  # 记录上一个片段的结束时间
+        self.thumbnails = None  # 片段缩略图收集器，可选
+        self.profiler = None  # 分阶段计时器(StageProfiler)，可选
+        self.last_boxes = []  # 最近一帧的运动框 [(x, y, w, h)]，供预览绘制
+        self.segment_stats = SegmentStatsCollector()  # 当前片段的统计信息
+        self.input_scale = 1.0  # 检测分辨率相对原始帧的比例
+        self.analysis_size = None  # 检测前缩小到的尺寸 (宽, 高)，None表示使用原始分辨率
+        self.blur_size = 21
+        self.prepared = None  # 最近一帧预处理后(缩小、模糊)的灰度帧
+        
+    def set_thumbnail_collector(self, collector):
+        """设置片段缩略图收集器(ThumbnailCollector)"""
+        self.thumbnails = collector
+        
+    def set_profiler(self, profiler):
+        """设置分阶段计时器(StageProfiler)，None表示关闭计时"""
+        self.profiler = profiler
         
     def set_fps(self, fps):
         """设置视频FPS，用于计算静止时间阈值"""
@@ -35,42 +52,77 @@ class MotionDetector:
         
     def adjust_exclude_regions(self, frame_width, frame_height):
         """调整排除区域"""
+        self.segment_stats.frame_area = frame_width * frame_height
         self.region_manager.adjust_exclude_regions(frame_width, frame_height)
         
+    def set_analysis_width(self, frame_width, frame_height, analysis_width):
+        """设置检测宽度，宽于该值的帧先缩小再检测，0表示使用原始分辨率
+
+        最小面积和排除区域按比例换算，运动框和运动面积仍以原始分辨率报告。
+        """
+        if analysis_width and analysis_width < frame_width:
+            self.input_scale = analysis_width / frame_width
+            self.analysis_size = (analysis_width, max(int(round(frame_height * self.input_scale)), 1))
+            self.blur_size = max(int(21 * self.input_scale) | 1, 3)
+        else:
+            self.input_scale, self.analysis_size, self.blur_size = 1.0, None, 21
+
     def _align_time(self, time_value, round_up=False):
         """对齐时间到整秒"""
         return math.ceil(time_value) if round_up else math.floor(time_value)
         
-    def process_frame(self, frame, frame_count, use_gpu=False):
+    def process_frame(self, frame, frame_count, use_gpu=False, draw_overlay=True):
         """
         处理单帧并检测动作
         Args:
             frame: 输入帧
             frame_count: 当前帧计数
             use_gpu: 是否使用GPU加速
+            draw_overlay: 是否在显示帧上绘制排除区域和运动框，无界面运行时可关闭
         Returns:
             tuple: (motion_detected, display_frame, segment)
             - motion_detected: 是否检测到动作
             - display_frame: 处理后的显示帧
             - segment: 如果有新的片段，返回片段信息，否则为None
         """
-        if self.fps is None:
-            raise RuntimeError("必须先调用set_fps设置视频帧率")
-            
-        # 更新当前时间
-        self.current_time = frame_count / self.fps
+        profiler = self.profiler
         
-        # 如果启用GPU加速，使用UMat
+        # 如果启用GPU加速，使用UMat(OpenCL异步执行，各阶段耗时只能作参考)
         if use_gpu:
             frame_gpu = cv2.UMat(frame)
             gray = cv2.cvtColor(frame_gpu, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
         else:
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        if self.analysis_size is not None:
+            gray = cv2.resize(gray, self.analysis_size, interpolation=cv2.INTER_AREA)
+        if profiler is not None:
+            profiler.lap('cvtColor')
+        gray = cv2.GaussianBlur(gray, (self.blur_size, self.blur_size), 0)
+        if profiler is not None:
+            profiler.lap('blur')
+        self.prepared = gray
+        return self.process_prepared(gray, frame, frame_count, use_gpu, draw_overlay)
+
+    def process_prepared(self, gray, frame, frame_count, use_gpu=False, draw_overlay=False):
+        """
+        处理已预处理(缩小、模糊)的灰度帧，用于从帧缓存回放，参数和返回值同 process_frame
+        Args:
+            gray: 预处理后的灰度帧
+            frame: 原始帧，回放时为None(不绘制显示帧、不记录缩略图)
+        """
+        if self.fps is None:
+            raise RuntimeError("必须先调用set_fps设置视频帧率")
+            
+        # 更新当前时间
+        self.current_time = frame_count / self.fps
+        profiler = self.profiler
+        if use_gpu and not isinstance(gray, cv2.UMat):
+            gray = cv2.UMat(gray)
         
         # 应用排除区域
-        gray = self.region_manager.apply_regions(gray)
+        gray = self.region_manager.apply_regions(gray, self.input_scale)
+        if profiler is not None:
+            profiler.lap('regions')
         
         if self.prev_frame is None:
             self.prev_frame = gray
@@ -78,34 +130,69 @@ class MotionDetector:
             
         # 计算差分
         frame_delta = cv2.absdiff(self.prev_frame, gray)
+        thresh = cv2.threshold(frame_delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
+        thresh = cv2.dilate(thresh, None, iterations=2)
+        if profiler is not None:
+            profiler.lap('diff')
         if use_gpu:
-            thresh = cv2.threshold(frame_delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
-            thresh = cv2.dilate(thresh, None, iterations=2)
             # 对于轮廓检测，需要下载到CPU
             thresh_cpu = thresh.get()
             contours, _ = cv2.findContours(thresh_cpu, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            display_frame = frame_gpu.get().copy() if isinstance(frame_gpu, cv2.UMat) else frame.copy()
         else:
-            thresh = cv2.threshold(frame_delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
-            thresh = cv2.dilate(thresh, None, iterations=2)
             contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            display_frame = frame.copy()
+        if profiler is not None:
+            profiler.lap('contours')
         
         # 处理显示帧
-        self.region_manager.draw_regions(display_frame)
+        draw_overlay = draw_overlay and frame is not None
+        if draw_overlay:
+            display_frame = frame.copy()
+            self.region_manager.draw_regions(display_frame)
+        else:
+            display_frame = frame
+        if profiler is not None:
+            profiler.lap('overlay')
         
         # 检测动作
         motion_detected = False
+        motion_area = 0
+        boxes = []
+        scale = self.input_scale
+        min_area = self.min_area * scale * scale
         for contour in contours:
-            if cv2.contourArea(contour) > self.min_area:
+            area = cv2.contourArea(contour)
+            if area > min_area:
                 motion_detected = True
+                motion_area += area / (scale * scale)
                 (x, y, w, h) = cv2.boundingRect(contour)
-                cv2.rectangle(display_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                if scale != 1.0:
+                    x, y, w, h = int(x / scale), int(y / scale), int(w / scale), int(h / scale)
+                boxes.append((x, y, w, h))
+                if draw_overlay:
+                    cv2.rectangle(display_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        if profiler is not None:
+            profiler.lap('filter')  # 面积过滤和运动框绘制
+        
+        self.last_boxes = boxes
         
         # 更新状态和处理片段
         segment = self._update_motion_state(motion_detected)
+        if self.is_motion or segment:
+            start = segment['start'] if segment else self.segment_start
+            self.segment_stats.observe(frame_count, self.current_time - start, motion_detected, motion_area, boxes)
+            if segment:
+                self.segment_stats.close(segment)
+        
+        # 复用已解码的帧记录片段缩略图
+        if self.thumbnails is not None and frame is not None:
+            if motion_detected and self.is_motion:
+                self.thumbnails.observe(frame, motion_area, boxes, frame_count)
+            if segment:
+                self.thumbnails.close_segment(segment)
         
         self.prev_frame = gray
+        if profiler is not None:
+            profiler.lap('state')
         return motion_detected, display_frame, segment
         
     def _update_motion_state(self, motion_detected):
@@ -147,6 +234,59 @@ class MotionDetector:
             }
         return None
 
+    def finish(self):
+        """视频结束时收尾，返回未完成的片段(如有)"""
+        segment = self.get_current_segment()
+        if segment:
+            self.segment_stats.close(segment)
+            if self.thumbnails is not None:
+                self.thumbnails.close_segment(segment)
+        return segment
+
+    def checkpoint_params(self):
+        """影响检测结果的参数，用于校验断点是否可用"""
+        params = {
+            'threshold': self.threshold,
+            'min_area': self.min_area,
+            'static_time_threshold': self.static_time_threshold,
+            'fps': self.fps,
+            'regions': self.region_manager.exclude_regions,
+        }
+        if self.analysis_size is not None:
+            params['analysis_width'] = self.analysis_size[0]
+        return params
+
+    def get_state(self):
+        """获取检测器状态，用于保存断点"""
+        prev_frame = self.prev_frame
+        if isinstance(prev_frame, cv2.UMat):
+            prev_frame = prev_frame.get()
+        return {
+            'prev_frame': prev_frame,
+            'is_motion': self.is_motion,
+            'static_frames': self.static_frames,
+            'segment_start': self.segment_start,
+            'current_time': self.current_time,
+            'last_segment_end': self.last_segment_end,
+            'segment_stats': self.segment_stats.get_state(),
+            'thumbnails': self.thumbnails.get_state() if self.thumbnails is not None else None,
+        }
+
+    def set_state(self, state, use_gpu=False):
+        """从断点恢复检测器状态"""
+        prev_frame = state['prev_frame']
+        if use_gpu and prev_frame is not None:
+            prev_frame = cv2.UMat(prev_frame)
+        self.prev_frame = prev_frame
+        self.is_motion = state['is_motion']
+        self.static_frames = state['static_frames']
+        self.segment_start = state['segment_start']
+        self.current_time = state['current_time']
+        self.last_segment_end = state['last_segment_end']
+        self.segment_stats.set_state(state.get('segment_stats'))
+        if self.thumbnails is not None and state.get('thumbnails'):
+            self.thumbnails.set_state(state['thumbnails'])
+
     def reset(self):
         """重置检测器状态"""
         self.prev_frame = None
@@ -154,4 +294,5 @@ class MotionDetector:
         self.static_frames = 0
         self.segment_start = None
         self.current_time = 0
-        self.last_segment_end = 0  # 重置最后一个片段的结束时间
\ No newline at end of file
+        self.last_segment_end = 0  # 重置最后一个片段的结束时间
+        self.segment_stats.reset()
\ No newline at end of file
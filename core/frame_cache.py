@@ -0,0 +1,198 @@
+"""低分辨率帧缓存模块
+
+为同一段视频反复调整检测参数时避免重复解码：开启帧缓存后，检测在缩小到固定宽度的模糊灰度帧上进行，
+第一次检测顺带把这些帧顺序写入缓存文件，并保存每帧的时间戳；之后以任意阈值、最小面积、排除区域
+或加速方式再次检测时，直接用 np.memmap 映射缓存文件逐帧读取，不再解码视频。
+缓存以视频内容指纹为键(文件变化后自动失效)，总大小超过上限时淘汰最久未使用的视频。
+
+每个视频三个文件: <指纹>.gray(原始帧数据)、<指纹>.ts.npy(时间戳，秒)、<指纹>.json(元数据)
+写入时先写临时文件 <文件名>.<进程号>.tmp 再原子替换，元数据最后写入，有元数据的缓存才会被回放；
+淘汰时同时清理没有元数据的残留文件和已退出进程留下的临时文件。
+"""
+import json
+import os
+import time
+import numpy as np
+import psutil
+from .result_cache import content_fingerprint
+
+DEFAULT_FRAME_CACHE_DIR = os.path.join('config', 'frame_cache')
+FRAME_CACHE_WIDTH = 640  # 缓存帧的宽度，开启帧缓存时检测也在该宽度上进行
+DEFAULT_MAX_MB = 4096
+ORPHAN_SECONDS = 600  # 没有元数据的缓存文件超过该时间未修改视为残留(写入中途崩溃)
+
+class FrameCache:
+    """低分辨率帧缓存目录"""
+    def __init__(self, directory=DEFAULT_FRAME_CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.directory = str(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.gray', base + '.ts.npy', base + '.json'
+
+    def open(self, video_path, analysis_width):
+        """打开视频的缓存帧，不存在、视频已变化或检测宽度不同时返回None"""
+        try:
+            key = content_fingerprint(video_path)
+            data_path, ts_path, meta_path = self._paths(key)
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['analysis_width'] != analysis_width:
+                return None
+            frames = np.memmap(data_path, dtype=np.uint8, mode='r',
+                               shape=(meta['frames'], meta['height'], meta['width']))
+            timestamps = np.load(ts_path)
+            os.utime(meta_path)  # 元数据文件的修改时间即最近使用时间
+        except (OSError, ValueError, KeyError):
+            return None
+        return CachedFrames(frames, timestamps, meta)
+
+    def writer(self, video_path, fps, source_size, analysis_width, size, estimated_frames):
+        """为视频创建缓存写入器，size 为缓存帧尺寸(宽, 高)，预计大小超过缓存上限时返回None"""
+        estimated = estimated_frames * size[0] * size[1]
+        if estimated > self.max_bytes:
+            return None
+        try:
+            key = content_fingerprint(video_path)
+        except OSError:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        self.evict(estimated)
+        meta = {'video_path': os.path.abspath(video_path), 'fps': fps, 'analysis_width': analysis_width,
+                'source_width': source_size[0], 'source_height': source_size[1],
+                'width': size[0], 'height': size[1]}
+        return FrameCacheWriter(self._paths(key), meta)
+
+    def _sweep(self):
+        """删除已退出进程留下的临时文件"""
+        for name in os.listdir(self.directory):
+            parts = name.rsplit('.', 2)
+            if len(parts) != 3 or parts[2] != 'tmp' or not parts[1].isdigit():
+                continue
+            if int(parts[1]) != os.getpid() and not psutil.pid_exists(int(parts[1])):
+                _remove(os.path.join(self.directory, name))
+
+    def entries(self):
+        """返回 [(最近使用时间, 占用字节数, 文件列表)]，按最近使用时间排序
+
+        没有元数据的残留文件也计入，最近使用时间记为0，超过 ORPHAN_SECONDS 才会列出(避免误删正在提交的缓存)
+        """
+        result = []
+        if not os.path.isdir(self.directory):
+            return result
+        keys = {name.split('.', 1)[0] for name in os.listdir(self.directory) if not name.endswith('.tmp')}
+        now = time.time()
+        for key in keys:
+            paths = self._paths(key)
+            try:
+                existing = [path for path in paths if os.path.exists(path)]
+                size = sum(os.path.getsize(path) for path in existing)
+                if os.path.exists(paths[2]):
+                    used = os.path.getmtime(paths[2])
+                elif existing and now - max(os.path.getmtime(path) for path in existing) > ORPHAN_SECONDS:
+                    used = 0.0
+                else:
+                    continue
+            except OSError:
+                continue
+            result.append((used, size, paths))
+        return sorted(result)
+
+    def evict(self, reserve=0):
+        """淘汰最久未使用的视频，直到总大小加上 reserve 不超过上限，返回淘汰的视频数
+
+        残留文件总是删除；文件被占用(如Windows下其他任务正在回放)无法删除时跳过该视频
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        self._sweep()
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries) + reserve
+        removed = 0
+        for used, size, paths in entries:
+            if total <= self.max_bytes and used:
+                break
+            if not all(_remove(path) for path in paths):
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+class FrameCacheWriter:
+    """顺序写入一个视频的缓存帧，完整写完后 commit 才生效"""
+    def __init__(self, paths, meta):
+        self.paths = paths
+        self.meta = meta
+        self.timestamps = []
+        self._temp_path = paths[0] + f'.{os.getpid()}.tmp'
+        self._file = open(self._temp_path, 'wb')
+
+    def append(self, gray, timestamp):
+        """写入一帧(检测器预处理后的灰度帧，尺寸与缓存一致)"""
+        if not isinstance(gray, np.ndarray):
+            gray = gray.get()  # UMat
+        self._file.write(np.ascontiguousarray(gray).data)
+        self.timestamps.append(timestamp)
+
+    def commit(self):
+        """写入完成，帧数据和时间戳就位后最后写元数据，返回是否成功"""
+        self._file.close()
+        data_path, ts_path, meta_path = self.paths
+        meta = dict(self.meta, frames=len(self.timestamps), created=time.time())
+        try:
+            os.replace(self._temp_path, data_path)
+            with open(ts_path + f'.{os.getpid()}.tmp', 'wb') as f:
+                np.save(f, np.asarray(self.timestamps, dtype=np.float64))
+            os.replace(ts_path + f'.{os.getpid()}.tmp', ts_path)
+            with open(meta_path + f'.{os.getpid()}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(meta_path + f'.{os.getpid()}.tmp', meta_path)
+        except OSError as e:
+            print(f"写入帧缓存失败: {str(e)}")
+            for path in self.paths:
+                _remove(path + f'.{os.getpid()}.tmp')
+            return False
+        return True
+
+    def abort(self):
+        """检测中止，丢弃写了一半的缓存"""
+        self._file.close()
+        _remove(self._temp_path)
+
+class CachedFrames:
+    """内存映射的缓存帧，读取接口与视频源一致，read() 返回 (None, 灰度帧)"""
+    def __init__(self, frames, timestamps, meta):
+        self.frames = frames
+        self.timestamps = timestamps  # 每帧的时间戳(秒)
+        self.fps = meta['fps']
+        self.total_frames = meta['frames']
+        self.width, self.height = meta['source_width'], meta['source_height']
+        self.position = 0
+
+    def read(self):
+        if self.position >= self.total_frames:
+            return None
+        gray = self.frames[self.position]
+        self.position += 1
+        return None, gray
+
+    def seek(self, index):
+        self.position = index
+
+    def timestamp(self):
+        """最近读取的一帧的时间戳(秒)"""
+        return float(self.timestamps[self.position - 1]) if self.position else 0.0
+
+    def release(self):
+        self.frames = None
+
+def _remove(path):
+    """删除文件，不存在视为成功，被占用等原因无法删除时返回False"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return False
+    return True
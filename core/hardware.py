@@ -2,29 +2,57 @@
 import cv2
 import platform
 import os
+import shutil
 from pathlib import Path
 from .hardware_detector import HardwareDetector
+from .capabilities import CapabilityCache
+from .thread_plan import decoder_params
+
+def find_ffmpeg():
+    """查找 FFmpeg 可执行文件，找不到时返回None"""
+    possible_paths = [
+        Path("bin/ffmpeg.exe"),  # 相对路径
+        Path(__file__).parent.parent / "bin/ffmpeg.exe",  # 相对于脚本的路径
+        Path("C:/ffmpeg/bin/ffmpeg.exe"),  # 常见安装路径
+    ]
+    
+    for path in possible_paths:
+        if path.exists():
+            return str(path)
+    # 最后查找系统PATH，便于在Linux服务器上运行
+    return shutil.which("ffmpeg")
+
+def probe_capabilities():
+    """探测GPU信息和FFmpeg路径(较慢，Windows下需要WMI查询)"""
+    return {'gpu_info': HardwareDetector().gpu_info, 'ffmpeg_path': find_ffmpeg()}
 
 class HardwareAccelerator:
-    def __init__(self):
-        self.detector = HardwareDetector()
+    def __init__(self, use_cache=True):
+        """
+        Args:
+            use_cache: 是否使用磁盘上缓存的硬件信息，命中时在后台重新探测
+        """
+        if use_cache:
+            self.capability_cache = CapabilityCache(probe_capabilities)
+            capabilities, self.from_cache = self.capability_cache.get(on_change=self._capabilities_changed)
+        else:
+            self.capability_cache = None
+            capabilities, self.from_cache = probe_capabilities(), False
+        self.detector = HardwareDetector(capabilities['gpu_info'])
         self.gpu_info = self.detector.gpu_info
         self.use_gpu = self.gpu_info['has_gpu']
-        self.ffmpeg_path = self._find_ffmpeg()
+        self.ffmpeg_path = self._find_ffmpeg(capabilities['ffmpeg_path'])
         self._initialize_gpu()
 
-    def _find_ffmpeg(self):
-        """查找 FFmpeg 可执行文件"""
-        possible_paths = [
-            Path("bin/ffmpeg.exe"),  # 相对路径
-            Path(__file__).parent.parent / "bin/ffmpeg.exe",  # 相对于脚本的路径
-            Path("C:/ffmpeg/bin/ffmpeg.exe"),  # 常见安装路径
-        ]
-        
-        for path in possible_paths:
-            if path.exists():
-                print(f"找到 FFmpeg: {path}")
-                return str(path)
+    def _capabilities_changed(self, capabilities):
+        """后台探测发现硬件或工具变化"""
+        print("检测到硬件或FFmpeg环境变化，已更新硬件信息缓存，重启程序后生效")
+
+    def _find_ffmpeg(self, path):
+        """记录 FFmpeg 查找结果"""
+        if path:
+            print(f"找到 FFmpeg: {path}")
+            return path
         
         print("警告: 未找到 FFmpeg，将使用 OpenCV 进行视频处理")
         return None
@@ -36,14 +64,10 @@ class HardwareAccelerator:
                 cv2.ocl.setUseOpenCL(True)
                 cv2.setUseOptimized(True)
                 
-                # Intel GPU优化
-                if self.gpu_info['intel_gpu']:
-                    # 设置Intel优化标志
-                    cv2.setNumThreads(self.detector.cpu_count)
-                    if self.gpu_info['intel_arc']:
-                        # Arc GPU特殊优化
-                        os.environ['OPENCV_OPENCL_DEVICE'] = 'GPU'
-                        os.environ['OPENCV_OPENCL_WAIT_KERNEL'] = '0'
+                # Arc GPU特殊优化(OpenCV线程数由 thread_plan 按同时检测的任务数分配)
+                if self.gpu_info['intel_arc']:
+                    os.environ['OPENCV_OPENCL_DEVICE'] = 'GPU'
+                    os.environ['OPENCV_OPENCL_WAIT_KERNEL'] = '0'
                 
                 print(f"GPU加速已启用: {'Intel Arc' if self.gpu_info['intel_arc'] else 'Intel' if self.gpu_info['intel_gpu'] else 'Generic'}")
                 return
@@ -71,7 +95,7 @@ class HardwareAccelerator:
                 return cap
                 
             # 对于其他情况，使用默认的视频捕获
-            return cv2.VideoCapture(video_path)
+            return cv2.VideoCapture(video_path, cv2.CAP_ANY, decoder_params())
         except Exception as e:
             print(f"硬件解码初始化失败: {str(e)}")
             return cv2.VideoCapture(video_path)
@@ -1,18 +1,18 @@
 """硬件资源检测模块"""
-import os
 import psutil
 import cv2
-import numpy as np
 import platform
-import subprocess
-import re
 
 class HardwareDetector:
-    def __init__(self):
+    def __init__(self, gpu_info=None):
+        """
+        Args:
+            gpu_info: 缓存的GPU信息，提供时不再重新探测
+        """
         self.cpu_count = psutil.cpu_count(logical=False)  # 物理CPU核心数
         self.total_cpu_count = psutil.cpu_count(logical=True)  # 总CPU线程数
         self.memory = psutil.virtual_memory()
-        self.gpu_info = self._detect_gpu()
+        self.gpu_info = gpu_info if gpu_info is not None else self._detect_gpu()
         
     def _detect_windows_gpu(self):
         """使用Windows特定方法检测GPU"""
@@ -0,0 +1,186 @@
+"""持久化检测任务队列模块
+
+基于SQLite的任务表(pending/leased/done/failed)，多个工作进程(同一台机器或共享文件系统的多台机器)
+从同一个队列领取任务。领取的任务带租约，工作进程定期续约；租约过期的任务自动回到待处理状态，
+失败的任务按指数退避重试；只有仍持有租约的工作进程能写入结果，租约过期后迟到的结果被忽略。
+多台机器共享数据库文件时不能使用WAL模式，这里保持SQLite默认的回滚日志。
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from .job_scheduler import PRIORITY_NORMAL
+
+LEASE_SECONDS = 120        # 租约时长(秒)
+MAX_ATTEMPTS = 3           # 最多尝试次数
+RETRY_BACKOFF = 30         # 首次重试等待时间(秒)，之后每次翻倍
+RETRY_BACKOFF_MAX = 3600   # 重试等待时间上限(秒)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key TEXT UNIQUE NOT NULL,
+    video_path TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, priority, cost);
+"""
+
+def default_worker_id(role='worker'):
+    """工作进程标识：角色@主机名:进程号"""
+    return f"{role}@{socket.gethostname()}:{os.getpid()}"
+
+def job_key(spec):
+    """任务去重键：视频绝对路径 + 影响检测结果的参数"""
+    params = {key: value for key, value in spec.items()
+              if key not in ('video_path', 'thumbnail_dir', 'checkpoint_dir', 'profile_dir',
+                             'frame_cache_dir', 'frame_cache_mb')}
+    text = os.path.abspath(spec['video_path']) + json.dumps(params, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _row_to_job(row):
+    job = dict(row)
+    job['spec'] = json.loads(job['spec'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+class JobQueue:
+    """持久化检测任务队列，每次操作使用独立连接，可在多线程和多进程中使用"""
+    def __init__(self, db_path, max_attempts=MAX_ATTEMPTS):
+        self.db_path = str(db_path)
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """写事务：BEGIN IMMEDIATE 保证领取任务时不会与其他进程冲突"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, spec, priority=PRIORITY_NORMAL, cost=0.0):
+        """加入任务，相同视频和参数的任务已存在时直接返回已有任务"""
+        key = job_key(spec)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_key, video_path, spec, priority, cost, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, os.path.abspath(spec['video_path']), json.dumps(spec), priority, cost, time.time()))
+            return _row_to_job(conn.execute("SELECT * FROM jobs WHERE job_key = ?", (key,)).fetchone())
+
+    def lease(self, worker_id, lease_seconds=LEASE_SECONDS, job_id=None):
+        """领取一个待处理任务，没有可领取的任务时返回None
+
+        Args:
+            worker_id: 工作进程标识
+            lease_seconds: 租约时长
+            job_id: 指定领取的任务(交互客户端使用，不受重试等待时间限制)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # 回收租约过期的任务(工作进程已退出或失去响应)
+            conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, error = '租约过期', updated = ? "
+                "WHERE state = 'leased' AND lease_expires < ?", (self.max_attempts, now, now))
+            if job_id is None:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE state = 'pending' AND not_before <= ? "
+                    "ORDER BY priority, cost DESC, id LIMIT 1", (now,)).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE state = 'pending' AND id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row['id']))
+            return _row_to_job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone())
+
+    def heartbeat(self, job_id, worker_id, lease_seconds=LEASE_SECONDS):
+        """续约，返回False表示租约已失效(已过期并被其他工作进程领取)"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """写入检测结果，租约已失效(已过期或被其他工作进程领取)时忽略，返回是否写入"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "updated = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (json.dumps(result), time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """记录失败，未超过最多尝试次数时按指数退避重新排队"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (job_id, worker_id)).fetchone()
+            if row is None:
+                return
+            attempts = row['attempts']
+            state = 'failed' if attempts >= self.max_attempts else 'pending'
+            delay = min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, not_before = ?, updated = ? "
+                "WHERE id = ?", (state, error, now + delay, now, job_id))
+
+    def release(self, job_id, worker_id):
+        """主动归还任务(停止检测)，不计入尝试次数"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = attempts - 1, lease_owner = NULL, "
+                "updated = ? WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+                (time.time(), job_id, worker_id))
+
+    def retry_failed(self, job_id=None):
+        """将失败的任务重新排队，返回任务数"""
+        sql = "UPDATE jobs SET state = 'pending', attempts = 0, not_before = 0, updated = ? WHERE state = 'failed'"
+        args = (time.time(),)
+        if job_id is not None:
+            sql, args = sql + " AND id = ?", args + (job_id,)
+        with self._transaction() as conn:
+            return conn.execute(sql, args).rowcount
+
+    def counts(self):
+        """各状态的任务数"""
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update({row['state']: row['n'] for row in rows})
+        return counts
@@ -0,0 +1,132 @@
+"""检测任务调度模块
+
+按优先级通道和预估工作量(时长×分辨率)排序待检测视频：同一通道内最长的视频最先开始，
+以缩短整批任务的总完成时间；交互添加的视频进入高优先级通道，可插队到批量任务之前。
+同时根据实测吞吐量估算整批任务的剩余时间。
+读取元数据较慢时(如GUI线程中一次加入大量视频)可先按文件大小粗略排队，之后用 refine 换成准确的工作量。
+"""
+import heapq
+import itertools
+import os
+import time
+import cv2
+
+PRIORITY_INTERACTIVE = 0  # 交互添加的视频
+PRIORITY_NORMAL = 1       # 普通批量任务
+PRIORITY_BACKFILL = 2     # 历史回溯等低优先级任务
+
+def estimate_cost(video_path):
+    """预估视频的检测工作量：时长(秒) × 像素数，只读取容器元数据，不解码"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        pixels = cap.get(cv2.CAP_PROP_FRAME_WIDTH) * cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        if fps > 0 and frames > 0 and pixels > 0:
+            return frames / fps * pixels
+    finally:
+        cap.release()
+    # 无法读取元数据时按文件大小估算
+    return float(os.path.getsize(video_path)) if os.path.exists(video_path) else 1.0
+
+def file_size_cost(video_path):
+    """按文件大小粗略估算工作量，不打开视频"""
+    try:
+        return float(os.path.getsize(video_path))
+    except OSError:
+        return 1.0
+
+class JobScheduler:
+    """检测任务调度器"""
+    def __init__(self, cost_function=estimate_cost):
+        self.cost_function = cost_function
+        self._heap = []
+        self._counter = itertools.count()
+        self._costs = {}      # 视频路径 -> 预估工作量
+        self._running = {}    # 正在检测的视频 -> 完成比例(0-1)
+        self._done_cost = 0.0
+        self._start_time = None
+        self._rough = {}  # 按文件大小粗略估算的视频 -> 文件大小
+        self._refined = [0.0, 0.0]  # 已准确估算视频的工作量合计和文件大小合计
+
+    def push(self, video_path, priority=PRIORITY_NORMAL, cost=None, rough=False):
+        """加入待检测队列
+
+        Args:
+            cost: 预估工作量，None表示用 cost_function 估算
+            rough: 为True时不读取元数据，先按文件大小估算，之后用 refine 替换
+        """
+        if rough:
+            size = file_size_cost(video_path)
+            self._rough[video_path] = size
+            cost = size * self._size_ratio()
+        elif cost is None:
+            cost = self.cost_function(video_path)
+        self._costs[video_path] = cost
+        heapq.heappush(self._heap, (priority, -cost, next(self._counter), video_path))
+
+    def _size_ratio(self):
+        """已准确估算的视频中工作量与文件大小之比，用于把文件大小换算成工作量"""
+        cost, size = self._refined
+        return cost / size if size > 0 else 1.0
+
+    def refine(self, video_path, cost):
+        """用准确的工作量替换粗略估算，其余粗略估算按新的比例重新换算"""
+        size = self._rough.pop(video_path, None)
+        if size is None:
+            return
+        self._refined[0] += cost
+        self._refined[1] += size
+        if video_path in self._costs:
+            self._costs[video_path] = cost
+        ratio = self._size_ratio()
+        for path, rough_size in self._rough.items():
+            if path in self._costs:
+                self._costs[path] = rough_size * ratio
+        self._heap = [(priority, -self._costs[path], order, path) for priority, _, order, path in self._heap]
+        heapq.heapify(self._heap)
+
+    def pop(self):
+        """取出下一个应开始检测的视频，队列为空时返回None"""
+        if not self._heap:
+            return None
+        video_path = heapq.heappop(self._heap)[-1]
+        self._running[video_path] = 0.0
+        if self._start_time is None:
+            self._start_time = time.monotonic()
+        return video_path
+
+    def update_progress(self, video_path, fraction):
+        """更新正在检测视频的完成比例"""
+        if video_path in self._running:
+            self._running[video_path] = min(max(fraction, 0.0), 1.0)
+
+    def mark_done(self, video_path):
+        """标记视频检测结束(完成或失败)"""
+        if self._running.pop(video_path, None) is not None:
+            self._done_cost += self._costs.get(video_path, 0.0)
+
+    def clear(self):
+        """清空调度器"""
+        self.__init__(self.cost_function)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def eta(self):
+        """估算整批任务的剩余时间(秒)，吞吐量尚无法测量时返回None"""
+        if self._start_time is None or not self._running:
+            return None
+        elapsed = time.monotonic() - self._start_time
+        processed = self._done_cost + sum(
+            self._costs[path] * fraction for path, fraction in self._running.items())
+        if elapsed <= 0 or processed <= 0:
+            return None
+        throughput = processed / elapsed  # 所有工作线程合计的吞吐量
+        per_worker = throughput / len(self._running)
+        running_left = [self._costs[path] * (1 - fraction) for path, fraction in self._running.items()]
+        queued_left = [-item[1] for item in self._heap]
+        remaining = sum(running_left) + sum(queued_left)
+        # 整批完成时间不会早于剩余最长的单个任务在单个工作线程上的耗时
+        longest = max(running_left + queued_left)
+        return max(remaining / throughput, longest / per_worker)
@@ -0,0 +1,159 @@
+"""检测服务模块
+
+为HTTP接口等外部调用方管理检测和切割任务：检测在多进程引擎中执行(并发数固定)，
+等待中的任务数有上限，队列已满时拒绝新任务(由调用方稍后重试)。
+每个任务维护状态、最新遥测数据和版本号，订阅方可以等待任务状态变化。
+"""
+import copy
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .detection_engine import DetectionEngine
+from .detection_job import build_job_spec
+
+PROGRESS_POLL_INTERVAL = 0.2  # 进度轮询间隔(秒)
+
+class ServiceBusy(Exception):
+    """等待中的任务已达上限"""
+
+class JobService:
+    """检测服务"""
+    def __init__(self, max_workers=2, max_pending=32, logger=print):
+        """
+        Args:
+            max_workers: 同时检测的视频数
+            max_pending: 最多等待中的任务数(不含正在检测的任务)
+            logger: 日志函数
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max_pending
+        self.logger = logger
+        self.engine = DetectionEngine(self.max_workers)
+        self.cutter = ThreadPoolExecutor(max_workers=1)  # 切割任务串行执行，ffmpeg并发由ToolRunner限制
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._changed = threading.Condition()
+        self._started = time.monotonic()
+        self._running = True
+        self._poller = threading.Thread(target=self._poll_progress, daemon=True)
+        self._poller.start()
+
+    def submit(self, video_path, params=None, output_dir=None):
+        """提交检测任务，队列已满时抛出 ServiceBusy，返回任务记录"""
+        params = params or {}
+        if not os.path.isfile(video_path):
+            raise FileNotFoundError(f"找不到文件: {video_path}")
+        with self._changed:
+            active = sum(1 for job in self.jobs.values() if job['state'] in ('queued', 'running'))
+            if active >= self.max_workers + self.max_pending:
+                raise ServiceBusy("等待中的任务已满，请稍后重试")
+            job_id = str(next(self._ids))
+            job = {
+                'id': job_id, 'video_path': os.path.abspath(video_path), 'params': params,
+                'output_dir': output_dir, 'state': 'queued', 'telemetry': None, 'segments': None,
+                'stats': None, 'outputs': [], 'error': None, 'version': 0,
+            }
+            self.jobs[job_id] = job
+        spec = build_job_spec(job['video_path'], params.get('threshold', 25), params.get('min_area', 1000),
+                              params.get('static_time_threshold', 1.0), params.get('regions'),
+                              use_gpu=bool(params.get('use_gpu', False)))
+        future = self.engine.submit(spec, job_id)
+        future.add_done_callback(lambda f: self._detection_done(job_id, f))
+        return self.snapshot(job_id)
+
+    def snapshot(self, job_id):
+        """任务记录的副本，任务不存在时返回None"""
+        with self._changed:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait_for_change(self, job_id, version, timeout=15.0):
+        """等待任务版本号超过version，返回最新记录(超时时返回当前记录)"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.jobs[job_id]['version'] > version, timeout)
+            return dict(self.jobs[job_id])
+
+    def _update(self, job_id, from_states=None, **fields):
+        """更新任务记录，指定 from_states 时只在任务处于这些状态时更新"""
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None or (from_states is not None and job['state'] not in from_states):
+                return
+            job.update(fields)
+            job['version'] += 1
+            self._changed.notify_all()
+
+    def _poll_progress(self):
+        """后台线程：把引擎上报的遥测数据更新到对应任务"""
+        while self._running:
+            latest = {}
+            for telemetry in self.engine.poll_progress():
+                latest[telemetry['job_id']] = telemetry  # 按任务ID区分同一视频的多个任务
+            for job_id, telemetry in latest.items():
+                # 检测已结束(done/failed/cutting)的任务不再回到 running
+                self._update(job_id, ('queued', 'running'), state='running', telemetry=telemetry)
+            time.sleep(PROGRESS_POLL_INTERVAL)
+
+    def _detection_done(self, job_id, future):
+        try:
+            result = future.result()
+        except Exception as e:
+            self._update(job_id, state='failed', error=str(e))
+            self.logger(f"任务 {job_id} 检测失败: {str(e)}")
+            return
+        job = self.snapshot(job_id)
+        cut = bool(job['output_dir'] and result['segments'])
+        self._update(job_id, state='cutting' if cut else 'done',
+                     segments=result['segments'], stats=result['stats'])
+        if cut:
+            self.cutter.submit(self._cut, job_id, result, job['output_dir'])
+
+    def _cut(self, job_id, result, output_dir):
+        """切割并合并片段"""
+        from .hardware import find_ffmpeg
+        from .splitter import VideoSplitter
+        splitter = VideoSplitter()
+        splitter.set_log_callback(self.logger)
+        try:
+            # 合并片段时会原地修改片段列表，传入副本，GET /jobs/<id>/segments 返回原始检测结果
+            outputs = splitter.split_video(result['video_path'], copy.deepcopy(result['segments']), output_dir,
+                                           find_ffmpeg())
+        except Exception as e:
+            self._update(job_id, state='failed', error=f"切割失败: {str(e)}")
+            return
+        self._update(job_id, state='done', outputs=outputs)
+
+    def stats(self):
+        """服务状态：各状态任务数和吞吐量"""
+        with self._changed:
+            jobs = list(self.jobs.values())
+        counts = {}
+        for job in jobs:
+            counts[job['state']] = counts.get(job['state'], 0) + 1
+        finished = [job['stats'] for job in jobs if job['stats']]
+        frames = sum(stats['frames'] for stats in finished)
+        uptime = time.monotonic() - self._started
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'jobs': counts,
+            'frames': frames,
+            'uptime': round(uptime, 1),
+            'throughput_fps': round(frames / uptime, 1) if uptime > 0 else 0.0,
+            'live_fps': round(sum(job['telemetry']['fps'] for job in jobs
+                                  if job['state'] == 'running' and job['telemetry']), 1),
+        }
+
+    def collect_metrics(self):
+        """运行指标收集函数(见 core.metrics)"""
+        with self._changed:
+            states = [job['state'] for job in self.jobs.values()]
+        return {'queue_depth': states.count('queued'), 'active_jobs': states.count('running')}
+
+    def shutdown(self):
+        """停止服务"""
+        self._running = False
+        self.engine.shutdown(cancel=True)
+        self.cutter.shutdown(wait=False, cancel_futures=True)
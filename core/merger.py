@@ -1,11 +1,20 @@
 """视频合并模块"""
 import os
-import subprocess
+import time
+from .tool_runner import get_tool_runner
+from .metrics import get_metrics
 
 class VideoMerger:
     def __init__(self):
         self.progress_callback = None
         self.log_callback = None
+        self.runner = get_tool_runner()
+        self._job = None  # 当前正在执行的ffmpeg任务
+
+    def cancel(self):
+        """取消正在进行的合并，会杀掉正在运行的ffmpeg进程"""
+        if self._job is not None:
+            self._job.cancel()
 
     def set_progress_callback(self, callback):
         """设置进度回调函数"""
@@ -49,7 +58,20 @@ class VideoMerger:
             if self.log_callback:
                 self.log_callback("开始合并视频...")
             
-            subprocess.run(cmd, check=True)
+            merge_start = time.monotonic()
+            self._job = self.runner.submit('ffmpeg', cmd)
+            try:
+                result = self._job.result()
+            except Exception:
+                get_metrics().inc('ffmpeg_failures_total', operation='merge')
+                raise
+            finally:
+                self._job = None
+            if not result.ok:
+                get_metrics().inc('ffmpeg_failures_total', operation='merge')
+                raise Exception(f"ffmpeg 返回错误码 {result.returncode}: {result.stderr.strip()[-500:]}")
+            
+            get_metrics().observe('merge_seconds', time.monotonic() - merge_start)
             
             # 删除临时文件
             os.remove(temp_list_path)
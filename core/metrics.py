@@ -0,0 +1,194 @@
+"""运行指标模块
+
+进程内共享的指标登记表，按Prometheus文本格式导出，可写入文件(node_exporter textfile方式)
+或由本地HTTP端点提供。检测帧数、各任务实时帧率、切割/合并耗时、FFmpeg失败次数、结果缓存命中
+由各代码路径直接记录；队列长度、进行中任务数等状态由收集函数在导出时读取。
+"""
+import os
+import tempfile
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import psutil
+
+PREFIX = 'videoscan_'
+WRITE_INTERVAL = 15.0  # 指标文件写入间隔(秒)
+
+METRICS = {  # 名称: (类型, 说明)
+    'frames_analyzed_total': ('counter', '已解码并检测的帧数'),
+    'job_fps': ('gauge', '正在检测的任务的实时帧率(每个任务占用一个工作线程/进程，标签为任务ID和视频完整路径)'),
+    'queue_depth': ('gauge', '等待检测的任务数'),
+    'active_jobs': ('gauge', '正在检测的任务数'),
+    'cut_seconds': ('summary', '切割检测到的片段的耗时(秒)'),
+    'merge_seconds': ('summary', '合并片段的耗时(秒)'),
+    'ffmpeg_failures_total': ('counter', 'FFmpeg执行失败次数'),
+    'cache_requests_total': ('counter', '检测结果缓存查询次数'),
+}
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    items = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                     for key, value in labels)
+    return '{' + items + '}'
+
+class MetricsRegistry:
+    """指标登记表，线程安全"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}      # (名称, 标签元组) -> 数值
+        self._job_frames = {}  # 任务ID -> 已计入的帧数
+        self._job_labels = {}  # 任务ID -> job_fps 的标签
+        self._collectors = []
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, seconds, **labels):
+        """记录一次耗时(summary类型，导出 _sum 和 _count)"""
+        self.inc(name + '_sum', seconds, **labels)
+        self.inc(name + '_count', 1, **labels)
+
+    def update_job(self, job_id, video_path, telemetry):
+        """根据检测遥测数据累计帧数并更新任务实时帧率
+
+        Args:
+            job_id: 任务ID，同一视频同时有多个任务或不同目录下有同名视频时也不会互相覆盖
+            video_path: 视频文件路径
+            telemetry: 遥测数据，至少包含 frames 和 fps
+        """
+        labels = (('job', str(job_id)), ('video', os.path.abspath(video_path)))
+        with self._lock:
+            delta = telemetry['frames'] - self._job_frames.get(job_id, 0)
+            self._job_frames[job_id] = telemetry['frames']
+            key = ('frames_analyzed_total', ())
+            self._values[key] = self._values.get(key, 0) + max(delta, 0)
+            self._job_labels[job_id] = labels
+            self._values[('job_fps', labels)] = telemetry['fps']
+
+    def finish_job(self, job_id, video_path, frames=None):
+        """任务结束：计入剩余帧数并移除实时帧率"""
+        if frames is not None:
+            self.update_job(job_id, video_path, {'frames': frames, 'fps': 0})
+        with self._lock:
+            self._job_frames.pop(job_id, None)
+            labels = self._job_labels.pop(job_id, None)
+            if labels is not None:
+                self._values.pop(('job_fps', labels), None)
+
+    def add_collector(self, collector):
+        """添加导出时调用的收集函数，返回 {指标名: 数值}；绑定方法以弱引用保存"""
+        ref = weakref.WeakMethod(collector) if hasattr(collector, '__self__') else (lambda: collector)
+        with self._lock:
+            self._collectors.append(ref)
+
+    def render(self):
+        """生成Prometheus文本格式"""
+        with self._lock:
+            self._collectors = [ref for ref in self._collectors if ref() is not None]
+            collectors = [ref() for ref in self._collectors]
+        gathered = {}
+        for collector in collectors:
+            if collector is not None:
+                try:
+                    gathered.update(collector())
+                except Exception as e:
+                    print(f"收集运行指标失败: {str(e)}")
+        with self._lock:
+            values = dict(self._values)
+        for name, value in gathered.items():
+            values[(name, ())] = value
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            suffixes = ('_sum', '_count') if kind == 'summary' else ('',)
+            series = sorted((key, value) for key, value in values.items()
+                            if key[0] in [name + suffix for suffix in suffixes])
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            for (series_name, labels), value in series:
+                lines.append(f"{PREFIX}{series_name}{_label_text(labels)} {value}")
+        lines.append("# HELP process_resident_memory_bytes 进程常驻内存(字节)")
+        lines.append("# TYPE process_resident_memory_bytes gauge")
+        lines.append(f"process_resident_memory_bytes {psutil.Process().memory_info().rss}")
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """写入指标文件(临时文件+重命名，读取方不会读到写了一半的文件)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_metrics():
+    """获取共享的指标登记表"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MetricsRegistry()
+        return _shared
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0].rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+        data = get_metrics().render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 抓取请求很频繁，不输出访问日志
+
+class MetricsExporter:
+    """后台导出指标：定期写入文件和/或提供 http://host:port/metrics"""
+    def __init__(self, path=None, port=0, host='127.0.0.1', interval=WRITE_INTERVAL):
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self.server = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self.path:
+            threading.Thread(target=self._write_loop, daemon=True).start()
+        if self.port:
+            self.server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _write(self):
+        try:
+            get_metrics().write_textfile(self.path)
+        except OSError as e:
+            print(f"写入运行指标文件失败: {str(e)}")
+
+    def _write_loop(self):
+        self._write()
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def stop(self):
+        """停止导出，指标文件在停止前最后写入一次"""
+        self._stop.set()
+        if self.path:
+            self._write()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
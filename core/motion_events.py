@@ -0,0 +1,211 @@
+"""动作事件流模块
+
+纯库接口：边解码边检测，惰性产生片段开始、片段结束和周期统计事件。
+只保留上一帧和当前片段状态，内存占用与视频长度无关；不依赖Qt、显示模块和配置文件。
+提供帧缓存(FrameCache)时在缩小的灰度帧上检测，已缓存的视频直接回放缓存帧而不解码。
+
+    for event in iter_motion_events('a.mp4', {'threshold': 25, 'min_area': 1000}):
+        if event['type'] == EVENT_SEGMENT_CLOSE:
+            print(event['start'], event['end'])
+"""
+import cv2
+from .detector import MotionDetector
+from .telemetry import JobTelemetry
+from .video_probe import probe_fps, probe_duration
+from .thread_plan import decoder_params
+
+DEFAULT_PARAMS = {
+    'threshold': 25,
+    'min_area': 1000,
+    'static_time_threshold': 1.0,
+    'regions': None,   # 排除区域列表，None表示使用默认排除区域
+    'use_gpu': False,
+    'analysis_width': 0,  # 检测前把帧缩小到该宽度，0表示原始分辨率(开启帧缓存时为缓存宽度)
+}
+STATS_INTERVAL = 1.0  # 统计事件的默认间隔(秒)
+
+EVENT_RESUMED = 'resumed'              # 从断点继续: frame, segments
+EVENT_SEGMENT_OPEN = 'segment_open'    # 片段开始: start, frame
+EVENT_SEGMENT_CLOSE = 'segment_close'  # 片段结束: start, end, score, stats(见 segment_stats)
+EVENT_STATS = 'stats'                  # 周期统计: JobTelemetry 数据，最后一个带 done=True
+
+def open_capture(video_path):
+    """打开视频并获取帧率和总帧数，优先使用ffprobe获取准确信息，解码线程数按本进程的线程分配"""
+    cap = cv2.VideoCapture(video_path, cv2.CAP_ANY, decoder_params())
+    if not cap.isOpened():
+        raise Exception("无法打开视频文件")
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    duration = probe_duration(video_path)
+    fps = probe_fps(video_path) or cap.get(cv2.CAP_PROP_FPS)
+    if duration is not None and fps:
+        total_frames = int(duration * fps)
+    return cap, fps, total_frames
+
+class _CaptureSource:
+    """解码视频的帧源，read() 返回 (原始帧, None)，与 CachedFrames 接口一致"""
+    def __init__(self, video_path):
+        self.cap, self.fps, self.total_frames = open_capture(video_path)
+        ret, self._first = self.cap.read()
+        if not ret:
+            self.cap.release()
+            raise Exception("无法读取视频帧")
+        self.height, self.width = self._first.shape[:2]
+
+    def read(self):
+        if self._first is not None:
+            frame, self._first = self._first, None
+            return frame, None
+        ret, frame = self.cap.read()
+        return (frame, None) if ret else None
+
+    def seek(self, index):
+        self._first = None
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+    def timestamp(self):
+        """最近读取的一帧的时间戳(秒)"""
+        return self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+    def release(self):
+        self.cap.release()
+
+class MotionEventStream:
+    """单个视频的动作事件流
+
+    迭代时逐帧检测并产生事件。两个事件之间检测器处于一致状态，
+    调用方可以在任意事件处停止迭代，或调用 save_checkpoint 保存断点。
+    """
+    def __init__(self, video_path, params=None, stats_interval=STATS_INTERVAL,
+                 thumbnails=None, checkpoints=None, profiler=None, frame_cache=None):
+        """
+        Args:
+            video_path: 视频文件路径
+            params: 检测参数，缺省项取 DEFAULT_PARAMS
+            stats_interval: 统计事件间隔(秒)
+            thumbnails: 片段缩略图收集器(ThumbnailCollector)，可选
+            checkpoints: 检测断点存储(CheckpointStore)，提供时从断点继续
+            profiler: 分阶段计时器(StageProfiler)，可选
+            frame_cache: 低分辨率帧缓存(FrameCache)，提供时从缓存回放或在检测时写入缓存，
+                检测宽度为 params['analysis_width']；缓存中只有灰度帧，需要缩略图时不回放，
+                照常解码视频(仍会写入缓存)
+        """
+        self.video_path = video_path
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        self.stats_interval = stats_interval
+        self.checkpoints = checkpoints
+        self.profiler = profiler
+        self.frame_cache = frame_cache
+        self.thumbnails = thumbnails
+        self.replayed = False  # 是否从帧缓存回放(未解码视频)
+        self.detector = MotionDetector(self.params['threshold'], self.params['min_area'],
+                                       self.params['static_time_threshold'])
+        if self.params['regions'] is not None:
+            self.detector.region_manager.default_exclude_regions = self.params['regions']
+        if thumbnails is not None:
+            self.detector.set_thumbnail_collector(thumbnails)
+        if profiler is not None:
+            self.detector.set_profiler(profiler)
+        self.fps = None
+        self.total_frames = 0
+        self.start_frame = 0   # 本次检测的起始帧号
+        self.frame_index = 0   # 下一个待检测的帧号
+        self.segment_count = 0
+
+    def save_checkpoint(self, segments):
+        """在当前位置保存断点，segments 为调用方已收到的完整片段列表"""
+        self.checkpoints.save(self.video_path, self.frame_index, segments,
+                              self.detector.get_state(), self.detector.checkpoint_params())
+
+    def _resume(self, source, use_gpu):
+        """读取断点并定位到断点帧，返回断点数据或None"""
+        checkpoint = self.checkpoints.load(self.video_path, self.detector.checkpoint_params())
+        if checkpoint:
+            self.start_frame = self.frame_index = checkpoint['frame_index']
+            self.segment_count = len(checkpoint['segments'])
+            self.detector.set_state(checkpoint['detector_state'], use_gpu)
+            source.seek(self.frame_index)
+        return checkpoint
+
+    def _open_source(self):
+        """有帧缓存且不需要缩略图(缓存中没有彩色帧)时回放缓存帧，否则解码视频"""
+        width = self.params['analysis_width']
+        replay = self.frame_cache and width and self.thumbnails is None
+        source = self.frame_cache.open(self.video_path, width) if replay else None
+        self.replayed = source is not None
+        return source or _CaptureSource(self.video_path)
+
+    def __iter__(self):
+        detector = self.detector
+        profiler = self.profiler
+        use_gpu = self.params['use_gpu']
+        if use_gpu:
+            cv2.ocl.setUseOpenCL(True)
+        source = self._open_source()
+        self.fps, self.total_frames = source.fps, source.total_frames
+        pending = []  # 遥测回调 -> 统计事件
+        writer = None
+        try:
+            detector.adjust_exclude_regions(source.width, source.height)
+            detector.set_analysis_width(source.width, source.height, self.params['analysis_width'])
+            detector.set_fps(self.fps)
+            checkpoint = self._resume(source, use_gpu) if self.checkpoints else None
+            if checkpoint:
+                yield {'type': EVENT_RESUMED, 'frame': self.frame_index, 'segments': checkpoint['segments']}
+            elif self.frame_cache and self.params['analysis_width'] and not self.replayed:
+                size = (source.width, source.height)
+                writer = self.frame_cache.writer(self.video_path, self.fps, size, self.params['analysis_width'],
+                                                 detector.analysis_size or size, self.total_frames)
+            item = source.read()
+            telemetry = JobTelemetry(self.video_path, self.total_frames, self.fps, pending.append,
+                                     1.0 / self.stats_interval, start_frame=self.start_frame)
+            while item is not None:
+                frame, gray = item
+                was_motion = detector.is_motion
+                if gray is None:
+                    _, _, segment = detector.process_frame(
+                        frame, self.frame_index, use_gpu=use_gpu, draw_overlay=False)
+                    if writer is not None:
+                        writer.append(detector.prepared, source.timestamp())
+                else:
+                    _, _, segment = detector.process_prepared(gray, None, self.frame_index, use_gpu=use_gpu)
+                self.frame_index += 1
+                if detector.is_motion and not was_motion:
+                    yield {'type': EVENT_SEGMENT_OPEN, 'start': detector.segment_start,
+                           'frame': self.frame_index - 1}
+                if segment:
+                    self.segment_count += 1
+                    yield dict(segment, type=EVENT_SEGMENT_CLOSE)
+                telemetry.update(self.frame_index, self.segment_count)
+                if pending:
+                    yield dict(pending.pop(), type=EVENT_STATS)
+                if profiler is not None:
+                    profiler.begin()
+                item = source.read()
+                if profiler is not None:
+                    profiler.lap('decode')
+            if writer is not None:
+                writer.commit()
+                writer = None
+        finally:
+            if writer is not None:
+                writer.abort()
+            source.release()
+
+        segment = detector.finish()
+        if segment:
+            self.segment_count += 1
+            yield dict(segment, type=EVENT_SEGMENT_CLOSE)
+        yield dict(telemetry.snapshot(self.frame_index, self.segment_count), type=EVENT_STATS, done=True)
+
+def iter_motion_events(video_path, params=None, stats_interval=STATS_INTERVAL, frame_cache=None):
+    """逐个产生视频中的动作事件
+
+    Args:
+        video_path: 视频文件路径
+        params: 检测参数字典(threshold, min_area, static_time_threshold, regions, use_gpu)
+        stats_interval: 统计事件间隔(秒)
+        frame_cache: 低分辨率帧缓存(FrameCache)，可选
+    Yields:
+        dict: 带 'type' 字段的事件，见 EVENT_* 常量
+    """
+    yield from MotionEventStream(video_path, params, stats_interval, frame_cache=frame_cache)
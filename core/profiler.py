@@ -0,0 +1,110 @@
+"""检测热路径分阶段计时模块
+
+逐帧记录解码、灰度转换、模糊、排除区域、差分阈值膨胀、轮廓、绘制和预览显示等阶段的耗时，
+累计到对数分桶直方图中(每个阶段固定大小，与视频长度无关)，按视频汇总 p50/p95/最大值。
+默认关闭：检测代码只在 profiler 不为None时计时，关闭时每个阶段只多一次判断。
+
+    profiler = StageProfiler('a.mp4')
+    profiler.begin()
+    ret, frame = cap.read()
+    profiler.lap('decode')   # 记录从上一次 begin/lap 到现在的耗时
+"""
+import json
+import math
+import os
+import time
+
+BUCKETS_PER_DECADE = 20  # 每10倍区间的分桶数，分位数误差约12%
+MIN_SECONDS = 1e-6       # 最小分桶下限(1微秒)
+NUM_BUCKETS = BUCKETS_PER_DECADE * 8  # 覆盖1微秒到100秒
+DEFAULT_PROFILE_DIR = os.path.join('config', 'profiles')  # 界面程序的报告目录
+
+def _bucket(seconds):
+    if seconds <= MIN_SECONDS:
+        return 0
+    return min(int(math.log10(seconds / MIN_SECONDS) * BUCKETS_PER_DECADE) + 1, NUM_BUCKETS - 1)
+
+def _bucket_upper(index):
+    """分桶上限(秒)"""
+    return MIN_SECONDS * 10 ** (index / BUCKETS_PER_DECADE)
+
+class _Stage:
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        target = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+class StageProfiler:
+    """单个视频的分阶段计时器"""
+    def __init__(self, video_path):
+        self.video_path = video_path
+        self.stages = {}  # 阶段名 -> _Stage，保持首次出现的顺序
+        self._last = time.perf_counter()
+
+    def begin(self):
+        """开始计时，下一次 lap 记录从此刻开始的耗时"""
+        self._last = time.perf_counter()
+
+    def lap(self, name):
+        """记录从上一次 begin/lap 到现在的耗时，计入指定阶段"""
+        now = time.perf_counter()
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _Stage()
+        stage.add(now - self._last)
+        self._last = now
+
+    def summary(self):
+        """各阶段统计(毫秒)，share 为占全部阶段总耗时的比例"""
+        total = sum(stage.total for stage in self.stages.values()) or 1.0
+        return {name: {
+            'count': stage.count,
+            'total_ms': round(stage.total * 1000, 1),
+            'mean_ms': round(stage.total / stage.count * 1000, 3),
+            'p50_ms': round(stage.percentile(0.50) * 1000, 3),
+            'p95_ms': round(stage.percentile(0.95) * 1000, 3),
+            'max_ms': round(stage.max * 1000, 3),
+            'share': round(stage.total / total, 3),
+        } for name, stage in self.stages.items()}
+
+    def report(self):
+        """完整报告字典，可JSON序列化"""
+        return {'video_path': self.video_path, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'stages': self.summary()}
+
+    def save(self, directory):
+        """将报告保存为JSON文件，返回文件路径"""
+        os.makedirs(directory, exist_ok=True)
+        base_name = os.path.splitext(os.path.basename(self.video_path))[0]
+        path = os.path.join(directory, f"{base_name}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+def format_summary(video_path, summary):
+    """生成用于日志的多行汇总文本"""
+    lines = [f"{os.path.basename(video_path)} 分阶段耗时(毫秒):",
+             f"  {'阶段':<12}{'次数':>8}{'p50':>9}{'p95':>9}{'最大':>9}{'占比':>8}"]
+    for name, stats in summary.items():
+        lines.append(f"  {name:<12}{stats['count']:>8}{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}"
+                     f"{stats['max_ms']:>9.2f}{stats['share']:>8.1%}")
+    return '\n'.join(lines)
@@ -0,0 +1,90 @@
+"""持久化队列工作进程模块
+
+从 JobQueue 领取任务交给多进程检测引擎执行，定期为持有的任务续约，
+检测完成后写入结果。进程退出或失去响应时租约过期，任务由其他工作进程重新领取。
+"""
+import os
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+from .detection_engine import DetectionEngine
+from .job_queue import JobQueue, LEASE_SECONDS, default_worker_id
+
+HEARTBEAT_INTERVAL = LEASE_SECONDS / 4  # 续约间隔(秒)
+POLL_INTERVAL = 5.0  # 队列为空时的轮询间隔(秒)
+
+class QueueWorker:
+    """队列工作进程，同时执行 max_workers 个检测任务"""
+    def __init__(self, db_path, max_workers=2, worker_id=None, logger=print):
+        self.queue = JobQueue(db_path)
+        self.max_workers = max(1, int(max_workers))
+        self.worker_id = worker_id or default_worker_id()
+        self.logger = logger
+        self.completed = 0
+        self.failed = 0
+        self.running = {}  # Future -> 正在执行的任务
+
+    def _lease_jobs(self, engine, running):
+        """领取任务直到占满所有工作进程"""
+        while len(running) < self.max_workers:
+            job = self.queue.lease(self.worker_id)
+            if job is None:
+                return
+            running[engine.submit(job['spec'])] = job
+            self.logger(f"开始检测: {os.path.basename(job['video_path'])} (第 {job['attempts']} 次尝试)")
+
+    def _finish(self, future, job):
+        """写入已结束任务的结果"""
+        name = os.path.basename(job['video_path'])
+        try:
+            result = future.result()
+        except Exception as e:
+            self.failed += 1
+            self.queue.fail(job['id'], self.worker_id, str(e))
+            self.logger(f"检测失败: {name}: {str(e)}")
+            return
+        self.completed += 1
+        # 缩略图数据较大，不写入队列数据库
+        written = self.queue.complete(job['id'], self.worker_id,
+                                      {'segments': result['segments'], 'stats': result['stats']})
+        self.logger(f"检测完成: {name}，{len(result['segments'])} 个片段"
+                    + ("" if written else "(租约已失效，结果未写入)"))
+
+    def _heartbeat(self, running):
+        for job in running.values():
+            if not self.queue.heartbeat(job['id'], self.worker_id):
+                self.logger(f"租约已失效: {os.path.basename(job['video_path'])}")
+
+    def collect_metrics(self):
+        """运行指标收集函数(见 core.metrics)"""
+        return {'queue_depth': self.queue.counts()['pending'], 'active_jobs': len(self.running)}
+
+    def run(self, exit_when_idle=False, should_stop=None):
+        """处理队列中的任务
+
+        Args:
+            exit_when_idle: 队列中没有可领取的任务时退出，否则持续轮询
+            should_stop: 返回True时停止领取新任务并归还正在执行的任务
+        """
+        engine = DetectionEngine(self.max_workers)
+        running = self.running = {}
+        next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+        try:
+            while not (should_stop and should_stop()):
+                self._lease_jobs(engine, running)
+                if not running:
+                    if exit_when_idle:
+                        break
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                done, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(future, running.pop(future))
+                engine.poll_progress()  # 取出进度数据(同时更新运行指标)
+                if time.monotonic() >= next_heartbeat:
+                    self._heartbeat(running)
+                    next_heartbeat = time.monotonic() + HEARTBEAT_INTERVAL
+        finally:
+            engine.shutdown(cancel=bool(running))
+            for job in running.values():
+                self.queue.release(job['id'], self.worker_id)
+        return self.failed == 0
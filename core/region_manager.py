@@ -24,8 +24,8 @@ class RegionManager:
                 'height': region['h']
             })
 
-    def apply_regions(self, frame):
-        """在帧上应用排除区域"""
+    def apply_regions(self, frame, scale=1.0):
+        """在帧上应用排除区域，scale 为帧相对原始分辨率的缩放比例"""
         # 获取帧的尺寸，处理 UMat 对象
         if isinstance(frame, cv2.UMat):
             frame_height, frame_width = frame.get().shape[:2]
@@ -40,8 +40,8 @@ class RegionManager:
 
         # 在掩码上绘制排除区域
         for region in self.exclude_regions:
-            x, y = region['x'], region['y']
-            w, h = region['width'], region['height']
+            x, y = int(region['x'] * scale), int(region['y'] * scale)
+            w, h = int(region['width'] * scale), int(region['height'] * scale)
             # 确保坐标不超出图像边界
             if y + h > frame_height or x + w > frame_width:
                 continue
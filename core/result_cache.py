@@ -0,0 +1,136 @@
+"""检测结果缓存模块
+
+以视频内容指纹(文件大小、修改时间、首尾数据块哈希)和检测参数哈希为键，在SQLite中保存检测结果。
+文件和检测设置都未变化时直接返回片段列表，无需重新解码。超过条目上限时淘汰最久未使用的结果。
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from .metrics import get_metrics
+
+DEFAULT_CACHE_PATH = os.path.join('config', 'results.db')
+MAX_ENTRIES = 10000    # 缓存条目上限
+BLOCK_SIZE = 64 * 1024  # 计算指纹时读取的首尾数据块大小
+CACHE_PARAMS = ('threshold', 'min_area', 'static_time_threshold', 'regions')  # 影响检测结果的参数
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    video_path TEXT NOT NULL,
+    segments TEXT NOT NULL,
+    stats TEXT,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (fingerprint, params_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_results_path ON results(video_path);
+CREATE INDEX IF NOT EXISTS idx_results_used ON results(last_used);
+"""
+
+def content_fingerprint(video_path):
+    """视频内容指纹：大小 + 修改时间 + 首尾数据块哈希，只读取128KB"""
+    stat = os.stat(video_path)
+    digest = hashlib.sha1(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(BLOCK_SIZE))
+        if stat.st_size > BLOCK_SIZE:
+            f.seek(max(stat.st_size - BLOCK_SIZE, BLOCK_SIZE))
+            digest.update(f.read(BLOCK_SIZE))
+    return digest.hexdigest()
+
+def params_hash(params):
+    """检测参数哈希，只包含影响检测结果的参数"""
+    relevant = {key: params.get(key) for key in CACHE_PARAMS}
+    if params.get('analysis_width'):  # 缩小检测(帧缓存)的结果与原始分辨率的结果分开缓存
+        relevant['analysis_width'] = params['analysis_width']
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """检测结果缓存"""
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return _closing(conn)
+
+    def get(self, video_path, params):
+        """查询缓存的检测结果
+
+        Returns:
+            dict: {'segments', 'stats'}，未命中时返回None
+        """
+        try:
+            key = (content_fingerprint(video_path), params_hash(params))
+        except OSError:
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT segments, stats FROM results WHERE fingerprint = ? AND params_hash = ?",
+                               key).fetchone()
+            if row is None:
+                get_metrics().inc('cache_requests_total', result='miss')
+                return None
+            conn.execute("UPDATE results SET last_used = ? WHERE fingerprint = ? AND params_hash = ?",
+                         (time.time(),) + key)
+        get_metrics().inc('cache_requests_total', result='hit')
+        return {'segments': json.loads(row['segments']),
+                'stats': json.loads(row['stats']) if row['stats'] else None}
+
+    def put(self, video_path, params, segments, stats=None):
+        """保存检测结果，超过条目上限时淘汰最久未使用的结果"""
+        try:
+            key = (content_fingerprint(video_path), params_hash(params))
+        except OSError:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         key + (os.path.abspath(video_path), json.dumps(segments),
+                                json.dumps(stats) if stats else None, now, now))
+            conn.execute("DELETE FROM results WHERE rowid IN (SELECT rowid FROM results "
+                         "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def invalidate(self, video_paths=None):
+        """删除指定视频的缓存结果，不指定时清空缓存，返回删除的条目数"""
+        with self._connect() as conn:
+            if video_paths is None:
+                return conn.execute("DELETE FROM results").rowcount
+            return sum(conn.execute("DELETE FROM results WHERE video_path = ?",
+                                    (os.path.abspath(path),)).rowcount for path in video_paths)
+
+    def latest_results(self):
+        """每个视频最近一次使用的检测结果，返回 [(视频路径, 片段列表)]"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT video_path, segments, MAX(last_used) FROM results "
+                                "GROUP BY video_path ORDER BY video_path").fetchall()
+        return [(row['video_path'], json.loads(row['segments'])) for row in rows]
+
+    def count(self):
+        """缓存条目数"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+class _closing:
+    """提交事务并关闭连接的上下文管理器(sqlite3连接自身的with只提交不关闭)"""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        finally:
+            self.conn.close()
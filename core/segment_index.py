@@ -0,0 +1,182 @@
+"""片段时间索引模块
+
+在SQLite中持久保存所有已检测视频的动作片段(摄像头、绝对开始/结束时间、动作分数)，
+用R*Tree按时间建立区间索引，时间点和时间范围查询都是O(log n)，检测完成后逐个视频增量写入。
+R*Tree使用32位浮点坐标(SQLite会把区间向外取整，只会多选不会漏选)，精确时间保存在 segments 表中。
+录像开始时间和摄像头从文件名解析(如 10_20250305021813_20250305024238.mp4 表示10号摄像头
+2025-03-05 02:18:13 开始的录像)，无法解析时以所在目录名作为摄像头、文件修改时间作为开始时间(近似)。
+"""
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_INDEX_PATH = os.path.join('config', 'segments.db')
+NAME_PATTERN = re.compile(r'^(?P<camera>[^_]+)_(?P<start>\d{14})_(?P<end>\d{14})$')
+TIME_FORMAT = '%Y%m%d%H%M%S'
+
+# R*Tree只用于快速筛选，不能用 rtree_i32(32位整数秒在2038年后溢出)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    video_path TEXT NOT NULL,
+    camera TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_segments_path ON segments(video_path);
+CREATE VIRTUAL TABLE IF NOT EXISTS segment_tree USING rtree(id, start, end);
+"""
+
+def parse_recording_name(video_path):
+    """从录像文件名解析摄像头和录像开始时间
+
+    Returns:
+        tuple: (摄像头, 开始时间戳)，无法解析开始时间时为 (所在目录名, None)
+    """
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    match = NAME_PATTERN.match(stem)
+    if match:
+        try:
+            return match.group('camera'), datetime.strptime(match.group('start'), TIME_FORMAT).timestamp()
+        except ValueError:
+            pass
+    return os.path.basename(os.path.dirname(os.path.abspath(video_path))), None
+
+def parse_time(text):
+    """解析命令行中的时间：20250305010000、2025-03-05 01:00[:00] 或时间戳"""
+    text = text.strip()
+    if re.fullmatch(r'\d{14}', text):
+        return datetime.strptime(text, TIME_FORMAT).timestamp()
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text.replace('T', ' ')).timestamp()
+
+class SegmentIndex:
+    """片段时间索引"""
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = str(db_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'segment_tree'").fetchone()
+            if row is not None and 'rtree_i32' in row['sql']:
+                # 旧版本的整数索引，按 segments 表重建
+                conn.execute("DROP TABLE segment_tree")
+                conn.executescript(_SCHEMA)
+                conn.execute("INSERT INTO segment_tree SELECT id, start, end FROM segments")
+            else:
+                conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """提交事务并关闭连接(sqlite3连接自身的with只提交不关闭)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def add_video(self, video_path, segments):
+        """写入一个视频的全部片段(片段时间为相对视频开头的秒数)，替换该视频已有的片段
+
+        Returns:
+            int: 写入的片段数，无法确定录像开始时间且文件不存在时为0
+        """
+        camera, base = parse_recording_name(video_path)
+        if base is None:
+            try:
+                base = os.path.getmtime(video_path)
+            except OSError:
+                return 0
+        video_path = os.path.abspath(video_path)
+        with self._connect() as conn:
+            self._delete(conn, video_path)
+            for seg in segments:
+                start, end = base + seg['start'], base + seg['end']
+                cursor = conn.execute("INSERT INTO segments (video_path, camera, start, end, score) "
+                                      "VALUES (?, ?, ?, ?, ?)", (video_path, camera, start, end, seg.get('score')))
+                conn.execute("INSERT INTO segment_tree VALUES (?, ?, ?)", (cursor.lastrowid, start, end))
+        return len(segments)
+
+    def _delete(self, conn, video_path):
+        conn.execute("DELETE FROM segment_tree WHERE id IN (SELECT id FROM segments WHERE video_path = ?)",
+                     (video_path,))
+        return conn.execute("DELETE FROM segments WHERE video_path = ?", (video_path,)).rowcount
+
+    def remove(self, video_paths=None):
+        """删除指定视频的片段，不指定时清空索引，返回删除的片段数"""
+        with self._connect() as conn:
+            if video_paths is None:
+                conn.execute("DELETE FROM segment_tree")
+                return conn.execute("DELETE FROM segments").rowcount
+            return sum(self._delete(conn, os.path.abspath(path)) for path in video_paths)
+
+    def query(self, start, end=None, cameras=None, min_score=None):
+        """查询与时间范围重叠的片段，只指定 start 时查询包含该时间点的片段，可只查询动作分数不低于 min_score 的片段
+
+        Returns:
+            list: [{'video_path', 'camera', 'start', 'end', 'score'}]，按开始时间排序，时间为时间戳
+        """
+        end = start if end is None else end
+        sql = ("SELECT s.video_path, s.camera, s.start, s.end, s.score FROM segment_tree t "
+               "JOIN segments s ON s.id = t.id WHERE t.start <= ? AND t.end >= ? AND s.start <= ? AND s.end >= ?")
+        args = [end, start, end, start]
+        if cameras:
+            sql += " AND s.camera IN ({})".format(','.join('?' * len(cameras)))
+            args += list(cameras)
+        if min_score is not None:
+            sql += " AND s.score >= ?"
+            args.append(min_score)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY s.start", args).fetchall()
+        return [dict(row) for row in rows]
+
+    def coverage(self, start, end, cameras=None, min_cameras=1, min_score=None):
+        """时间范围内至少 min_cameras 个摄像头同时有动作的时间段
+
+        min_cameras=1 为所有摄像头动作时间的并集，等于摄像头数时为交集。
+
+        Returns:
+            list: [{'start', 'end', 'cameras'}]，时间段已裁剪到查询范围内
+        """
+        edges = []
+        for seg in self.query(start, end, cameras, min_score):
+            edges.append((max(seg['start'], start), 1, seg['camera']))
+            edges.append((min(seg['end'], end), -1, seg['camera']))
+        edges.sort(key=lambda edge: (edge[0], -edge[1]))  # 同一时刻先开始后结束，相接的片段连在一起
+        active, result, opened = {}, [], None
+        for time, step, camera in edges:
+            active[camera] = active.get(camera, 0) + step
+            if not active[camera]:
+                del active[camera]
+            if len(active) >= min_cameras:
+                if opened is None:
+                    opened = {'start': time, 'end': time, 'cameras': set()}
+                opened['cameras'].update(active)
+            elif opened is not None:
+                opened['end'] = time
+                if result and result[-1]['end'] >= opened['start']:
+                    result[-1]['end'] = time
+                    result[-1]['cameras'].update(opened['cameras'])
+                else:
+                    result.append(opened)
+                opened = None
+        for item in result:
+            item['cameras'] = sorted(item['cameras'])
+        return result
+
+    def stats(self):
+        """返回 (片段数, 视频数, 摄像头列表)"""
+        with self._connect() as conn:
+            segments, videos = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT video_path) FROM segments").fetchone()
+            cameras = [row[0] for row in conn.execute("SELECT DISTINCT camera FROM segments ORDER BY camera")]
+        return segments, videos, cameras
@@ -65,6 +65,7 @@ class SegmentManager:
                 'index': i + 1,
                 'start': self.format_time(segment['start']),
                 'end': self.format_time(segment['end']),
-                'duration': self.format_time(duration)
+                'duration': self.format_time(duration),
+                'score': segment.get('score')  # 动作分数，没有片段统计时为None
             })
         return info, self.format_time(total_duration)
\ No newline at end of file
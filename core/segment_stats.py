@@ -0,0 +1,93 @@
+"""片段统计模块
+
+在检测过程中复用每帧已有的轮廓结果累计当前片段的统计信息，不需要额外解码：
+峰值/平均运动面积、峰值帧号、运动框外包矩形、有动作帧的比例和逐秒动作强度。
+片段结束时统计信息附加到片段上，可用于排序和在切割前过滤价值较低的片段。
+
+    {'start': 5, 'end': 9, 'score': 1.82,
+     'stats': {'frames': 100, 'active_fraction': 0.8, 'peak_area': 5400, 'mean_area': 3100,
+               'peak_frame': 160, 'bbox': [120, 40, 200, 150], 'activity': '7996'}}
+
+activity 每个字符对应片段中的一秒，0-9 表示该秒内有动作帧的比例。
+score 为片段内平均运动面积占画面的百分比(有动作帧的平均面积 × 有动作帧比例)。
+"""
+import math
+
+class SegmentStatsCollector:
+    """当前片段的统计累计器，状态可保存到断点"""
+    def __init__(self):
+        self.frame_area = 0  # 画面面积，用于计算分数
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.active_frames = 0
+        self.area_sum = 0.0
+        self.peak_area = 0.0
+        self.peak_frame = None
+        self.bbox = None  # [x0, y0, x1, y1]
+        self.seconds = []  # 每秒 [有动作帧数, 总帧数]
+
+    def observe(self, frame_index, offset, motion_detected, motion_area, boxes):
+        """记录片段中的一帧，offset 为该帧相对片段开始的秒数"""
+        second = max(int(offset), 0)
+        while len(self.seconds) <= second:
+            self.seconds.append([0, 0])
+        self.seconds[second][1] += 1
+        self.frames += 1
+        if not motion_detected:
+            return
+        self.seconds[second][0] += 1
+        self.active_frames += 1
+        self.area_sum += motion_area
+        if motion_area > self.peak_area:
+            self.peak_area = motion_area
+            self.peak_frame = frame_index
+        for x, y, w, h in boxes:
+            if self.bbox is None:
+                self.bbox = [x, y, x + w, y + h]
+            else:
+                self.bbox = [min(self.bbox[0], x), min(self.bbox[1], y),
+                             max(self.bbox[2], x + w), max(self.bbox[3], y + h)]
+
+    def close(self, segment):
+        """片段结束：把统计信息附加到片段上并重置"""
+        active_fraction = self.active_frames / self.frames if self.frames else 0.0
+        mean_area = self.area_sum / self.active_frames if self.active_frames else 0.0
+        length = max(math.ceil(segment['end'] - segment['start']), len(self.seconds), 1)
+        activity = ''.join(str(round(9 * active / total)) if total else '0'
+                           for active, total in self.seconds + [[0, 0]] * (length - len(self.seconds)))
+        bbox = self.bbox
+        segment['score'] = round(100 * mean_area / self.frame_area * active_fraction, 3) if self.frame_area else 0.0
+        segment['stats'] = {
+            'frames': self.frames,
+            'active_fraction': round(active_fraction, 3),
+            'peak_area': int(self.peak_area),
+            'mean_area': int(mean_area),
+            'peak_frame': self.peak_frame,
+            'bbox': [bbox[0], bbox[1], bbox[2] - bbox[0], bbox[3] - bbox[1]] if bbox else None,
+            'activity': activity,
+        }
+        self.reset()
+        return segment
+
+    def get_state(self):
+        return {key: getattr(self, key) for key in
+                ('frames', 'active_frames', 'area_sum', 'peak_area', 'peak_frame', 'bbox', 'seconds')}
+
+    def set_state(self, state):
+        self.reset()
+        for key, value in (state or {}).items():
+            setattr(self, key, value)
+
+def filter_segments(segments, min_peak_area=0, min_score=0.0, min_active_fraction=0.0):
+    """按统计信息过滤片段，返回 (保留的片段, 过滤掉的片段)；没有统计信息的片段(旧结果)全部保留"""
+    kept, dropped = [], []
+    for seg in segments:
+        stats = seg.get('stats')
+        if stats is None or (stats['peak_area'] >= min_peak_area and seg.get('score', 0) >= min_score
+                             and stats['active_fraction'] >= min_active_fraction):
+            kept.append(seg)
+        else:
+            dropped.append(seg)
+    return kept, dropped
@@ -1,11 +1,14 @@
 """视频分割模块"""
 import os
+import time
 import cv2
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from .segment_manager import SegmentManager
+from .segment_stats import filter_segments
 from .merger import VideoMerger
+from .tool_runner import get_tool_runner
+from .metrics import get_metrics
 
 class VideoSplitter:
     def __init__(self):
@@ -13,6 +16,10 @@ class VideoSplitter:
         self.segment_manager = SegmentManager()
         self.merger = VideoMerger()
         self.log_callback = None
+        self.runner = get_tool_runner()
+        self._job = None  # 当前正在执行的ffmpeg任务
+        self._cancelled = False
+        self.segment_filter = {}  # 切割前按片段统计过滤的条件，见 filter_segments
 
     def set_progress_callback(self, callback):
         """设置进度回调函数"""
@@ -25,6 +32,32 @@ class VideoSplitter:
         self.segment_manager.set_logger(callback)
         self.merger.set_log_callback(callback)
 
+    def set_segment_filter(self, criteria):
+        """设置切割前的片段过滤条件 {'min_peak_area', 'min_score', 'min_active_fraction'}"""
+        self.segment_filter = dict(criteria or {})
+
+    def cancel(self):
+        """取消正在进行的切割，会杀掉正在运行的ffmpeg进程"""
+        self._cancelled = True
+        if self._job is not None:
+            self._job.cancel()
+        self.merger.cancel()
+
+    def _run_ffmpeg(self, cmd, progress_callback=None):
+        """通过共享调度器执行ffmpeg，可被cancel()中断"""
+        self._job = self.runner.submit('ffmpeg', cmd, progress_callback=progress_callback)
+        try:
+            result = self._job.result()
+        except Exception:
+            get_metrics().inc('ffmpeg_failures_total', operation='cut')
+            raise
+        finally:
+            self._job = None
+        if not result.ok:
+            get_metrics().inc('ffmpeg_failures_total', operation='cut')
+            raise Exception(f"ffmpeg 返回错误码 {result.returncode}: {result.stderr.strip()[-500:]}")
+        return result
+
     def get_segment_info(self, segments):
         """获取片段信息统计"""
         return self.segment_manager.get_segment_info(segments)
@@ -38,6 +71,15 @@ class VideoSplitter:
             
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        self._cancelled = False
+
+        # 跳过价值较低的片段(运动面积小、动作稀疏)，不再切割
+        if self.segment_filter:
+            segments, dropped = filter_segments(segments, **self.segment_filter)
+            if dropped and self.log_callback:
+                self.log_callback(f"按片段统计过滤掉 {len(dropped)} 个片段，剩余 {len(segments)} 个")
+            if not segments:
+                return []
 
         # 预处理片段，合并重叠部分
         segments = self.segment_manager.merge_segments(segments)
@@ -45,10 +87,13 @@ class VideoSplitter:
         base_filename = os.path.splitext(os.path.basename(video_path))[0]
         output_files = []
         total_segments = len(segments)
+        cut_start = time.monotonic()
 
         for i, segment in enumerate(segments):
+            if self._cancelled:
+                break
             try:
-                current_progress = round(((i + 1) / total_segments) * 100, 2)
+                current_progress = round((i / total_segments) * 100, 2)
                 if self.progress_callback:
                     self.progress_callback(current_progress)
 
@@ -72,7 +117,8 @@ class VideoSplitter:
                         '-y',
                         output_path
                     ]
-                    subprocess.run(cmd, check=True)
+                    self._run_ffmpeg(cmd, lambda seconds, i=i, duration=duration:
+                                     self._report_segment_progress(i, total_segments, seconds, duration))
                 else:
                     # 使用OpenCV进行切割
                     cap = cv2.VideoCapture(video_path)
@@ -99,9 +145,17 @@ class VideoSplitter:
                     out.release()
 
             except Exception as e:
-                print(f"处理片段 {i+1}/{total_segments} 时出错: {str(e)}")
+                message = f"处理片段 {i+1}/{total_segments} 时出错: {str(e)}"
+                if self.log_callback:
+                    self.log_callback(message)
+                else:
+                    print(message)
                 continue
 
+        if self._cancelled:
+            return []
+        get_metrics().observe('cut_seconds', time.monotonic() - cut_start)
+
         if self.progress_callback:
             self.progress_callback(100)
             
@@ -135,4 +189,10 @@ class VideoSplitter:
                 # 返回合并后的文件路径
                 return [merged_output_path]
             
-        return output_files
\ No newline at end of file
+        return output_files
+
+    def _report_segment_progress(self, index, total_segments, seconds, duration):
+        """根据ffmpeg输出时长换算整体切割进度"""
+        if self.progress_callback and duration > 0:
+            fraction = min(seconds / duration, 1.0)
+            self.progress_callback(round((index + fraction) / total_segments * 100, 2))
@@ -0,0 +1,53 @@
+"""检测任务遥测模块
+
+每帧只做一次计时比较，按固定频率(默认每秒5次)合并上报进度、检测帧率、
+实时倍率、已发现片段数和预计剩余时间，界面开销与视频帧率和并行任务数无关。
+"""
+import time
+
+TELEMETRY_HZ = 5.0  # 每个任务每秒最多上报次数
+
+class JobTelemetry:
+    """单个检测任务的遥测数据"""
+    def __init__(self, video_path, total_frames, video_fps, callback, rate_hz=TELEMETRY_HZ, start_frame=0):
+        """
+        Args:
+            video_path: 视频文件路径
+            total_frames: 视频总帧数
+            video_fps: 视频帧率，用于计算实时倍率
+            callback: 上报函数，参数为遥测数据字典
+            rate_hz: 每秒最多上报次数
+            start_frame: 起始帧号(从断点继续时不为0)
+        """
+        self.video_path = video_path
+        self.total_frames = total_frames
+        self.video_fps = video_fps
+        self.callback = callback
+        self.interval = 1.0 / rate_hz
+        self.start_frame = start_frame
+        self.start_time = time.monotonic()
+        self._next_report = self.start_time
+
+    def update(self, frame_count, segment_count):
+        """每帧调用一次，到达上报时间才生成并上报遥测数据"""
+        now = time.monotonic()
+        if now < self._next_report:
+            return
+        self._next_report = now + self.interval
+        self.callback(self.snapshot(frame_count, segment_count, now))
+
+    def snapshot(self, frame_count, segment_count, now=None):
+        """生成遥测数据字典"""
+        elapsed = (now or time.monotonic()) - self.start_time
+        processed = frame_count - self.start_frame
+        fps = processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total_frames - frame_count, 0)
+        return {
+            'video_path': self.video_path,
+            'progress': round(frame_count / self.total_frames * 100, 2) if self.total_frames > 0 else 0.0,
+            'frames': processed,
+            'fps': round(fps, 1),
+            'realtime_factor': round(fps / self.video_fps, 2) if self.video_fps else 0.0,
+            'segments': segment_count,
+            'eta': round(remaining / fps, 1) if fps > 0 else None,
+        }
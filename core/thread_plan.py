@@ -0,0 +1,106 @@
+"""线程分配模块
+
+同时检测多个视频时，按物理核心数在各任务之间分配解码线程和OpenCV工作线程，避免每个任务都按
+全部核心数开线程导致线程数远超核心数、频繁切换上下文。可选为每个工作进程绑定一组物理核心。
+
+    plan = plan_threads(4)        # 4个任务同时检测
+    print(format_plan(plan))
+    apply_worker_plan(plan, 0)    # 在第1个工作进程中生效
+"""
+import glob
+import cv2
+import psutil
+
+_decode_threads = 0  # 本进程中每个视频解码器的线程数，0表示由解码器自行决定
+
+def _core_groups(logical):
+    """按物理核心分组的逻辑CPU编号 [[cpu, ...], ...]"""
+    groups = []
+    for path in sorted(glob.glob('/sys/devices/system/cpu/cpu[0-9]*/topology/thread_siblings_list')):
+        try:
+            with open(path) as f:
+                text = f.read().strip()
+        except OSError:
+            continue
+        cpus = []
+        for part in text.split(','):
+            first, _, last = part.partition('-')
+            cpus.extend(range(int(first), int(last or first) + 1))
+        if cpus not in groups:
+            groups.append(cpus)
+    if groups:
+        return groups
+    # 没有拓扑信息(Windows)时假定同一核心的超线程编号相邻
+    physical = psutil.cpu_count(logical=False) or logical
+    per_core = max(1, logical // physical)
+    return [list(range(i, min(i + per_core, logical))) for i in range(0, logical, per_core)]
+
+def plan_threads(jobs, physical=None, logical=None, pin=False):
+    """为同时检测的任务分配线程
+
+    Args:
+        jobs: 同时检测的视频数
+        physical: 物理核心数，默认自动检测
+        logical: 逻辑CPU数，默认自动检测
+        pin: 是否为每个工作进程绑定CPU
+    Returns:
+        dict: jobs, physical, logical, cores_per_job, decode_threads(每个任务的解码线程),
+              cv_threads(每个工作进程的OpenCV线程), shared_cv_threads(多个任务在同一进程内时的OpenCV线程),
+              affinity(每个工作进程绑定的逻辑CPU列表，未绑定时为None)
+    """
+    physical = physical or psutil.cpu_count(logical=False) or 1
+    logical = logical or psutil.cpu_count() or physical
+    jobs = max(1, int(jobs))
+    cores = max(1, physical // jobs)
+    decode_threads = max(1, cores // 3)  # 解码预读与检测并行，约占三分之一
+    affinity = None
+    if pin:
+        groups = _core_groups(logical)
+        if jobs <= len(groups):
+            affinity = [sum(groups[i * cores:(i + 1) * cores], []) for i in range(jobs)]
+        else:
+            affinity = [groups[i % len(groups)] for i in range(jobs)]
+    return {
+        'jobs': jobs,
+        'physical': physical,
+        'logical': logical,
+        'cores_per_job': cores,
+        'decode_threads': decode_threads,
+        'cv_threads': max(1, cores - decode_threads),
+        'shared_cv_threads': max(1, physical - jobs),  # 每个检测线程自身也占一个核心
+        'affinity': affinity,
+    }
+
+def _set_decode_threads(threads):
+    global _decode_threads
+    _decode_threads = threads
+
+def decoder_params():
+    """打开视频时传给 cv2.VideoCapture 的参数，限制解码线程数"""
+    return [cv2.CAP_PROP_N_THREADS, _decode_threads] if _decode_threads else []
+
+def apply_worker_plan(plan, slot):
+    """在工作进程中应用线程分配，slot 为工作进程序号"""
+    cv2.setNumThreads(plan['cv_threads'])
+    _set_decode_threads(plan['decode_threads'])
+    if plan['affinity']:
+        try:
+            psutil.Process().cpu_affinity(plan['affinity'][slot % len(plan['affinity'])])
+        except (AttributeError, OSError, ValueError) as e:  # macOS不支持绑定CPU
+            print(f"绑定CPU失败: {str(e)}")
+
+def apply_shared_plan(plan):
+    """多个检测线程在同一进程内运行时应用线程分配(共享一个OpenCV线程池，不绑定CPU)"""
+    cv2.setNumThreads(plan['shared_cv_threads'])
+    _set_decode_threads(plan['decode_threads'])
+
+def format_plan(plan, shared=False):
+    """线程分配的可读描述"""
+    text = (f"线程分配: {plan['physical']} 个物理核心({plan['logical']} 个逻辑CPU)，同时检测 {plan['jobs']} 个视频，"
+            f"每个视频解码 {plan['decode_threads']} 线程")
+    if shared:
+        return text + f"，共享 {plan['shared_cv_threads']} 个OpenCV线程"
+    text += f"、OpenCV {plan['cv_threads']} 线程(每个任务 {plan['cores_per_job']} 个核心)"
+    if plan['affinity']:
+        text += "，绑定CPU: " + '; '.join(f"进程{i + 1} {cpus}" for i, cpus in enumerate(plan['affinity']))
+    return text
@@ -0,0 +1,116 @@
+"""片段缩略图模块
+
+在检测过程中复用已解码的帧，为每个动作片段保留运动面积最大那一帧的缩略图，
+并可拼接成整个视频的缩略图总览(contact sheet)，浏览或导出时无需再次解码视频。
+"""
+import os
+import cv2
+import numpy as np
+
+class ThumbnailCollector:
+    """片段缩略图收集器"""
+    def __init__(self, max_width=160, image_format='.jpg', quality=80, max_sheet_tiles=64):
+        """
+        Args:
+            max_width (int): 缩略图最大宽度
+            image_format (str): 编码格式，'.jpg' 或 '.webp'
+            quality (int): 编码质量(1-100)
+            max_sheet_tiles (int): 总览图最多包含的缩略图数量
+        """
+        self.max_width = max_width
+        self.image_format = image_format
+        self.quality = quality
+        self.max_sheet_tiles = max_sheet_tiles
+        self.thumbnails = []  # 已完成片段的缩略图
+        self._sheet_tiles = []  # 用于拼接总览图的缩略图像素
+        self._buffer = None  # 当前片段的缩略图缓冲区，尺寸固定
+        self._peak_area = 0
+        self._peak_frame = None
+
+    def _thumbnail_size(self, frame):
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.max_width / width)
+        return max(1, int(width * scale)), max(1, int(height * scale)), scale
+
+    def observe(self, frame, motion_area, boxes, frame_index):
+        """记录当前片段中的一帧，只在运动面积创新高时缩放到缓冲区"""
+        if motion_area <= self._peak_area:
+            return
+        width, height, scale = self._thumbnail_size(frame)
+        if self._buffer is None or self._buffer.shape[:2] != (height, width):
+            self._buffer = np.empty((height, width, 3), dtype=np.uint8)
+        cv2.resize(frame, (width, height), dst=self._buffer, interpolation=cv2.INTER_AREA)
+        for (x, y, w, h) in boxes:
+            cv2.rectangle(self._buffer, (int(x * scale), int(y * scale)),
+                          (int((x + w) * scale), int((y + h) * scale)), (0, 255, 0), 1)
+        self._peak_area = motion_area
+        self._peak_frame = frame_index
+
+    def close_segment(self, segment):
+        """片段结束时编码缩略图并重置缓冲区"""
+        if self._peak_frame is not None:
+            params = [cv2.IMWRITE_WEBP_QUALITY if self.image_format == '.webp'
+                      else cv2.IMWRITE_JPEG_QUALITY, self.quality]
+            ok, encoded = cv2.imencode(self.image_format, self._buffer, params)
+            if ok:
+                self.thumbnails.append({
+                    'start': segment['start'],
+                    'end': segment['end'],
+                    'frame_index': self._peak_frame,
+                    'motion_area': self._peak_area,
+                    'data': encoded.tobytes()
+                })
+                if len(self._sheet_tiles) < self.max_sheet_tiles:
+                    self._sheet_tiles.append(self._buffer.copy())
+        self._peak_area = 0
+        self._peak_frame = None
+
+    def get_state(self):
+        """获取收集器状态(已完成片段的缩略图和当前片段的峰值帧)，用于保存断点"""
+        return {
+            'thumbnails': list(self.thumbnails),
+            'sheet_tiles': list(self._sheet_tiles),
+            'buffer': self._buffer if self._peak_frame is not None else None,
+            'peak_area': float(self._peak_area),
+            'peak_frame': self._peak_frame,
+        }
+
+    def set_state(self, state):
+        """从断点恢复收集器状态"""
+        self.thumbnails = list(state['thumbnails'])
+        self._sheet_tiles = list(state['sheet_tiles'])
+        self._buffer = state['buffer']
+        self._peak_area = state['peak_area']
+        self._peak_frame = state['peak_frame']
+
+    def build_contact_sheet(self, columns=8):
+        """将所有片段缩略图拼接为总览图，返回编码后的字节，没有缩略图时返回None"""
+        if not self._sheet_tiles:
+            return None
+        tile_h = max(tile.shape[0] for tile in self._sheet_tiles)
+        tile_w = max(tile.shape[1] for tile in self._sheet_tiles)
+        columns = min(columns, len(self._sheet_tiles))
+        rows = (len(self._sheet_tiles) + columns - 1) // columns
+        sheet = np.zeros((rows * tile_h, columns * tile_w, 3), dtype=np.uint8)
+        for i, tile in enumerate(self._sheet_tiles):
+            y, x = (i // columns) * tile_h, (i % columns) * tile_w
+            sheet[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+        ok, encoded = cv2.imencode(self.image_format, sheet)
+        return encoded.tobytes() if ok else None
+
+    def export(self, output_dir, base_name):
+        """导出缩略图和总览图，返回写入的文件列表"""
+        os.makedirs(output_dir, exist_ok=True)
+        files = []
+        for i, thumb in enumerate(self.thumbnails, 1):
+            path = os.path.join(output_dir, f"{base_name}_片段{i}_{int(thumb['start'])}s{self.image_format}")
+            with open(path, 'wb') as f:
+                f.write(thumb['data'])
+            files.append(path)
+        sheet = self.build_contact_sheet()
+        if sheet:
+            path = os.path.join(output_dir, f"{base_name}_总览{self.image_format}")
+            with open(path, 'wb') as f:
+                f.write(sheet)
+            files.append(path)
+        return files
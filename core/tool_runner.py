@@ -0,0 +1,190 @@
+"""外部工具(ffmpeg/ffprobe)调度模块
+
+所有外部进程都在一个后台asyncio事件循环中运行，按工具限制并发数，
+支持超时、取消(会杀掉子进程)、解析ffmpeg的 -progress 进度输出并保留stderr用于诊断。
+GUI线程和命令行模式都通过 submit/run 提交任务，不会阻塞事件循环。
+进度回调在单独的线程中调用(只保留每个任务的最新进度)，回调较慢时不会拖慢其他外部工具任务。
+"""
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+
+STDERR_TAIL_LINES = 50  # 保留的stderr行数
+READ_CHUNK = 65536  # 按块读取stderr的块大小，超过该长度仍未换行的内容只保留末尾
+
+class ToolError(Exception):
+    """外部工具执行失败"""
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+class ToolResult:
+    """外部工具执行结果"""
+    def __init__(self, returncode, stdout, stderr, elapsed):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr  # 最后若干行stderr
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+class _ProgressRelay:
+    """把事件循环中解析出的进度转交给进度线程，未送达的旧进度被新进度覆盖"""
+    def __init__(self, callback, pending):
+        self.callback = callback
+        self._pending = pending  # 进度线程的待处理队列
+        self._lock = threading.Lock()
+        self._value = None
+        self._queued = False
+
+    def __call__(self, value):
+        with self._lock:
+            self._value = value
+            if self._queued:
+                return
+            self._queued = True
+        self._pending.put(self)
+
+    def deliver(self):
+        with self._lock:
+            value = self._value
+            self._queued = False
+        self.callback(value)
+
+class ToolRunner:
+    """外部工具异步调度器"""
+    DEFAULT_LIMITS = {'ffprobe': 4, 'ffmpeg': 2}
+
+    def __init__(self, limits=None):
+        self.limits = dict(self.DEFAULT_LIMITS, **(limits or {}))
+        self._semaphores = {}  # 只在事件循环线程中访问
+        self._loop = None
+        self._lock = threading.Lock()
+        self._progress = queue.Queue()
+
+    def _ensure_loop(self):
+        """启动后台事件循环线程"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever,
+                                 name='ToolRunner', daemon=True).start()
+                threading.Thread(target=self._deliver_progress,
+                                 name='ToolRunnerProgress', daemon=True).start()
+        return self._loop
+
+    def _deliver_progress(self):
+        """进度线程：调用各任务的进度回调"""
+        while True:
+            relay = self._progress.get()
+            try:
+                relay.deliver()
+            except Exception as e:
+                print(f"进度回调出错: {str(e)}")
+
+    def submit(self, tool, cmd, timeout=None, progress_callback=None):
+        """提交外部工具任务
+
+        Args:
+            tool: 工具名称，用于并发限制，如 'ffmpeg'、'ffprobe'
+            cmd: 命令行参数列表
+            timeout: 超时时间(秒)，None表示不限制
+            progress_callback: ffmpeg进度回调，参数为已处理的输出时长(秒)，在进度线程中调用
+        Returns:
+            concurrent.futures.Future: 结果为ToolResult，调用cancel()会杀掉子进程
+        """
+        if progress_callback and '-progress' not in cmd:
+            cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + list(cmd[1:])
+        if progress_callback:
+            progress_callback = _ProgressRelay(progress_callback, self._progress)
+        coro = self._run(tool, cmd, timeout, progress_callback)
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, tool, cmd, timeout=None, progress_callback=None, check=False):
+        """同步执行外部工具并等待结果，check为True时非零返回码抛出ToolError"""
+        result = self.submit(tool, cmd, timeout, progress_callback).result()
+        if check and not result.ok:
+            raise ToolError(f"{tool} 返回错误码 {result.returncode}: "
+                            f"{result.stderr.strip()[-500:]}", result)
+        return result
+
+    def _semaphore(self, tool):
+        if tool not in self._semaphores:
+            self._semaphores[tool] = asyncio.Semaphore(self.limits.get(tool, 1))
+        return self._semaphores[tool]
+
+    async def _run(self, tool, cmd, timeout, progress_callback):
+        async with self._semaphore(tool):
+            start = time.monotonic()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            except OSError as e:
+                raise ToolError(f"无法启动 {tool}: {str(e)}")
+            stdout_lines = []
+            stderr_lines = deque(maxlen=STDERR_TAIL_LINES)
+            try:
+                await asyncio.wait_for(asyncio.gather(
+                    self._read_stdout(proc.stdout, stdout_lines, progress_callback),
+                    self._read_tail(proc.stderr, stderr_lines),
+                    proc.wait()), timeout)
+            except asyncio.TimeoutError:
+                raise ToolError(f"{tool} 执行超时({timeout}秒): {''.join(stderr_lines)[-500:]}")
+            finally:
+                await self._kill(proc)  # 超时、取消或读取出错时子进程仍在运行，杀掉并回收
+            return ToolResult(proc.returncode, ''.join(stdout_lines),
+                              ''.join(stderr_lines), time.monotonic() - start)
+
+    async def _kill(self, proc):
+        """杀掉子进程并回收"""
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+    async def _read_tail(self, stream, lines):
+        """按块读取stderr并按行保留末尾，ffmpeg的统计输出以回车分隔，可能很长时间没有换行"""
+        partial = b''
+        while True:
+            chunk = await stream.read(READ_CHUNK)
+            if not chunk:
+                break
+            parts = (partial + chunk).splitlines(keepends=True)
+            partial = b'' if parts[-1].endswith((b'\n', b'\r')) else parts.pop()[-READ_CHUNK:]
+            lines.extend(part.decode('utf-8', errors='replace') for part in parts)
+        if partial:
+            lines.append(partial.decode('utf-8', errors='replace'))
+
+    async def _read_stdout(self, stream, lines, progress_callback):
+        """读取stdout，解析ffmpeg -progress 输出的 out_time_us 字段"""
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode('utf-8', errors='replace')
+            if progress_callback and text.startswith(('out_time_us=', 'out_time_ms=')):
+                value = text.split('=', 1)[1].strip()
+                if value.isdigit():
+                    # ffmpeg 的 out_time_ms 实际单位也是微秒
+                    progress_callback(int(value) / 1_000_000)
+                continue
+            if not progress_callback:
+                lines.append(text)
+
+_shared_runner = None
+_shared_lock = threading.Lock()
+
+def get_tool_runner():
+    """获取进程内共享的外部工具调度器"""
+    global _shared_runner
+    with _shared_lock:
+        if _shared_runner is None:
+            _shared_runner = ToolRunner()
+        return _shared_runner
@@ -0,0 +1,47 @@
+"""视频信息探测模块(ffprobe)"""
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from .tool_runner import get_tool_runner
+
+PROBE_TIMEOUT = 30  # ffprobe超时时间(秒)
+
+@lru_cache(maxsize=1)
+def get_ffprobe_path():
+    """获取ffprobe可执行文件路径，项目bin目录中没有时查找系统PATH"""
+    bundled = Path(__file__).parent.parent / "bin" / "ffprobe.exe"
+    if bundled.exists():
+        return str(bundled)
+    return shutil.which("ffprobe") or str(bundled)
+
+def _probe(args, video_path):
+    """执行ffprobe并返回输出文本，失败返回None"""
+    cmd = [get_ffprobe_path(), "-v", "error"] + args + \
+          ["-of", "default=noprint_wrappers=1:nokey=1", video_path]
+    result = get_tool_runner().run('ffprobe', cmd, timeout=PROBE_TIMEOUT)
+    if result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+def probe_fps(video_path):
+    """使用ffprobe获取准确的视频帧率"""
+    try:
+        output = _probe(["-select_streams", "v:0", "-show_entries", "stream=r_frame_rate"], video_path)
+        if output:
+            num, den = map(int, output.split('/'))
+            return num / den
+        return None
+    except Exception as e:
+        print(f"获取准确帧率失败: {str(e)}")
+        return None
+
+def probe_duration(video_path):
+    """使用ffprobe获取准确的视频时长（秒）"""
+    try:
+        output = _probe(["-show_entries", "format=duration"], video_path)
+        if output:
+            return float(output)
+        return None
+    except Exception as e:
+        print(f"获取视频时长失败: {str(e)}")
+        return None
@@ -5,14 +5,15 @@ from PyQt5.QtWidgets import (QGroupBox, QHBoxLayout, QVBoxLayout, QLabel,
                          QHeaderView, QStyle, QSizePolicy, QToolTip)
 from PyQt5.QtCore import Qt
 import os
-from core.config_manager import ConfigManager
+from core.config_manager import get_config
 
 class FileGroup(QGroupBox):
     def __init__(self, parent=None):
         super().__init__("文件选择", parent)
         self.parent = parent
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config()
         self.is_detecting = False  # 添加检测状态标志
+        self._items = {}  # 文件路径 -> 列表项，避免每次更新状态都遍历列表
         self._init_ui()
         # 将加载历史记录的调用移到外部
 
@@ -153,8 +154,7 @@ class FileGroup(QGroupBox):
         
         # 更新有效的视频列表
         if valid_videos:
-            self.config_manager.config['recent_video_list'] = valid_videos
-            self.config_manager.save_config()
+            self.config_manager.set_recent_videos(valid_videos)
             # 启用检测按钮
             self.detect_btn.setEnabled(True)
 
@@ -167,21 +167,23 @@ class FileGroup(QGroupBox):
         # 设置工具提示
         item.setToolTip(0, file_path)
         self.file_list.addTopLevelItem(item)
+        self._items[file_path] = item
 
-    def update_file_status(self, file_path, status, progress=None):
+    def update_file_status(self, file_path, status, progress=None, detail=None):
         """更新文件状态和进度
         Args:
             file_path: 文件路径
             status: 状态文本
             progress: 进度值(0-100)，可选
+            detail: 状态详情(帧率、剩余时间等)，显示为状态列的悬停提示，可选
         """
-        for i in range(self.file_list.topLevelItemCount()):
-            item = self.file_list.topLevelItem(i)
-            if item.text(0) == file_path:
-                item.setText(1, status)
-                if progress is not None:
-                    item.setText(2, f"{progress:.1f}%")
-                break
+        item = self._items.get(file_path)
+        if item is None:
+            return
+        item.setText(1, status)
+        item.setToolTip(1, detail or status)
+        if progress is not None:
+            item.setText(2, f"{progress:.1f}%")
 
     def _select_files(self):
         """选择多个视频文件"""
@@ -195,16 +197,13 @@ class FileGroup(QGroupBox):
         if files:
             for file_path in files:
                 # 检查文件是否已存在于列表中
-                exists = False
-                for i in range(self.file_list.topLevelItemCount()):
-                    if self.file_list.topLevelItem(i).text(0) == file_path:
-                        exists = True
-                        break
-                
-                if not exists:
+                if file_path not in self._items:
                     self._add_file_item(file_path)
                     self.config_manager.add_to_recent_videos(file_path)
                     self._safe_log(f'已添加视频文件: {os.path.basename(file_path)}')
+                    # 检测过程中添加的文件优先处理
+                    if self.is_detecting and hasattr(self.parent, 'add_interactive_video'):
+                        self.parent.add_interactive_video(file_path)
             
             # 设置最后一个文件为最近使用
             if files:
@@ -215,6 +214,7 @@ class FileGroup(QGroupBox):
     def _clear_files(self):
         """清空文件列表"""
         self.file_list.clear()
+        self._items.clear()
         self.config_manager.clear_recent_videos()
         self.detect_btn.setEnabled(False)
         self._safe_log("已清空文件列表")
@@ -225,6 +225,9 @@ class FileGroup(QGroupBox):
         delete_action = QAction("删除", self)
         delete_action.triggered.connect(self._delete_selected_file)
         menu.addAction(delete_action)
+        thumbnails_action = QAction("查看缩略图", self)
+        thumbnails_action.triggered.connect(self._show_selected_thumbnails)
+        menu.addAction(thumbnails_action)
         menu.exec_(self.file_list.mapToGlobal(position))
 
     def _delete_selected_file(self):
@@ -233,12 +236,19 @@ class FileGroup(QGroupBox):
         if current_item:
             file_path = current_item.text(0)  # 获取文件路径列的值
             self.file_list.takeTopLevelItem(self.file_list.indexOfTopLevelItem(current_item))
+            self._items.pop(file_path, None)
             self.config_manager.remove_from_recent_videos(file_path)
             
             if self.file_list.topLevelItemCount() == 0:
                 self.detect_btn.setEnabled(False)
             self._safe_log(f"已移除视频文件: {os.path.basename(file_path)}")
 
+    def _show_selected_thumbnails(self):
+        """查看选中文件的片段缩略图"""
+        current_item = self.file_list.currentItem()
+        if current_item and hasattr(self.parent, 'show_thumbnails'):
+            self.parent.show_thumbnails(current_item.text(0))
+
     def _select_output_directory(self):
         """选择输出目录"""
         current_dir = self.config_manager.get_output_directory()
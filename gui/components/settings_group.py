@@ -2,7 +2,7 @@
 from PyQt5.QtWidgets import (QGroupBox, QGridLayout, QHBoxLayout, QVBoxLayout, QLabel, 
                            QSpinBox, QDoubleSpinBox, QCheckBox, QWidget)
 from PyQt5.QtCore import Qt
-from core.config_manager import ConfigManager
+from core.config_manager import get_config
 
 class WheelSpinBox(QSpinBox):
     """支持滚轮操作的整数输入框"""
@@ -25,7 +25,7 @@ class SettingsGroup(QGroupBox):
         super().__init__("检测设置", parent)
         self.hardware = hardware
         self.parent = parent
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config()
         self._init_ui()
 
     def _init_ui(self):
@@ -80,6 +80,21 @@ class SettingsGroup(QGroupBox):
         self.show_preview.setChecked(self.config_manager.get_show_preview())
         checkbox_layout.addWidget(self.show_preview)
         
+        # 缩略图导出选项
+        self.save_thumbnails = QCheckBox("导出缩略图")
+        self.save_thumbnails.setChecked(self.config_manager.get_save_thumbnails())
+        checkbox_layout.addWidget(self.save_thumbnails)
+        
+        # 多进程检测选项
+        self.use_process_pool = QCheckBox("多进程检测")
+        self.use_process_pool.setChecked(self.config_manager.get_use_process_pool())
+        checkbox_layout.addWidget(self.use_process_pool)
+        
+        # 自动调整并行数选项
+        self.adaptive_concurrency = QCheckBox("自动并行")
+        self.adaptive_concurrency.setChecked(self.config_manager.get_adaptive_concurrency())
+        checkbox_layout.addWidget(self.adaptive_concurrency)
+        
         bottom_row.addLayout(checkbox_layout)
         bottom_row.addStretch()
         
@@ -103,6 +118,12 @@ class SettingsGroup(QGroupBox):
             # 添加预览显示状态变更的信号连接
             self.show_preview.stateChanged.connect(
                 lambda state: self.config_manager.set_show_preview(bool(state)))
+            self.save_thumbnails.stateChanged.connect(
+                lambda state: self.config_manager.set_save_thumbnails(bool(state)))
+            self.use_process_pool.stateChanged.connect(
+                lambda state: self.config_manager.set_use_process_pool(bool(state)))
+            self.adaptive_concurrency.stateChanged.connect(
+                lambda state: self.config_manager.set_adaptive_concurrency(bool(state)))
 
     def _create_spin_box(self, layout, label, min_val, max_val, default):
         """创建整数输入框"""
@@ -155,6 +176,7 @@ class SettingsGroup(QGroupBox):
             'use_gpu': self.use_gpu.isChecked(),
             'auto_split': self.auto_split.isChecked(),
             'max_concurrent_videos': self.concurrent_videos_spin.value(),
-            'show_preview': self.show_preview.isChecked()  # 添加预览显示设置
+            'show_preview': self.show_preview.isChecked(),  # 添加预览显示设置
+            'use_process_pool': self.use_process_pool.isChecked()
         }
         return settings
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""片段缩略图浏览组件"""
+from PyQt5.QtWidgets import (QDialog, QGridLayout, QVBoxLayout, QLabel,
+                           QScrollArea, QWidget)
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import Qt
+from core.segment_manager import SegmentManager
+
+class ThumbnailDialog(QDialog):
+    """以网格方式展示检测时保存的片段缩略图"""
+    COLUMNS = 4
+
+    def __init__(self, title, thumbnails, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"片段缩略图 - {title}")
+        self.resize(760, 520)
+        self._init_ui(thumbnails)
+
+    def _init_ui(self, thumbnails):
+        grid_widget = QWidget()
+        grid = QGridLayout(grid_widget)
+        grid.setSpacing(8)
+        format_time = SegmentManager().format_time
+        
+        for i, thumb in enumerate(thumbnails):
+            pixmap = QPixmap()
+            pixmap.loadFromData(thumb['data'])
+            image_label = QLabel()
+            image_label.setPixmap(pixmap)
+            image_label.setAlignment(Qt.AlignCenter)
+            text_label = QLabel(f"片段{i + 1}: {format_time(thumb['start'])} - {format_time(thumb['end'])}")
+            text_label.setAlignment(Qt.AlignCenter)
+            
+            cell = QVBoxLayout()
+            cell.addWidget(image_label)
+            cell.addWidget(text_label)
+            grid.addLayout(cell, i // self.COLUMNS, i % self.COLUMNS)
+        
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(grid_widget)
+        layout = QVBoxLayout(self)
+        layout.addWidget(scroll)
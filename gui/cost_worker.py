@@ -0,0 +1,42 @@
+"""检测工作量估算线程模块"""
+import queue
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.job_scheduler import estimate_cost
+
+class CostWorker(QThread):
+    """后台读取视频元数据估算检测工作量
+
+    开始检测时先按文件大小排队，避免在GUI线程中逐个打开视频导致界面卡顿；
+    本线程读取每个视频的时长和分辨率后发出准确的工作量，由调度器替换粗略估算。
+    """
+    estimated = pyqtSignal(int, str, float)  # (批次号, 视频路径, 预估工作量)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+        self._batch = 0
+        self._is_running = True
+
+    def estimate(self, video_paths, new_batch=True):
+        """估算一批视频，new_batch 为True时放弃之前未完成的批次，返回批次号"""
+        if new_batch:
+            self._batch += 1
+        for video_path in video_paths:
+            self._queue.put((self._batch, video_path))
+        return self._batch
+
+    def stop(self):
+        """停止估算线程"""
+        self._is_running = False
+        self._queue.put(None)
+
+    def run(self):
+        """运行估算线程"""
+        while self._is_running:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, video_path = item
+            if batch != self._batch:
+                continue  # 已开始新一轮检测
+            self.estimated.emit(batch, video_path, estimate_cost(video_path))
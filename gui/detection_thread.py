@@ -2,28 +2,48 @@
 from PyQt5.QtCore import QThread, pyqtSignal
 from core.detector import MotionDetector
 from core.splitter import VideoSplitter
-from core.config_manager import ConfigManager
+from core.config_manager import get_config
+from core.thumbnails import ThumbnailCollector
+from core.checkpoint import CheckpointStore, CHECKPOINT_INTERVAL
+from core.telemetry import JobTelemetry
+from core.profiler import StageProfiler, DEFAULT_PROFILE_DIR, format_summary
+from core.metrics import get_metrics
 from .video_processor import VideoProcessor
+import itertools
 import math
 import os
+import time
+
+_job_ids = itertools.count(1)  # 运行指标中区分各检测线程的任务ID
 
 class DetectionThread(QThread):
-    progress = pyqtSignal(float)  # 进度信号 (0-100)
+    progress = pyqtSignal(dict)   # 遥测信号，包含进度(0-100)、帧率、实时倍率、片段数和剩余时间
     finished = pyqtSignal(list)   # 完成信号，发送检测到的片段列表
     error = pyqtSignal(str)       # 错误信号
     auto_split_requested = pyqtSignal()  # 自动切割请求信号
+    log = pyqtSignal(str)         # 日志信号
 
     def __init__(self, video_path, hardware, window_scale=0.7, threshold=30, 
                  min_area=1000, playback_speed=1.0, parent=None):
         super().__init__(parent)
         self.video_path = video_path
         self.video_name = os.path.basename(video_path)
+        self.job_id = f"thread-{next(_job_ids)}"
         self.video_processor = VideoProcessor(hardware, window_scale, playback_speed)
         self.detector = MotionDetector(threshold, min_area, static_time_threshold=1.0)
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config()
+        self.thumbnails = None  # 开启导出缩略图时才收集，避免无谓地复制峰值帧
+        if self.config_manager.get_save_thumbnails():
+            self.thumbnails = ThumbnailCollector()
+            self.detector.set_thumbnail_collector(self.thumbnails)
+        self.checkpoints = CheckpointStore() if self.config_manager.get_enable_checkpoints() else None
+        self.profiler = StageProfiler(video_path) if self.config_manager.get_enable_profiling() else None
+        self.detector.set_profiler(self.profiler)
         self.parent = parent
         self._is_running = True
-        self._current_progress = 0  # 当前进度
+        self.start_frame = 0  # 从断点继续时的起始帧
+        self.frames_processed = 0  # 本次已检测的帧数
+        self.reached_end = False  # 是否检测到视频末尾(结果完整)
         
         # 同步预览显示设置
         if hasattr(parent, 'settings_group'):
@@ -36,7 +56,14 @@ class DetectionThread(QThread):
     @property
     def current_progress(self):
         """获取当前进度"""
-        return self._current_progress
+        total_frames = self.video_processor.total_frames
+        done = self.start_frame + self.frames_processed
+        return round(done / total_frames * 100, 2) if total_frames > 0 else 0
+
+    def _report_progress(self, telemetry):
+        """上报遥测数据，同时更新运行指标"""
+        get_metrics().update_job(self.job_id, self.video_path, telemetry)
+        self.progress.emit(telemetry)
 
     def _align_time(self, time_value, round_up=False):
         """对齐时间到整秒"""
@@ -52,30 +79,55 @@ class DetectionThread(QThread):
                 self.video_processor.frame_height
             )
             self.detector.set_fps(self.video_processor.fps)
+            use_gpu = self.video_processor.hardware.has_gpu
 
-            # 初始化检测状态
+            # 初始化检测状态，有断点时从断点继续
             frame_count = 0
             segments = []
+            params = self.detector.checkpoint_params()
+            if self.checkpoints:
+                checkpoint = self.checkpoints.load(self.video_path, params)
+                if checkpoint:
+                    frame_count = checkpoint['frame_index']
+                    segments = checkpoint['segments']
+                    self.detector.set_state(checkpoint['detector_state'], use_gpu)
+                    self.video_processor.seek(frame_count)
+                    self.log.emit(f"{self.video_name} 从断点继续检测（第 {frame_count} 帧）")
+            self.start_frame = frame_count
+            last_checkpoint = time.monotonic()
+            completed = False
+            telemetry = JobTelemetry(self.video_path, self.video_processor.total_frames,
+                                     self.video_processor.fps, self._report_progress,
+                                     start_frame=frame_count)
 
+            profiler = self.profiler
             while self._is_running:
                 # 读取视频帧
+                if profiler is not None:
+                    profiler.begin()
                 ret, frame = self.video_processor.read_frame()
+                if profiler is not None:
+                    profiler.lap('decode')
                 if not ret:
                     # 处理最后一个未完成的片段
-                    final_segment = self.detector.get_current_segment()
+                    final_segment = self.detector.finish()
                     if final_segment:
                         segments.append(final_segment)
+                    completed = True
+                    self.reached_end = True
                     break
 
-                # 更新和发送进度
-                self._current_progress = round((frame_count / self.video_processor.total_frames) * 100, 2)
-                self.progress.emit(self._current_progress)
+                # 按固定频率合并上报进度
+                telemetry.update(frame_count, len(segments))
+                if profiler is not None:
+                    profiler.begin()
 
                 # 检测动作
                 motion_detected, display_frame, segment = self.detector.process_frame(
                     frame,
                     frame_count,
-                    use_gpu=self.video_processor.hardware.has_gpu
+                    use_gpu=use_gpu,
+                    draw_overlay=False  # 预览在缩小后的图像上绘制
                 )
 
                 # 如果产生了新的片段，添加到列表中
@@ -84,18 +136,49 @@ class DetectionThread(QThread):
 
                 # 显示处理后的帧
                 title = f"Motion Detection - {self.video_name}"
-                if self.video_processor.display_frame(display_frame, title):
+                stop_requested = self.video_processor.display_frame(
+                    display_frame, title, self.detector.last_boxes, self.detector.region_manager.exclude_regions)
+                if profiler is not None:
+                    profiler.lap('display')
+                if stop_requested:
                     self.stop()
                     # 处理未完成的片段
-                    final_segment = self.detector.get_current_segment()
+                    final_segment = self.detector.finish()
                     if final_segment:
                         segments.append(final_segment)
+                    completed = True
                     break
 
                 frame_count += 1
+                self.frames_processed = frame_count - self.start_frame
+                
+                # 定期保存断点
+                if self.checkpoints and time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                    self.checkpoints.save(self.video_path, frame_count, segments,
+                                          self.detector.get_state(), params)
+                    last_checkpoint = time.monotonic()
 
             # 清理资源
             self.video_processor.close()
+            get_metrics().finish_job(self.job_id, self.video_path, frame_count - telemetry.start_frame)
+            
+            if self.checkpoints:
+                if not completed:
+                    # 检测被停止，保存断点后直接返回，下次检测时从这里继续
+                    self.checkpoints.save(self.video_path, frame_count, segments,
+                                          self.detector.get_state(), params)
+                    return
+                self.checkpoints.remove(self.video_path)
+            
+            if profiler is not None:
+                self.log.emit(format_summary(self.video_path, profiler.summary()))
+                profiler.save(DEFAULT_PROFILE_DIR)
+            
+            # 导出片段缩略图，无需再次解码视频
+            output_dir = self.config_manager.get_output_directory()
+            if self.thumbnails is not None and output_dir:
+                base_name = os.path.splitext(self.video_name)[0]
+                self.thumbnails.export(os.path.join(output_dir, 'thumbnails'), base_name)
             
             # 发出完成信号
             self.finished.emit(segments)
@@ -105,6 +188,7 @@ class DetectionThread(QThread):
                 self.auto_split_requested.emit()
                 
         except Exception as e:
+            get_metrics().finish_job(self.job_id, self.video_path)
             if self._is_running:
                 self.error.emit(str(e))
 
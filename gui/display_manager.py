@@ -1,142 +1,84 @@
 """显示管理器模块"""
 import cv2
-from typing import Dict, Any
+import numpy as np
 
 class DisplayManager:
-    """负责视频帧的显示和窗口管理"""
-    
+    """负责生成预览图：先缩小原始帧，再在小图上绘制排除区域、运动框和信息文本"""
+
     def __init__(self, window_scale=1.0):
         """初始化显示管理器"""
         self.window_scale = window_scale
-        self.windows = {}  # 存储所有窗口信息 {window_id: window_info}
-        self.last_info = {}  # 存储上一次显示的信息
 
     def draw_overlay_text(self, frame, info_text, position='top-right'):
-        """在帧上绘制叠加文本"""
-        # 如果是 UMat 对象，需要先转换回 CPU
-        if isinstance(frame, cv2.UMat):
-            frame = frame.get()
-            
-        # 设置字体参数
+        """在帧上绘制叠加文本，只混合文本背景区域"""
+        # 设置字体参数(按预览图宽度缩放)
         font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 1.2
-        thickness = 2
-        
+        font_scale = max(frame.shape[1] / 1600, 0.4)
+        thickness = 1
+
         # 获取文本大小
         (text_width, text_height), baseline = cv2.getTextSize(
             info_text, font, font_scale, thickness)
-            
+
         # 计算文本位置
+        padding = 4
         if position == 'top-right':
-            x = frame.shape[1] - text_width - 20
-            y = text_height + 20
-            
-        # 创建文本背景
-        padding = 8
-        overlay = frame.copy()
-        cv2.rectangle(overlay, 
-                     (x - padding, y - text_height - padding),
-                     (x + text_width + padding, y + padding),
-                     (0, 0, 0), -1)
-                     
-        # 添加半透明背景
-        alpha = 0.7
-        frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
-        
-        # 添加文本（带描边）
-        cv2.putText(frame, info_text, (x, y), font, font_scale, 
-                   (0, 0, 0), thickness + 2)  # 黑色描边
-        cv2.putText(frame, info_text, (x, y), font, font_scale, 
-                   (255, 255, 255), thickness)  # 白色文字
-                   
+            x = max(frame.shape[1] - text_width - 10, padding)
+            y = text_height + 10
+        else:
+            x, y = 10, text_height + 10
+
+        # 半透明背景，只处理文本所在区域
+        y0, y1 = max(y - text_height - padding, 0), min(y + padding, frame.shape[0])
+        x0, x1 = max(x - padding, 0), min(x + text_width + padding, frame.shape[1])
+        roi = frame[y0:y1, x0:x1]
+        roi[:] = (roi * 0.3).astype(roi.dtype)
+
+        # 添加文本
+        cv2.putText(frame, info_text, (x, y), font, font_scale,
+                   (255, 255, 255), thickness, cv2.LINE_AA)
         return frame
 
-    def get_window_position(self, window_id: str) -> tuple:
-        """计算窗口位置
-        
-        Args:
-            window_id: 窗口ID
-        
-        Returns:
-            tuple: (x, y) 窗口位置
-        """
-        screen_width = 1920  # 假设屏幕宽度
-        window_width = 640   # 假设窗口宽度
-        window_height = 480  # 假设窗口高度
-        windows_per_row = 3  # 每行显示的窗口数
-        
-        # 计算窗口索引
-        index = len(self.windows)
-        row = index // windows_per_row
-        col = index % windows_per_row
-        
-        # 计算位置
-        x = col * (window_width + 20)  # 20像素间隔
-        y = row * (window_height + 40)  # 40像素间隔，给标题栏留空间
-        
-        return (x, y)
+    def render(self, frame, info_text=None, boxes=(), regions=(), max_size=None):
+        """生成预览图
 
-    def display_frame(self, frame, info=None, title="Motion Detection", window_id=None):
-        """显示帧和相关信息
-        
         Args:
-            frame: 要显示的帧
-            info: 要显示的信息字典，包含：
-                - text: 要显示的文本
-                - position: 文本位置 ('top-right', 'top-left' 等)
-            title: 窗口标题
-            window_id: 窗口唯一标识符，用于多窗口显示
+            frame: 原始视频帧(不会被修改)
+            info_text: 右上角显示的文本
+            boxes: 运动框列表 [(x, y, w, h)]，原始帧坐标
+            regions: 排除区域列表 [{'x', 'y', 'width', 'height'}]，原始帧坐标
+            max_size: 预览图最大尺寸 (宽, 高)，None表示只按 window_scale 缩放
+        Returns:
+            numpy数组: 缩小后的BGR预览图
         """
-        if frame is None:
-            return False
-            
-        # 生成窗口ID
-        if window_id is None:
-            window_id = title
-
         # 如果是 UMat 对象，需要先转换回 CPU
         if isinstance(frame, cv2.UMat):
             frame = frame.get()
-        
-        # 添加文本叠加
-        if info and info.get('text'):
-            frame = self.draw_overlay_text(
-                frame, 
-                info['text'], 
-                info.get('position', 'top-right')
-            )
-        
-        # 缩放显示帧
-        if self.window_scale != 1.0:
-            display_frame = cv2.resize(
-                frame, None,
-                fx=self.window_scale,
-                fy=self.window_scale
-            )
+        frame_height, frame_width = frame.shape[:2]
+        scale = self.window_scale
+        if max_size:
+            scale = min(scale, max_size[0] / frame_width, max_size[1] / frame_height)
+
+        # 先缩小，后续绘制都在小图上进行
+        if scale != 1.0:
+            image = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
         else:
-            display_frame = frame
-            
-        # 创建和定位窗口
-        if window_id not in self.windows:
-            cv2.namedWindow(window_id, cv2.WINDOW_NORMAL)
-            x, y = self.get_window_position(window_id)
-            cv2.moveWindow(window_id, x, y)
-            self.windows[window_id] = {'position': (x, y)}
-            
-        # 显示帧
-        cv2.imshow(window_id, display_frame)
-        
-        # 处理键盘事件
-        key = cv2.waitKey(1) & 0xFF
-        return key == ord('q')
+            image = frame.copy()
+
+        # 排除区域(与检测时一样跳过超出画面的区域)
+        for region in regions:
+            x, y, w, h = region['x'], region['y'], region['width'], region['height']
+            if y + h > frame_height or x + w > frame_width:
+                continue
+            roi = image[int(y * scale):int((y + h) * scale), int(x * scale):int((x + w) * scale)]
+            roi[:] = (roi * 0.7).astype(np.uint8)
+            roi[..., 2] += 76  # 30%不透明的红色
 
-    def close_window(self, window_id):
-        """关闭指定的窗口"""
-        if window_id in self.windows:
-            cv2.destroyWindow(window_id)
-            del self.windows[window_id]
+        # 运动框
+        for x, y, w, h in boxes:
+            cv2.rectangle(image, (int(x * scale), int(y * scale)),
+                          (int((x + w) * scale), int((y + h) * scale)), (0, 255, 0), 1)
 
-    def close_all_windows(self):
-        """关闭所有显示窗口"""
-        cv2.destroyAllWindows()
-        self.windows.clear()
\ No newline at end of file
+        if info_text:
+            self.draw_overlay_text(image, info_text)
+        return image
@@ -0,0 +1,70 @@
+"""多进程检测引擎的界面桥接模块"""
+import queue
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.detection_engine import DetectionEngine
+
+class EngineBridge(QObject):
+    """将多进程检测引擎的进度和结果转换为Qt信号，信号均在GUI线程发出"""
+    progress = pyqtSignal(str, dict)       # (视频路径, 遥测数据)
+    finished = pyqtSignal(str, dict)       # (视频路径, 检测结果)
+    error = pyqtSignal(str, str)           # (视频路径, 错误信息)
+
+    POLL_INTERVAL_MS = 200  # 进度轮询间隔
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.engine = None
+        self.frames = {}  # 每个视频已检测的帧数
+        self._results = queue.Queue()  # Future回调线程 -> GUI线程
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._poll)
+
+    def start(self, max_workers, plan=None):
+        """按工作进程数和线程分配创建引擎，都不变时复用已有进程池"""
+        if self.engine is not None and (self.engine.max_workers != max_workers
+                                        or (plan is not None and self.engine.plan != plan)):
+            self.engine.shutdown()
+            self.engine = None
+        if self.engine is None:
+            self.engine = DetectionEngine(max_workers, plan)
+        self.frames.clear()
+        self._timer.start(self.POLL_INTERVAL_MS)
+
+    def submit(self, spec):
+        """提交检测任务"""
+        engine = self.engine
+        future = engine.submit(spec)
+        future.add_done_callback(
+            lambda f, path=spec['video_path']: self._results.put((engine, path, f)))
+
+    def stop(self):
+        """停止所有正在进行的检测并释放进程池"""
+        self._timer.stop()
+        if self.engine is not None:
+            self.engine.shutdown(cancel=True)
+            self.engine = None
+
+    def _poll(self):
+        """在GUI线程中分发进度和结果"""
+        if self.engine is None:
+            return
+        latest = {}
+        for telemetry in self.engine.poll_progress():
+            latest[telemetry['video_path']] = telemetry  # 同一视频只保留最新数据
+        for video_path, telemetry in latest.items():
+            self.frames[video_path] = telemetry['frames']
+            self.progress.emit(video_path, telemetry)
+        while True:
+            try:
+                engine, video_path, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if engine is not self.engine or future.cancelled():
+                continue  # 已停止的引擎遗留的结果
+            exc = future.exception()
+            if exc is not None:
+                self.error.emit(video_path, str(exc))
+            else:
+                result = future.result()
+                self.frames[video_path] = result['stats']['frames']
+                self.finished.emit(video_path, result)
@@ -2,44 +2,104 @@
 import sys
 import os
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QMessageBox, QFileDialog, QStyle
+from PyQt5.QtCore import QTimer
 from core.hardware import HardwareAccelerator
 from core.splitter import VideoSplitter
 from gui.detection_thread import DetectionThread
+from gui.split_worker import SplitWorker
+from gui.cost_worker import CostWorker
+from gui.engine_bridge import EngineBridge
+from gui import queue_client
 from gui.components.file_group import FileGroup
 from gui.components.settings_group import SettingsGroup
 from gui.components.log_group import LogGroup
+from gui.components.thumbnail_dialog import ThumbnailDialog
 from gui.components.styles import get_main_styles
 from gui.video_processor import VideoProcessor
-from core.config_manager import ConfigManager
-from collections import deque
+from gui.preview_window import MosaicPreview
+from core.config_manager import get_config
+from core.detection_job import build_job_spec
+from core.frame_cache import DEFAULT_FRAME_CACHE_DIR
+from core.profiler import DEFAULT_PROFILE_DIR, format_summary
+from core.metrics import get_metrics, MetricsExporter
+from core.concurrency_controller import ConcurrencyController
+from core.job_scheduler import JobScheduler, PRIORITY_INTERACTIVE
+from core.result_cache import ResultCache
+from core.segment_index import SegmentIndex
+from core.segment_stats import filter_segments
+from core.thread_plan import plan_threads, apply_shared_plan, format_plan
 
 class MainWindow(QMainWindow):
+    CONCURRENCY_SAMPLE_MS = 3000  # 自动并行的负载采样间隔
+    ETA_UPDATE_MS = 1000  # 剩余时间刷新间隔
     def __init__(self):
         super().__init__()
         self.setWindowTitle('监控视频切割工具')
         self.setGeometry(100, 100, 1000, 800)
         
         # 初始化核心组件
-        self.config_manager = ConfigManager()  # 移到最前面初始化
+        self.config_manager = get_config()  # 移到最前面初始化
         self.hardware = HardwareAccelerator()
         
         self.splitter = VideoSplitter()
         self.video_processor = VideoProcessor(self.hardware)
         self.detection_threads = {}  # 存储所有检测线程
+        self.process_jobs = set()  # 多进程模式下正在检测的视频
+        self.use_process_pool = False  # 本轮检测是否使用多进程引擎
+        self.concurrency_target = 1  # 当前允许同时检测的视频数
+        self.concurrency_controller = None  # 自适应并行度控制器
+        self.concurrency_timer = QTimer(self)
+        self.concurrency_timer.timeout.connect(self._adjust_concurrency)
+        self.eta_timer = QTimer(self)  # 刷新整批任务的剩余时间
+        self.eta_timer.timeout.connect(self._update_batch_eta)
         self.segments = {}  # 存储每个视频的片段信息
+        self.thumbnails = {}  # 存储每个视频的片段缩略图
         self.completed_count = 0  # 已完成的视频数量
         self.total_videos = 0  # 视频总数
-        self.video_queue = deque()  # 等待处理的视频队列
+        self.video_queue = JobScheduler()  # 等待处理的视频队列，按优先级和工作量排序
         self.active_threads = 0  # 当前活动的线程数
+        self.split_stats = {'success': 0, 'total': 0, 'auto': True}  # 本轮切割统计
+        self.queue_client = None  # 共享任务队列客户端，未配置队列时为None
+        self.result_cache = ResultCache() if self.config_manager.get_use_result_cache() else None
+        self.segment_index = SegmentIndex() if self.config_manager.get_use_segment_index() else None
+        self.job_specs = {}  # 正在检测的视频 -> 检测任务描述，用于写入结果缓存
+        self.acquiring = {}  # 正在共享队列中领取的视频 -> (检测任务描述, 处理设置)
+        self.metrics_exporter = None  # 运行指标导出，未配置时为None
+        self.preview_window = MosaicPreview()  # 所有任务共用的马赛克预览窗口
         
         # 设置日志回调
         self.splitter.set_log_callback(self.log_message)
         
+        # 后台切割线程，检测完成的视频逐个切割
+        self.split_worker = SplitWorker(self.hardware.ffmpeg_path, self)
+        self.split_worker.log.connect(self.log_message)
+        self.split_worker.progress.connect(
+            lambda path, value: self.file_group.update_file_status(path, "切割中", value))
+        self.split_worker.video_done.connect(self.split_finished)
+        self.split_worker.video_failed.connect(self.split_error)
+        self.split_worker.idle.connect(self.split_queue_idle)
+        self.split_worker.start()
+
+        # 后台估算检测工作量，开始检测时不在GUI线程中打开视频
+        self.cost_batch = 0
+        self.cost_worker = CostWorker(self)
+        self.cost_worker.estimated.connect(self._refine_cost)
+        self.cost_worker.start()
+        
+        # 多进程检测引擎，按需创建进程池
+        self.engine_bridge = EngineBridge(self)
+        self.engine_bridge.progress.connect(
+            lambda path, telemetry: self.update_detection_progress(telemetry, path))
+        self.engine_bridge.finished.connect(self.process_job_finished)
+        self.engine_bridge.error.connect(
+            lambda path, msg: self.detection_error(msg, path))
+        
         self._initialize_ui()
         self._apply_styles()
         
         # 记录硬件信息
         self._log_hardware_info()
+        self._start_metrics_export()
 
     def _initialize_ui(self):
         """初始化UI布局"""
@@ -93,7 +153,10 @@ class MainWindow(QMainWindow):
         workers = self.config_manager.get_max_concurrent_videos()
         self.log_message(f"- CPU核心数: {self.hardware.detector.cpu_count}")
         self.log_message(f"- 最优并行处理数: {workers}")
-        self.log_message(f"- FFmpeg: {'可用' if self.hardware.has_ffmpeg else '未找到'}\n")
+        self.log_message(f"- FFmpeg: {'可用' if self.hardware.has_ffmpeg else '未找到'}")
+        if self.hardware.from_cache:
+            self.log_message("- 硬件信息来自缓存，后台重新检测中")
+        self.log_message("")
 
     def start_detection(self):
         """开始检测"""
@@ -108,23 +171,91 @@ class MainWindow(QMainWindow):
         # 重置状态
         self.completed_count = 0
         self.segments.clear()
+        self.thumbnails.clear()
         self.detection_threads.clear()
+        self.job_specs.clear()
+        self.acquiring.clear()
+        self.process_jobs.clear()
         self.video_queue.clear()
         self.active_threads = 0
         self.total_videos = len(file_paths)
+        self.split_worker.reset()  # 新一轮检测的片段需要重新切割
+        if self.queue_client is None and self.config_manager.get_job_queue_path():
+            self.queue_client = queue_client.QueueClient(self.config_manager.get_job_queue_path(), self)
+            self.queue_client.acquired.connect(self._queue_acquired)
+            self.log_message(f"使用共享任务队列: {self.config_manager.get_job_queue_path()}")
         
         self.log_message(f"开始检测 {len(file_paths)} 个视频文件中的动作...")
         
-        # 将所有视频文件添加到队列中
+        # 将所有视频文件添加到队列中，最长的视频最先开始
         for file_path in file_paths:
-            self.video_queue.append(file_path)
+            self.video_queue.push(file_path, rough=True)
             # 初始化每个文件的状态
             self.file_group.update_file_status(file_path, "等待处理", 0)
+        self.cost_batch = self.cost_worker.estimate(file_paths)
         
         # 根据配置的最大并行处理数量启动视频处理
         max_concurrent = self.config_manager.get_max_concurrent_videos()
         self.log_message(f"当前设置同时处理 {max_concurrent} 个视频")
-        self.process_next_videos(max_concurrent)
+        pool_size = max_concurrent
+        self.concurrency_target = max_concurrent
+        self.concurrency_controller = None
+        if self.config_manager.get_adaptive_concurrency():
+            floor, ceiling, headroom = self.config_manager.get_concurrency_limits()
+            self.concurrency_controller = ConcurrencyController(
+                floor, ceiling or None, initial=max_concurrent,
+                memory_headroom_mb=headroom, logger=self.log_message)
+            self.concurrency_target = self.concurrency_controller.target
+            pool_size = self.concurrency_controller.ceiling
+            self.log_message(f"已启用自动并行：{self.concurrency_controller.floor}-"
+                             f"{self.concurrency_controller.ceiling} 个视频，初始 {self.concurrency_target} 个")
+            self.concurrency_timer.start(self.CONCURRENCY_SAMPLE_MS)
+        self.use_process_pool = self.settings_group.get_settings()['use_process_pool']
+        plan = plan_threads(pool_size, pin=self.config_manager.get_pin_cpu_affinity())
+        if self.use_process_pool:
+            self.engine_bridge.start(pool_size, plan)
+            self.log_message("使用多进程检测引擎（不显示预览）")
+        else:
+            apply_shared_plan(plan)
+        self.log_message(format_plan(plan, shared=not self.use_process_pool))
+        self.process_next_videos(self.concurrency_target)
+        self.eta_timer.start(self.ETA_UPDATE_MS)
+
+    def add_interactive_video(self, file_path):
+        """检测过程中添加的视频进入高优先级通道，排在批量任务之前"""
+        self.video_queue.push(file_path, PRIORITY_INTERACTIVE, rough=True)
+        self.cost_worker.estimate([file_path], new_batch=False)
+        self.total_videos += 1
+        self.file_group.update_file_status(file_path, "等待处理(优先)", 0)
+        self.log_message(f"已优先加入检测队列: {os.path.basename(file_path)}")
+        self.process_next_videos(self.concurrency_target - self.active_threads)
+
+    def _refine_cost(self, batch, file_path, cost):
+        """后台读取到视频元数据后更新排队顺序"""
+        if batch == self.cost_batch:
+            self.video_queue.refine(file_path, cost)
+
+    def _update_batch_eta(self):
+        """在状态栏显示整批任务的剩余时间"""
+        if not self.file_group.is_detecting:
+            self.eta_timer.stop()
+            self.statusBar().clearMessage()
+            return
+        remaining = self.total_videos - self.completed_count
+        eta = self.video_queue.eta()
+        eta_text = self.splitter.segment_manager.format_time(eta)[:8] if eta is not None else "计算中"
+        self.statusBar().showMessage(f"剩余 {remaining} 个视频，预计剩余时间 {eta_text}")
+
+    def _adjust_concurrency(self):
+        """按系统负载调整并行检测数，并补充启动新的检测任务"""
+        if not self.file_group.is_detecting or self.concurrency_controller is None:
+            self.concurrency_timer.stop()
+            return
+        total_frames = sum(thread.frames_processed for thread in self.detection_threads.values())
+        total_frames += sum(self.engine_bridge.frames.values())
+        self.concurrency_target = self.concurrency_controller.update(total_frames)
+        if self.active_threads < self.concurrency_target:
+            self.process_next_videos(self.concurrency_target - self.active_threads)
 
     def process_next_videos(self, count=1):
         """处理队列中的下一批视频
@@ -138,7 +269,7 @@ class MainWindow(QMainWindow):
         # 启动指定数量的视频处理线程，不超过队列中视频数量
         started_count = 0
         while started_count < count and self.video_queue:
-            file_path = self.video_queue.popleft()  # 从队列取出下一个视频
+            file_path = self.video_queue.pop()  # 从队列取出下一个视频
             self.start_video_processing(file_path, settings)
             started_count += 1
             self.active_threads += 1
@@ -150,6 +281,38 @@ class MainWindow(QMainWindow):
             file_path: 视频文件路径
             settings: 处理设置
         """
+        spec = self._build_job_spec(file_path, settings)
+        cached = self.result_cache.get(file_path, spec) if self.result_cache is not None else None
+        if cached is not None:
+            QTimer.singleShot(0, lambda: self._finish_from_store(
+                file_path, cached['segments'], "文件和检测设置未变化，使用缓存的检测结果"))
+            return
+        if self.queue_client is not None:
+            # 在共享队列中领取后再开始检测，见 _queue_acquired
+            self.acquiring[file_path] = (spec, settings)
+            self.queue_client.acquire(spec)
+            return
+        self._start_job(file_path, spec, settings)
+
+    def _queue_acquired(self, file_path, status, result):
+        """共享队列领取结果：已领取的视频开始检测，其余使用队列中的结果或跳过"""
+        item = self.acquiring.pop(file_path, None)
+        if item is None:
+            return
+        if status != queue_client.ACQUIRED:
+            self._video_from_queue(file_path, status, result)
+            return
+        self._start_job(file_path, *item)
+
+    def _start_job(self, file_path, spec, settings):
+        """在多进程引擎或检测线程中开始检测"""
+        self.job_specs[file_path] = spec
+        if self.use_process_pool:
+            self.engine_bridge.submit(spec)
+            self.process_jobs.add(file_path)
+            self.log_message(f"开始处理: {os.path.basename(file_path)}")
+            return
+            
         thread = DetectionThread(
             file_path,
             self.hardware,
@@ -159,45 +322,108 @@ class MainWindow(QMainWindow):
             self.video_processor.playback_speed,
             self
         )
-        thread.progress.connect(lambda value, path=file_path: self.update_detection_progress(value, path))
-        thread.finished.connect(lambda segs, path=file_path: self.detection_finished(segs, path))
-        thread.error.connect(lambda msg, path=file_path: self.detection_error(msg, path))
-        thread.auto_split_requested.connect(lambda: self.split_video(auto=True))
+        thread.progress.connect(lambda telemetry, path=file_path: self.update_detection_progress(telemetry, path))
+        thread.finished.connect(lambda segs, path=file_path, thread=thread: self.detection_finished(segs, path, thread))
+        thread.error.connect(lambda msg, path=file_path, thread=thread: self.detection_error(msg, path, thread))
+        thread.log.connect(self.log_message)
+        thread.auto_split_requested.connect(lambda path=file_path: self.enqueue_split(path, auto=True))
         
         self.detection_threads[file_path] = thread
         thread.start()
         self.log_message(f"开始处理: {os.path.basename(file_path)}")
 
+    def _build_job_spec(self, file_path, settings):
+        """按当前设置构建检测任务描述"""
+        output_dir = self.file_group.get_output_directory()
+        save_thumbnails = self.config_manager.get_save_thumbnails() and output_dir
+        checkpoint_dir = os.path.abspath(os.path.join('config', 'checkpoints'))
+        profile_dir = os.path.abspath(DEFAULT_PROFILE_DIR)
+        frame_cache_mb = self.config_manager.get_frame_cache_mb() if self.use_process_pool else 0
+        return build_job_spec(
+            file_path,
+            settings['threshold'],
+            settings['min_area'],
+            use_gpu=settings['use_gpu'],
+            thumbnail_dir=os.path.join(output_dir, 'thumbnails') if save_thumbnails else None,
+            checkpoint_dir=checkpoint_dir if self.config_manager.get_enable_checkpoints() else None,
+            profile_dir=profile_dir if self.config_manager.get_enable_profiling() else None,
+            frame_cache_dir=os.path.abspath(DEFAULT_FRAME_CACHE_DIR) if frame_cache_mb else None,
+            frame_cache_mb=frame_cache_mb
+        )
+
+    def _video_from_queue(self, file_path, status, result):
+        """处理共享队列中已完成或正被其他工作进程检测的视频"""
+        if status == queue_client.DONE:
+            self._finish_from_store(file_path, result['segments'], "已由其他工作进程检测完成，使用队列中的结果")
+            return
+        self.log_message(f"{os.path.basename(file_path)} 正在由其他工作进程检测，跳过")
+        self.active_threads -= 1
+        self.total_videos -= 1
+        self.video_queue.mark_done(file_path)
+        self.file_group.update_file_status(file_path, "其他进程处理中", 0)
+        if self.video_queue:
+            self.process_next_videos(self.concurrency_target - self.active_threads)
+        self._finish_batch_if_done()
+
+    def _finish_from_store(self, file_path, segments, message):
+        """使用已有的检测结果(缓存或共享队列)直接完成视频，无需解码"""
+        self.log_message(f"{os.path.basename(file_path)} {message}")
+        self.detection_finished(segments, file_path)
+        if self.config_manager.get_auto_split() and segments:
+            self.enqueue_split(file_path, auto=True)
+
     def stop_detection(self):
         """停止所有检测"""
-        if self.detection_threads:
+        if self.detection_threads or self.process_jobs or self.acquiring:
             self.log_message("正在停止所有检测...")
+            # 启用断点时停止即暂停，下次检测从断点继续
+            resumable = self.config_manager.get_enable_checkpoints()
+            stopped_status = "已暂停" if resumable else "已停止"
+            if self.queue_client is not None:
+                self.queue_client.release_all()
+            for file_path in self.acquiring:
+                self.file_group.update_file_status(file_path, stopped_status, 0)
+            self.acquiring.clear()
+            if self.process_jobs:
+                self.engine_bridge.stop()
+                for file_path in self.process_jobs:
+                    self.file_group.update_file_status(file_path, stopped_status, 0)
+                self.process_jobs.clear()
             for file_path, thread in self.detection_threads.items():
                 if thread.isRunning():
                     thread.stop()
                     thread.quit()
                     thread.wait()
-                    self.file_group.update_file_status(file_path, "已停止", 0)
+                    self.file_group.update_file_status(file_path, stopped_status, 0)
                     
             self.detection_threads.clear()
+            self.job_specs.clear()
             self.video_queue.clear()  # 清空队列
             self.active_threads = 0
             self.log_message("所有检测已停止")
+            if resumable:
+                self.log_message("检测进度已保存，再次开始检测时将从断点继续")
             
             # 如果已经检测到了片段，则启用切割按钮
             if self.segments:
                 self.file_group.split_btn.setEnabled(True)
                 self.log_message("可以进行视频切割操作")
 
-    def update_detection_progress(self, value, file_path):
+    def update_detection_progress(self, telemetry, file_path):
         """更新检测进度
         
         Args:
-            value: 进度值(0-100)
+            telemetry: 遥测数据，见 JobTelemetry.snapshot
             file_path: 视频文件路径
         """
         # 更新文件状态和进度
-        self.file_group.update_file_status(file_path, "处理中", value)
+        value = telemetry['progress']
+        eta = telemetry['eta']
+        detail = (f"{telemetry['fps']} 帧/秒，{telemetry['realtime_factor']} 倍实时，"
+                  f"已发现 {telemetry['segments']} 个片段，"
+                  f"剩余 {self.splitter.segment_manager.format_time(eta)[:8] if eta is not None else '未知'}")
+        self.file_group.update_file_status(file_path, "处理中", value, detail)
+        self.video_queue.update_progress(file_path, value / 100)
         
         # 检查是否所有线程都已完成
         if self.active_threads == 0 and len(self.video_queue) == 0:
@@ -208,14 +434,38 @@ class MainWindow(QMainWindow):
             if self.segments:
                 self.file_group.split_btn.setEnabled(True)
 
-    def detection_finished(self, segments, file_path):
+    def _is_stale(self, file_path, thread):
+        """检测线程已被停止(或已开始新一轮检测)，其排队到达的信号应忽略"""
+        return thread is not None and self.detection_threads.get(file_path) is not thread
+
+    def detection_finished(self, segments, file_path, thread=None):
         """检测完成处理
         
         Args:
             segments: 检测到的片段列表
             file_path: 视频文件路径
+            thread: 发出信号的检测线程，None 表示多进程任务或已有结果(缓存、共享队列)
         """
+        if self._is_stale(file_path, thread):
+            return
         self.active_threads -= 1
+        self.video_queue.mark_done(file_path)
+        if self.queue_client is not None:
+            self.queue_client.complete(file_path, segments)
+        
+        if thread is not None and thread.thumbnails is not None:
+            self.thumbnails[file_path] = thread.thumbnails.thumbnails
+        # 只缓存和索引完整检测的结果(预览窗口中途退出时结果不完整)，多进程任务被停止时不会返回结果
+        spec = self.job_specs.pop(file_path, None)
+        complete = thread is None or thread.reached_end
+        if complete:
+            if spec is not None and self.result_cache is not None:
+                self.result_cache.put(file_path, spec, segments)
+            # 时间索引按视频整体替换片段，不完整的结果会覆盖之前的完整结果
+            if self.segment_index is not None:
+                self.segment_index.add_video(file_path, segments)
+        else:
+            self.log_message(f"{os.path.basename(file_path)} 未检测到视频末尾，结果不写入缓存和时间索引")
         
         if segments:  # 只在有检测到片段时添加
             self.segments[file_path] = segments
@@ -230,17 +480,19 @@ class MainWindow(QMainWindow):
         if segments:
             segments_info, total_duration = self.splitter.get_segment_info(segments)
             for info in segments_info:
+                score = f', 分数: {info["score"]}' if info['score'] is not None else ''
                 self.log_message(
                     f'片段 {info["index"]}: {info["start"]} - {info["end"]} '
-                    f'(时长: {info["duration"]})'
+                    f'(时长: {info["duration"]}{score})'
                 )
         
-        # 检查队列中是否还有视频需要处理
+        # 检查队列中是否还有视频需要处理，自动并行时可能已调低并行数
         if self.video_queue:
-            # 处理下一个视频
-            self.process_next_videos(1)
-            
-        # 检查是否所有视频都处理完成
+            self.process_next_videos(self.concurrency_target - self.active_threads)
+        self._finish_batch_if_done()
+
+    def _finish_batch_if_done(self):
+        """检查是否所有视频都处理完成"""
         if self.completed_count == self.total_videos:
             self.log_message(f"\n所有视频处理完成！共处理 {self.completed_count} 个视频")
             self.file_group.detect_btn.setText('开始检测')
@@ -251,9 +503,36 @@ class MainWindow(QMainWindow):
                 self.file_group.split_btn.setEnabled(True)
                 self.log_message("可以进行视频切割操作")
 
-    def detection_error(self, error_msg, file_path):
+    def process_job_finished(self, file_path, result):
+        """多进程检测任务完成
+        
+        Args:
+            file_path: 视频文件路径
+            result: run_detection_job 返回的检测结果
+        """
+        self.process_jobs.discard(file_path)
+        self.thumbnails[file_path] = result['thumbnails']
+        stats = result['stats']
+        if stats['resumed_from']:
+            self.log_message(f"{os.path.basename(file_path)} 从断点继续检测（第 {stats['resumed_from']} 帧）")
+        self.log_message(f"{os.path.basename(file_path)} 检测速度: {stats['fps']} 帧/秒 "
+                         f"({stats['realtime_factor']}倍实时)")
+        if result.get('profile'):
+            self.log_message(format_summary(file_path, result['profile']))
+        self.detection_finished(result['segments'], file_path)
+        if self.config_manager.get_auto_split() and result['segments']:
+            self.enqueue_split(file_path, auto=True)
+
+    def detection_error(self, error_msg, file_path, thread=None):
         """处理检测错误"""
+        if self._is_stale(file_path, thread):
+            return
         self.active_threads -= 1
+        self.process_jobs.discard(file_path)
+        self.video_queue.mark_done(file_path)
+        self.job_specs.pop(file_path, None)
+        if self.queue_client is not None:
+            self.queue_client.fail(file_path, error_msg)
         
         # 更新文件状态为错误
         self.file_group.update_file_status(file_path, f"错误", 0)
@@ -263,10 +542,11 @@ class MainWindow(QMainWindow):
         
         # 尝试处理队列中的下一个视频
         if self.video_queue:
-            self.process_next_videos(1)
+            self.process_next_videos(self.concurrency_target - self.active_threads)
         
         # 如果所有视频都已完成或出错
         remaining_threads = sum(1 for thread in self.detection_threads.values() if thread.isRunning())
+        remaining_threads += len(self.process_jobs)
         if remaining_threads == 0 and len(self.video_queue) == 0:
             self.file_group.detect_btn.setText('开始检测')
             self.file_group.detect_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
@@ -296,45 +576,110 @@ class MainWindow(QMainWindow):
                 self.file_group.config_manager.set_output_directory(output_dir)
         
         if output_dir:
-            success_count = 0
-            total_videos = len(self.segments)
-            
-            for file_path, segments in self.segments.items():
-                try:
-                    self.log_message(f"\n开始切割视频: {os.path.basename(file_path)}...")
-                    self.splitter.set_progress_callback(
-                        lambda value, fp=file_path: self.file_group.update_file_status(fp, "切割中", value)
-                    )
-                    
-                    output_files = self.splitter.split_video(
-                        file_path,
-                        segments,
-                        output_dir,
-                        self.hardware.ffmpeg_path
-                    )
-                    
-                    if output_files:
-                        success_count += 1
-                        self.file_group.update_file_status(file_path, "切割完成", 100)
-                        self.log_message(f"视频切割完成！保存在: {output_dir}")
-                    else:
-                        raise Exception("没有生成任何输出文件")
-                        
-                except Exception as e:
-                    error_msg = f'视频 {os.path.basename(file_path)} 切割失败：{str(e)}'
-                    QMessageBox.critical(self, '错误', error_msg)
-                    self.log_message(f"错误: {error_msg}")
-                    self.file_group.update_file_status(file_path, "切割失败", 0)
-            
-            if success_count > 0:
-                if not auto:
-                    QMessageBox.information(self, '成功', 
-                                         f'视频切割完成！成功处理 {success_count}/{total_videos} 个视频')
-                self.log_message(f"\n所有视频切割完成！成功率: {success_count}/{total_videos}")
-            
+            for file_path in self.segments:
+                if self.split_worker.is_scheduled(file_path):
+                    self.log_message(f"视频 {os.path.basename(file_path)} 已切割或正在切割，跳过")
+                    continue
+                self.enqueue_split(file_path, auto, output_dir)
         elif auto:
             self.log_message("自动切割失败：未配置输出目录")
 
+    def enqueue_split(self, file_path, auto=False, output_dir=None):
+        """将单个视频加入后台切割队列
+        
+        Args:
+            file_path: 视频文件路径
+            auto: 是否是自动切割模式
+            output_dir: 输出目录，为空时使用配置的输出目录
+        """
+        segments = self.segments.get(file_path)
+        if not segments:
+            return
+        if not filter_segments(segments, **self.config_manager.get_segment_filter())[0]:
+            self.log_message(f"{os.path.basename(file_path)} 的片段都低于片段过滤条件，跳过切割")
+            self.file_group.update_file_status(file_path, "无需切割", 100)
+            return
+        output_dir = output_dir or self.file_group.get_output_directory()
+        if not output_dir:
+            self.log_message("自动切割失败：未配置输出目录")
+            return
+        if self.split_worker.enqueue(file_path, segments, output_dir):
+            self.split_stats['total'] += 1
+            self.split_stats['auto'] = self.split_stats['auto'] and auto
+            self.file_group.update_file_status(file_path, "等待切割", 0)
+
+    def split_finished(self, file_path, output_files):
+        """单个视频切割完成"""
+        self.split_stats['success'] += 1
+        self.file_group.update_file_status(file_path, "切割完成", 100)
+        self.log_message(f"视频切割完成！保存在: {os.path.dirname(output_files[0])}")
+
+    def split_error(self, file_path, error_msg):
+        """单个视频切割失败"""
+        error_msg = f'视频 {os.path.basename(file_path)} 切割失败：{error_msg}'
+        QMessageBox.critical(self, '错误', error_msg)
+        self.log_message(f"错误: {error_msg}")
+        self.file_group.update_file_status(file_path, "切割失败", 0)
+
+    def split_queue_idle(self):
+        """切割队列清空，汇总本轮切割结果"""
+        success_count, total_videos = self.split_stats['success'], self.split_stats['total']
+        if success_count > 0:
+            if not self.split_stats['auto']:
+                QMessageBox.information(self, '成功', 
+                                     f'视频切割完成！成功处理 {success_count}/{total_videos} 个视频')
+            self.log_message(f"\n所有视频切割完成！成功率: {success_count}/{total_videos}")
+        self.split_stats = {'success': 0, 'total': 0, 'auto': True}
+
+    def show_thumbnails(self, file_path):
+        """浏览检测时保存的片段缩略图"""
+        thumbnails = self.thumbnails.get(file_path)
+        if not thumbnails:
+            QMessageBox.information(self, '提示', '该视频暂无片段缩略图，请开启导出缩略图后进行动作检测')
+            return
+        ThumbnailDialog(os.path.basename(file_path), thumbnails, self).exec_()
+
+    def _start_metrics_export(self):
+        """按配置启动运行指标导出"""
+        path, port = self.config_manager.get_metrics_export()
+        if not path and not port:
+            return
+        get_metrics().add_collector(self._collect_metrics)
+        self.metrics_exporter = MetricsExporter(path, port)
+        try:
+            self.metrics_exporter.start()
+        except OSError as e:
+            self.log_message(f"启动运行指标端口失败: {str(e)}")
+            return
+        if path:
+            self.log_message(f"运行指标写入: {os.path.abspath(path)}")
+        if port:
+            self.log_message(f"运行指标地址: http://127.0.0.1:{port}/metrics")
+
+    def _collect_metrics(self):
+        """导出时读取队列长度和进行中的任务数"""
+        return {'queue_depth': len(self.video_queue), 'active_jobs': self.active_threads}
+
+    def closeEvent(self, event):
+        """关闭窗口时停止后台线程"""
+        for thread in self.detection_threads.values():
+            if thread.isRunning():
+                thread.stop()
+                thread.wait()
+        if self.queue_client is not None:
+            self.queue_client.release_all()
+            self.queue_client.close()
+        self.engine_bridge.stop()
+        self.split_worker.stop()
+        self.split_worker.wait()
+        self.cost_worker.stop()
+        self.cost_worker.wait()
+        self.preview_window.close_all()
+        self.config_manager.flush()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        super().closeEvent(event)
+
     def update_split_progress(self, value):
         """更新切割进度 - 已废弃，使用文件状态更新替代"""
         pass
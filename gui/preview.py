@@ -0,0 +1,72 @@
+"""检测预览数据模块
+
+检测线程和界面之间只交换每个任务的最新一张缩小后的预览图：检测线程按预览帧率采样，
+未到采样时间的帧不做任何处理；界面定时读取最新图像显示。本模块不导入Qt，检测线程可直接使用。
+"""
+import threading
+import time
+from core.config_manager import get_config
+
+class PreviewSlot:
+    """单个检测任务的预览图槽位"""
+    def __init__(self, job_id, title, max_fps):
+        self.job_id = job_id
+        self.title = title
+        self.interval = 1.0 / max(max_fps, 0.1)
+        self.stop_requested = False  # 用户在预览窗口中按 Q 请求停止检测
+        self.tile_size = None  # 预览窗口中该任务的显示区域 (宽, 高)，预览图不超过此大小
+        self._next_sample = 0.0
+        self._lock = threading.Lock()
+        self._image = None
+        self._version = 0
+
+    def due(self):
+        """是否到了下一次采样时间，到达时同时预约下一次"""
+        now = time.monotonic()
+        if now < self._next_sample:
+            return False
+        self._next_sample = now + self.interval
+        return True
+
+    def publish(self, image):
+        """发布新的预览图(BGR numpy数组)，发布后检测线程不再修改该数组"""
+        with self._lock:
+            self._image = image
+            self._version += 1
+
+    def latest(self):
+        """返回 (最新预览图, 版本号)，版本号变化表示有新图像"""
+        with self._lock:
+            return self._image, self._version
+
+class PreviewRegistry:
+    """所有正在预览的任务，线程安全"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def open(self, job_id, title):
+        """获取任务的预览槽位，不存在时按当前预览帧率设置创建"""
+        with self._lock:
+            slot = self._slots.get(job_id)
+            if slot is None:
+                slot = self._slots[job_id] = PreviewSlot(job_id, title, get_config().get_preview_fps())
+            return slot
+
+    def close(self, job_id):
+        with self._lock:
+            self._slots.pop(job_id, None)
+
+    def close_all(self):
+        with self._lock:
+            self._slots.clear()
+
+    def slots(self):
+        with self._lock:
+            return list(self._slots.values())
+
+_registry = PreviewRegistry()
+
+def get_preview_registry():
+    """获取共享的预览槽位表"""
+    return _registry
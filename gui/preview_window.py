@@ -0,0 +1,127 @@
+"""检测预览窗口模块
+
+所有正在预览的任务合成在一个马赛克窗口中：每个任务占一格，画布按窗口大小预先分配，
+界面线程中的定时器按预览帧率只把有新图像的格子复制到画布，再以QImage直接引用画布显示。
+检测线程按格子大小生成预览图(见 PreviewSlot.tile_size)，同时预览8-16个任务的开销与单个小窗口相当。
+"""
+import math
+import cv2
+import numpy as np
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QWidget
+from core.config_manager import get_config
+from .preview import get_preview_registry
+
+DEFAULT_SIZE = (1280, 720)  # 马赛克窗口初始大小
+TITLE_HEIGHT = 18  # 格子顶部标题栏高度
+
+class MosaicPreview(QWidget):
+    """马赛克预览窗口：点击格子选中任务，按 Q 请求停止选中任务的检测"""
+    def __init__(self):
+        super().__init__(None, Qt.Window)
+        self.setWindowTitle('Motion Detection')
+        self.registry = get_preview_registry()
+        self.canvas = None
+        self.image = None
+        self.layout_ids = []  # 当前布局中各格子对应的任务ID
+        self.versions = {}  # 任务ID -> 已绘制的预览图版本
+        self.selected = None
+        self.dismissed = False  # 用户关闭了窗口，本批任务结束前不再自动打开
+        self.resize(*DEFAULT_SIZE)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(int(1000 / get_config().get_preview_fps()))
+
+    def _grid(self, count):
+        """返回 (列数, 行数, 格子宽, 格子高)"""
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        height, width = self.canvas.shape[:2]
+        return cols, rows, width // cols, height // rows
+
+    def _allocate(self):
+        """按窗口大小分配画布，只在窗口大小变化时重新分配"""
+        width, height = max(self.width(), 160), max(self.height(), 90)
+        if self.canvas is None or self.canvas.shape[:2] != (height, width):
+            self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+            self.image = QImage(self.canvas.data, width, height, self.canvas.strides[0], QImage.Format_BGR888)
+            self.layout_ids = []
+
+    def _draw_tile(self, index, slot, image, cols, tile_width, tile_height):
+        x0, y0 = (index % cols) * tile_width, (index // cols) * tile_height
+        tile = self.canvas[y0:y0 + tile_height, x0:x0 + tile_width]
+        tile[:] = 0
+        area = tile[TITLE_HEIGHT:]
+        if image is not None:
+            height, width = image.shape[:2]
+            if width > area.shape[1] or height > area.shape[0]:  # 格子变小后的旧图像
+                scale = min(area.shape[1] / width, area.shape[0] / height)
+                image = cv2.resize(image, (max(int(width * scale), 1), max(int(height * scale), 1)))
+                height, width = image.shape[:2]
+            top, left = (area.shape[0] - height) // 2, (area.shape[1] - width) // 2
+            area[top:top + height, left:left + width] = image
+        color = (0, 200, 255) if slot.job_id == self.selected else (200, 200, 200)
+        cv2.putText(tile, slot.title, (4, TITLE_HEIGHT - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1, cv2.LINE_AA)
+
+    def refresh(self):
+        slots = self.registry.slots()
+        if not slots:
+            if self.isVisible():
+                self.hide()
+            self.layout_ids = []
+            self.dismissed = False
+            return
+        if self.dismissed:
+            return
+        self._allocate()
+        ids = [slot.job_id for slot in slots]
+        cols, rows, tile_width, tile_height = self._grid(len(slots))
+        changed = ids != self.layout_ids
+        if changed:
+            self.canvas[:] = 0
+            self.layout_ids = ids
+            self.versions.clear()
+        for index, slot in enumerate(slots):
+            slot.tile_size = (tile_width, tile_height - TITLE_HEIGHT)  # 检测线程按格子大小生成预览图
+            image, version = slot.latest()
+            if version != self.versions.get(slot.job_id):
+                self.versions[slot.job_id] = version
+                self._draw_tile(index, slot, image, cols, tile_width, tile_height)
+                changed = True
+        if not self.isVisible():
+            self.show()
+        if changed:
+            self.update()
+
+    def paintEvent(self, event):
+        if self.image is not None:
+            QPainter(self).drawImage(0, 0, self.image)
+
+    def resizeEvent(self, event):
+        self.layout_ids = []  # 下次刷新时重新分配画布并重绘所有格子
+        super().resizeEvent(event)
+
+    def mousePressEvent(self, event):
+        if not self.layout_ids or self.canvas is None:
+            return
+        cols, rows, tile_width, tile_height = self._grid(len(self.layout_ids))
+        index = (event.y() // tile_height) * cols + event.x() // tile_width
+        if index < len(self.layout_ids):
+            self.selected = self.layout_ids[index]
+            self.layout_ids = []  # 重绘标题颜色
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Q and self.selected is not None:
+            for slot in self.registry.slots():
+                if slot.job_id == self.selected:
+                    slot.stop_requested = True
+        super().keyPressEvent(event)
+
+    def closeEvent(self, event):
+        self.dismissed = True
+        super().closeEvent(event)
+
+    def close_all(self):
+        self.timer.stop()
+        self.close()
@@ -0,0 +1,107 @@
+"""持久化任务队列的界面客户端模块
+
+界面作为队列的一个客户端：开始检测时将视频登记到共享队列，其他工作进程已完成的视频直接使用队列中的结果，
+正在被其他工作进程处理的视频跳过；界面自己检测的视频持有租约并定时续约，完成后写回结果。
+队列数据库可能在共享文件系统上且会等待锁(最长30秒)，所有数据库操作都在后台线程中执行，不阻塞界面。
+"""
+import queue
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.job_queue import JobQueue, default_worker_id
+from core.job_scheduler import PRIORITY_INTERACTIVE
+from core.queue_worker import HEARTBEAT_INTERVAL
+
+ACQUIRED = 'acquired'  # 已领取，由界面检测
+DONE = 'done'          # 队列中已有结果
+BUSY = 'busy'          # 其他工作进程正在处理
+
+class QueueClient(QObject):
+    """界面使用的队列客户端"""
+    acquired = pyqtSignal(str, str, object)  # 领取结果 (视频路径, ACQUIRED/DONE/BUSY, 队列中已有的结果或None)
+    _leased = pyqtSignal(str, str, object, object)  # 后台线程 -> GUI线程 (视频路径, 状态, 结果, 任务ID)
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.queue = JobQueue(db_path)
+        self.worker_id = default_worker_id('gui')
+        self.jobs = {}  # 视频路径 -> 界面持有租约的任务ID，只在GUI线程中访问
+        self._pending = set()  # 正在领取的视频
+        self._calls = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='QueueClient', daemon=True)
+        self._thread.start()
+        self._leased.connect(self._on_leased)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._heartbeat)
+        self._timer.start(int(HEARTBEAT_INTERVAL * 1000))
+
+    def _run(self):
+        """后台线程：依次执行数据库操作"""
+        while True:
+            item = self._calls.get()
+            if item is None:
+                break
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"共享任务队列操作失败: {str(e)}")
+
+    def _call(self, func, *args):
+        self._calls.put((func, args))
+
+    def acquire(self, spec):
+        """登记并领取视频的检测任务，结果通过 acquired 信号返回"""
+        self._pending.add(spec['video_path'])
+        self._call(self._acquire, spec)
+
+    def _acquire(self, spec):
+        job = self.queue.enqueue(spec, PRIORITY_INTERACTIVE)
+        if job['state'] == 'done':
+            self._leased.emit(spec['video_path'], DONE, job['result'], None)
+            return
+        if job['state'] == 'failed':
+            self.queue.retry_failed(job['id'])  # 用户主动重新检测
+        if self.queue.lease(self.worker_id, job_id=job['id']) is None:
+            self._leased.emit(spec['video_path'], BUSY, None, None)
+        else:
+            self._leased.emit(spec['video_path'], ACQUIRED, None, job['id'])
+
+    def _on_leased(self, video_path, status, result, job_id):
+        if video_path not in self._pending:
+            # 领取期间已停止检测，归还刚领取的任务
+            if status == ACQUIRED:
+                self._call(self.queue.release, job_id, self.worker_id)
+            return
+        self._pending.discard(video_path)
+        if status == ACQUIRED:
+            self.jobs[video_path] = job_id
+        self.acquired.emit(video_path, status, result)
+
+    def complete(self, video_path, segments):
+        """写回检测结果"""
+        job_id = self.jobs.pop(video_path, None)
+        if job_id is not None:
+            self._call(self.queue.complete, job_id, self.worker_id, {'segments': segments})
+
+    def fail(self, video_path, error):
+        """记录检测失败"""
+        job_id = self.jobs.pop(video_path, None)
+        if job_id is not None:
+            self._call(self.queue.fail, job_id, self.worker_id, error)
+
+    def release_all(self):
+        """停止检测时归还所有未完成的任务"""
+        self._pending.clear()
+        for job_id in self.jobs.values():
+            self._call(self.queue.release, job_id, self.worker_id)
+        self.jobs.clear()
+
+    def close(self):
+        """等待已提交的数据库操作完成并停止后台线程"""
+        self._timer.stop()
+        self._calls.put(None)
+        self._thread.join()
+
+    def _heartbeat(self):
+        for job_id in list(self.jobs.values()):
+            self._call(self.queue.heartbeat, job_id, self.worker_id)
@@ -0,0 +1,82 @@
+"""视频切割工作线程模块"""
+import os
+import queue
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.splitter import VideoSplitter
+from core.config_manager import get_config
+
+class SplitWorker(QThread):
+    """后台切割线程
+
+    检测完成的视频逐个入队，在其他视频仍在检测时完成切割与合并。
+    每个视频只会被切割一次，已完成的视频不会重复处理。
+    """
+    progress = pyqtSignal(str, float)     # 切割进度信号 (视频路径, 0-100)
+    log = pyqtSignal(str)                 # 日志信号
+    video_done = pyqtSignal(str, list)    # 切割完成信号 (视频路径, 输出文件列表)
+    video_failed = pyqtSignal(str, str)   # 切割失败信号 (视频路径, 错误信息)
+    idle = pyqtSignal()                   # 队列已清空信号
+
+    def __init__(self, ffmpeg_path=None, parent=None):
+        super().__init__(parent)
+        self.ffmpeg_path = ffmpeg_path
+        self.splitter = VideoSplitter()
+        self.splitter.set_log_callback(self.log.emit)
+        self._queue = queue.Queue()
+        self._scheduled = set()  # 已入队或已切割完成的视频
+        self._is_running = True
+
+    def enqueue(self, video_path, segments, output_dir):
+        """将视频加入切割队列
+
+        Returns:
+            bool: 是否成功入队，已入队或已切割的视频返回False
+        """
+        if video_path in self._scheduled:
+            return False
+        self._scheduled.add(video_path)
+        # 复制片段，避免合并片段时修改调用方的数据
+        self._queue.put((video_path, [dict(seg) for seg in segments], output_dir))
+        return True
+
+    def is_scheduled(self, video_path):
+        """视频是否已入队或已切割"""
+        return video_path in self._scheduled
+
+    def reset(self):
+        """清除已切割标记，用于新一轮检测"""
+        self._scheduled.clear()
+
+    def stop(self):
+        """停止切割线程"""
+        self._is_running = False
+        self.splitter.cancel()
+        self._queue.put(None)
+
+    def run(self):
+        """运行切割线程"""
+        while self._is_running:
+            item = self._queue.get()
+            if item is None:
+                break
+            video_path, segments, output_dir = item
+            self._split_one(video_path, segments, output_dir)
+            if self._queue.empty():
+                self.idle.emit()
+
+    def _split_one(self, video_path, segments, output_dir):
+        """切割单个视频"""
+        try:
+            self.log.emit(f"\n开始切割视频: {os.path.basename(video_path)}...")
+            self.splitter.set_segment_filter(get_config().get_segment_filter())
+            self.splitter.set_progress_callback(
+                lambda value, path=video_path: self.progress.emit(path, value))
+            output_files = self.splitter.split_video(
+                video_path, segments, output_dir, self.ffmpeg_path)
+            if not output_files:
+                raise Exception("没有生成任何输出文件")
+            self.video_done.emit(video_path, output_files)
+        except Exception as e:
+            # 失败的视频允许再次入队重试
+            self._scheduled.discard(video_path)
+            self.video_failed.emit(video_path, str(e))
@@ -1,16 +1,17 @@
 """视频处理模块"""
 import cv2
 import time
-import subprocess
 from pathlib import Path
-from core.config_manager import ConfigManager
+from core.config_manager import get_config
+from core.video_probe import probe_fps, probe_duration
 from gui.display_manager import DisplayManager
+from gui.preview import get_preview_registry
 
 class VideoProcessor:
     """视频处理类，负责视频帧的读取和控制"""
     def __init__(self, hardware, window_scale=None, playback_speed=None):
         self.hardware = hardware
-        self.config_manager = ConfigManager()
+        self.config_manager = get_config()
         
         # 初始化内部属性
         self._cap = None
@@ -26,12 +27,17 @@ class VideoProcessor:
         self._playback_speed = playback_speed if playback_speed is not None else self.config_manager.get_playback_speed()
         self._show_preview = self.config_manager.get_show_preview()  # 获取预览显示设置
         
-        # 创建显示管理器
+        # 创建显示管理器，预览图发布到共享的预览槽位，由界面线程显示
         self.display_manager = DisplayManager(self._window_scale)
+        self.preview_registry = get_preview_registry()
+        self._preview_slot = None
         
         # 帧率控制
         self._frame_interval = 0  # 帧间隔时间（秒）
         self._last_frame_time = 0  # 上一帧的时间
+        
+        # 设置界面修改播放速度和预览比例时，正在检测的视频立即生效
+        self.config_manager.add_listener(self._config_changed)
 
     @property
     def playback_speed(self):
@@ -44,8 +50,7 @@ class VideoProcessor:
         self._playback_speed = round(max(0.1, min(value, 16.0)), 1)
         self._update_frame_interval()
         # 保存到配置
-        self.config_manager.config['playback_speed'] = self._playback_speed
-        self.config_manager.save_config()
+        self.config_manager.set_playback_speed(self._playback_speed)
 
     @property
     def window_scale(self):
@@ -59,8 +64,7 @@ class VideoProcessor:
         if hasattr(self, 'display_manager'):
             self.display_manager.window_scale = self._window_scale
         # 保存到配置
-        self.config_manager.config['window_scale'] = self._window_scale
-        self.config_manager.save_config()
+        self.config_manager.set_window_scale(self._window_scale)
 
     @property
     def show_preview(self):
@@ -73,10 +77,23 @@ class VideoProcessor:
         self._show_preview = value
         # 如果禁用预览，关闭所有预览窗口
         if not value:
-            self.display_manager.close_all_windows()
+            self.preview_registry.close_all()
+        self._preview_slot = None
         # 保存到配置
         self.config_manager.set_show_preview(value)
 
+    def _config_changed(self, key, value):
+        """同步其他实例修改的配置，只更新自身状态，不再写回配置"""
+        if key == 'playback_speed':
+            self._playback_speed = value
+            self._update_frame_interval()
+        elif key == 'window_scale':
+            self._window_scale = value
+            self.display_manager.window_scale = value
+        elif key == 'show_preview':
+            self._show_preview = value
+            self._preview_slot = None  # 重新开启预览时重新登记槽位
+
     def _update_frame_interval(self):
         """更新帧间隔时间"""
         if self.fps > 0:
@@ -107,44 +124,11 @@ class VideoProcessor:
 
     def get_accurate_fps(self, video_path):
         """使用ffprobe获取准确的视频帧率"""
-        try:
-            ffprobe_path = str(Path(__file__).parent.parent / "bin" / "ffprobe.exe")
-            cmd = [
-                ffprobe_path,
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=r_frame_rate",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                num, den = map(int, result.stdout.strip().split('/'))
-                return num / den
-            return None
-        except Exception as e:
-            print(f"获取准确帧率失败: {str(e)}")
-            return None
+        return probe_fps(video_path)
 
     def get_accurate_duration(self, video_path):
         """使用ffprobe获取准确的视频时长（秒）"""
-        try:
-            ffprobe_path = str(Path(__file__).parent.parent / "bin" / "ffprobe.exe")
-            cmd = [
-                ffprobe_path,
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                duration = float(result.stdout.strip())
-                return duration
-            return None
-        except Exception as e:
-            print(f"获取视频时长失败: {str(e)}")
-            return None
+        return probe_duration(video_path)
 
     def open_video(self, video_path):
         """打开视频文件"""
@@ -189,6 +173,11 @@ class VideoProcessor:
         self._last_frame_time = time.time()
         return first_frame
 
+    def seek(self, frame_number):
+        """跳转到指定帧"""
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+
     def read_frame(self):
         """读取一帧"""
         if self._cap is None:
@@ -206,14 +195,26 @@ class VideoProcessor:
             return True
         return False
 
-    def display_frame(self, frame, title=None):
-        """显示处理后的帧"""
+    def display_frame(self, frame, title=None, boxes=(), regions=()):
+        """按预览帧率采样显示帧，返回用户是否请求停止检测
+
+        Args:
+            frame: 原始视频帧
+            title: 预览窗口标题
+            boxes: 运动框列表 [(x, y, w, h)]
+            regions: 排除区域列表
+        """
         if frame is None or not self._show_preview:  # 添加预览显示控制
             return False
             
         # 如果没有指定标题，使用视频文件名
         if title is None and self.video_path:
             title = f"Motion Detection - {Path(self.video_path).name}"
+        if self._preview_slot is None:
+            self._preview_slot = self.preview_registry.open(self.video_path, title)
+        slot = self._preview_slot
+        if not slot.due():
+            return slot.stop_requested  # 未到采样时间，不做任何处理
             
         # 准备显示信息
         current_frame = self.get_current_frame_number()
@@ -226,12 +227,9 @@ class VideoProcessor:
         progress = (current_frame / self.total_frames * 100) if self.total_frames > 0 else 0
         
         # 显示信息
-        info = {
-            'text': f"{current_time}/{total_time}({progress:.1f}%) {self.playback_speed}x",
-            'position': 'top-right'
-        }
-        
-        return self.display_manager.display_frame(frame, info, title, window_id=self.video_path)
+        text = f"{current_time}/{total_time}({progress:.1f}%) {self.playback_speed}x"
+        slot.publish(self.display_manager.render(frame, text, boxes, regions, slot.tile_size))
+        return slot.stop_requested
 
     def close(self):
         """关闭视频和窗口"""
@@ -239,7 +237,8 @@ class VideoProcessor:
             self._cap.release()
             self._cap = None
             
-        if self._show_preview and self.video_path:  # 只在预览开启时关闭窗口
-            self.display_manager.close_window(self.video_path)
+        if self._preview_slot is not None:
+            self.preview_registry.close(self.video_path)
+            self._preview_slot = None
         
         self.video_path = None
\ No newline at end of file
@@ -1,7 +1,7 @@
 """程序入口"""
 import os
+import sys
 from pathlib import Path
-from gui.main_window import main
 
 def initialize_app():
     """初始化应用程序"""
@@ -11,5 +11,11 @@ def initialize_app():
         config_dir.mkdir(parents=True)
 
 if __name__ == '__main__':
+    # 带参数运行时进入命令行模式，不加载任何界面模块
+    if len(sys.argv) > 1:
+        from cli.main import run
+        sys.exit(run(sys.argv[1:]))
     initialize_app()
+    # 延迟导入界面模块，多进程检测的工作进程不会加载Qt
+    from gui.main_window import main
     main()
\ No newline at end of file